@@ -0,0 +1,118 @@
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+# The summary generator's modules are flat scripts living in scrape_evidence/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scrape_evidence"))
+
+import publication_dates
+from publication_dates import (normalize_publication_date, format_publication_date_iso,
+                               format_publication_date_for_ref, PublicationDate)
+
+# --- Configuration ---
+DEFAULT_DATES = 20000
+DEFAULT_DISTINCT = 500 # Distinct date strings in the sample (a backfill repeats the same days a lot)
+DEFAULT_ROUNDS = 3
+# Share of each input shape in the sample, roughly as seen in data.json
+SHAPE_WEIGHTS = {"mdy": 60, "pubmed": 20, "iso": 10, "iso_datetime": 5, "odd": 5}
+ODD_DATES = ["2024 Mar", "Spring 2024", "2024-03-05T10:20:30+02:00", "13/45/2024", "N/A", "", None,
+             "March 5, 2024", "2024-03-05 garbage", " 03/05/2024"]
+MONTH_ABBREVIATIONS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+logger = logging.getLogger("benchmark")
+
+
+def random_date(rng: random.Random, shape: str) -> Any:
+    year, month, day = rng.randint(2015, 2025), rng.randint(1, 12), rng.randint(1, 28)
+    if shape == "mdy":
+        return f"{month:02d}/{day:02d}/{year}"
+    if shape == "pubmed":
+        return f"{year} {MONTH_ABBREVIATIONS[month - 1]} {day}"
+    if shape == "iso":
+        return f"{year}-{month:02d}-{day:02d}"
+    if shape == "iso_datetime":
+        return f"{year}-{month:02d}-{day:02d}T{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:00Z"
+    return rng.choice(ODD_DATES)
+
+
+def build_sample(count: int, distinct: int, seed: int = 0) -> List[Any]:
+    rng = random.Random(seed)
+    shapes, weights = zip(*SHAPE_WEIGHTS.items())
+    pool = [random_date(rng, rng.choices(shapes, weights)[0]) for _ in range(distinct)]
+    return [rng.choice(pool) for _ in range(count)]
+
+
+def legacy_normalize(date_str: Any) -> PublicationDate:
+    """What process_article did before: two calls, each parsing the date (the ref one parses it again)."""
+    return PublicationDate(format_publication_date_iso(date_str), format_publication_date_for_ref(date_str))
+
+
+def uncached_normalize(date_str: Any) -> PublicationDate:
+    """normalize_publication_date without its memo cache (fast paths only)."""
+    if not date_str:
+        return normalize_publication_date(date_str)
+    return publication_dates._normalize_cached.__wrapped__(date_str)
+
+
+def time_function(function: Callable[[Any], PublicationDate], sample: List[Any], rounds: int) -> float:
+    """Best time of `rounds` passes over the sample, in seconds (the memo cache is cleared before each pass)."""
+    best = None
+    for _ in range(rounds):
+        publication_dates._normalize_cached.cache_clear()
+        start = time.perf_counter()
+        for date_str in sample:
+            function(date_str)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmark of the publication date normalizer against the former two-function parse.")
+    parser.add_argument("--dates", type=int, default=DEFAULT_DATES, help=f"Dates normalized per pass (default: {DEFAULT_DATES})")
+    parser.add_argument("--distinct", type=int, default=DEFAULT_DISTINCT, help=f"Distinct date strings in the sample (default: {DEFAULT_DISTINCT})")
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS, help=f"Passes per implementation, the best one is kept (default: {DEFAULT_ROUNDS})")
+    parser.add_argument("--output", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+    if args.dates < 1 or args.distinct < 1 or args.rounds < 1:
+        parser.error("--dates, --distinct and --rounds must be at least 1")
+
+    # The slow path logs a warning for every odd date
+    logging.getLogger(publication_dates.__name__).setLevel(logging.CRITICAL)
+    sample = build_sample(args.dates, args.distinct)
+
+    mismatches = [date_str for date_str in set(sample) if normalize_publication_date(date_str) != legacy_normalize(date_str)]
+    for date_str in mismatches:
+        print(f"MISMATCH {date_str!r}: {normalize_publication_date(date_str)} != {legacy_normalize(date_str)}")
+
+    results: Dict[str, Dict[str, float]] = {}
+    for name, function in (("legacy", legacy_normalize), ("fast paths", uncached_normalize), ("fast + memo", normalize_publication_date)):
+        seconds = time_function(function, sample, args.rounds)
+        results[name] = {"total_s": round(seconds, 4), "us_per_date": round(seconds / len(sample) * 1e6, 2)}
+
+    print("\n" + "=" * 60)
+    print(f"{len(sample)} dates ({args.distinct} distinct), best of {args.rounds} passes")
+    print(f"{'implementation':<16}{'total s':>10}{'us/date':>10}{'speedup':>10}")
+    legacy_seconds = results["legacy"]["total_s"]
+    for name, result in results.items():
+        speedup = legacy_seconds / result["total_s"] if result["total_s"] else float("inf")
+        result["speedup"] = round(speedup, 1)
+        print(f"{name:<16}{result['total_s']:>10}{result['us_per_date']:>10}{speedup:>9.1f}x")
+    print(f"results identical to legacy: {'yes' if not mismatches else f'NO ({len(mismatches)} inputs differ)'}")
+    print("=" * 60)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({"dates": len(sample), "distinct": args.distinct, "mismatches": len(mismatches), "results": results}, f, indent=2)
+        logger.info(f"Results written to {args.output}")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
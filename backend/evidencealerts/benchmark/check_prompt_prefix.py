@@ -0,0 +1,210 @@
+import argparse
+import datetime
+import logging
+import os
+import sys
+import types
+from typing import Callable, List, Tuple
+
+# The summary generator's modules are flat scripts living in scrape_evidence/
+BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(BASE_DIR, "scrape_evidence"))
+
+# --- Configuration ---
+PREFIX = "Static instructions and taxonomy.\n\n"
+PROMPT = "**Article Details:** per-article part"
+CLASSIFICATION_TEMPLATES = ("classification_articles/reclassification_prompt.txt",
+                            "classification_articles/arbitration_prompt.txt")
+ARTICLE_DETAILS_MARKER = "**Article Details:**" # As in reclassify_articles.py
+CACHED_TOKENS = 700 # usage_metadata.cached_content_token_count reported by the stub for cached calls
+
+
+class StubResponse:
+    def __init__(self, cached: bool):
+        self.text = "{}"
+        self.usage_metadata = types.SimpleNamespace(prompt_token_count=10, cached_content_token_count=CACHED_TOKENS if cached else 0)
+
+
+class StubCachedContent:
+    """Stand-in for genai.caching.CachedContent; create() raises when the stub client refuses caching."""
+
+    def __init__(self, client, **kwargs):
+        self.client = client
+        self.kwargs = kwargs
+        self.updates = 0
+        self.deleted = False
+
+    @classmethod
+    def bind(cls, client):
+        return types.SimpleNamespace(create=lambda **kwargs: client.create_cache(cls, **kwargs))
+
+    def update(self, ttl: datetime.timedelta):
+        self.updates += 1
+
+    def delete(self):
+        self.deleted = True
+
+
+class StubClient:
+    """
+    Minimal google.generativeai replacement recording what each call sends:
+    caching=False removes genai.caching (SDK without context caching), refuse_cache makes
+    CachedContent.create() fail (prefix below the API's minimum), system_instruction=False
+    makes GenerativeModel reject that argument (old SDK).
+    """
+
+    def __init__(self, caching: bool = True, refuse_cache: bool = False, system_instruction: bool = True):
+        self.refuse_cache = refuse_cache
+        self.accepts_system_instruction = system_instruction
+        self.caches: List[StubCachedContent] = []
+        self.sent: List[Tuple[str, str]] = [] # (how the prefix was given, contents sent)
+        client = self
+        self.module = types.ModuleType("google.generativeai")
+
+        class GenerativeModel:
+            def __init__(self, model_name, generation_config=None, **kwargs):
+                if "system_instruction" in kwargs and not client.accepts_system_instruction:
+                    raise TypeError("__init__() got an unexpected keyword argument 'system_instruction'")
+                self.system_instruction = kwargs.get("system_instruction")
+                self.cached_content = None
+
+            @classmethod
+            def from_cached_content(cls, cached_content, generation_config=None):
+                model = cls("cached")
+                model.cached_content = cached_content
+                return model
+
+            def generate_content(self, contents, **kwargs):
+                if self.cached_content is not None:
+                    client.sent.append(("cached:" + self.cached_content.kwargs["system_instruction"], contents))
+                elif self.system_instruction is not None:
+                    client.sent.append(("system:" + self.system_instruction, contents))
+                else:
+                    client.sent.append(("none", contents))
+                return StubResponse(self.cached_content is not None)
+
+        self.module.GenerativeModel = GenerativeModel
+        if caching:
+            self.module.caching = types.SimpleNamespace(CachedContent=StubCachedContent.bind(self))
+
+    def create_cache(self, cls, **kwargs):
+        if self.refuse_cache:
+            raise ValueError("Cached content is too small. total_token_count=600, min_total_token_count=1024")
+        cache = cls(self, **kwargs)
+        self.caches.append(cache)
+        return cache
+
+
+def install_stub_sdk():
+    """Lets prompt_prefix import without the Gemini SDK; each check then swaps in its own stub client."""
+    try:
+        import google # noqa: F401 (namespace package of the real SDK, if installed)
+    except ImportError:
+        google = types.ModuleType("google")
+        google.__path__ = []
+        sys.modules["google"] = google
+    sys.modules["google.generativeai"] = StubClient().module
+
+
+def check_cached_mode(prompt_prefix) -> None:
+    client = StubClient()
+    prompt_prefix.genai = client.module
+    model = prompt_prefix.PrefixedModel("gemini-2.0-flash", PREFIX, name="cached check")
+    assert model.mode == "cached", model.mode
+    assert client.caches[0].kwargs["model"] == "models/gemini-2.0-flash"
+    model.generate_content(PROMPT)
+    assert client.sent == [("cached:" + PREFIX, PROMPT)], client.sent
+    assert model.cached_tokens == CACHED_TOKENS
+    # Close to expiry, the next call extends the TTL first
+    model._expires_at = 0
+    model.generate_content(PROMPT)
+    assert client.caches[0].updates == 1
+    model.close()
+    assert client.caches[0].deleted
+
+
+def check_system_mode(prompt_prefix) -> None:
+    client = StubClient(refuse_cache=True)
+    prompt_prefix.genai = client.module
+    model = prompt_prefix.PrefixedModel("gemini-2.0-flash", PREFIX, name="system check")
+    assert model.mode == "system", model.mode
+    model.generate_content(PROMPT)
+    assert client.sent == [("system:" + PREFIX, PROMPT)], client.sent
+    model.close()
+
+
+def check_inline_fallback(prompt_prefix) -> None:
+    client = StubClient(caching=False, system_instruction=False)
+    prompt_prefix.genai = client.module
+    model = prompt_prefix.PrefixedModel("gemini-2.0-flash", PREFIX, name="inline check")
+    assert model.mode == "inline", model.mode
+    model.generate_content(PROMPT)
+    assert client.sent == [("none", PREFIX + PROMPT)], client.sent
+    # An explicit mode is honoured even when caching would work
+    client = StubClient()
+    prompt_prefix.genai = client.module
+    model = prompt_prefix.PrefixedModel("gemini-2.0-flash", PREFIX, mode="inline", name="inline check")
+    assert model.mode == "inline" and not client.caches
+
+
+def check_cache_refresh_fallback(prompt_prefix) -> None:
+    client = StubClient()
+    prompt_prefix.genai = client.module
+    model = prompt_prefix.PrefixedModel("gemini-2.0-flash", PREFIX, name="refresh check")
+
+    def expired(ttl):
+        raise RuntimeError("cached content not found")
+
+    client.caches[0].update = expired
+    model._expires_at = 0
+    model.generate_content(PROMPT)
+    assert model.mode == "system", model.mode
+    assert client.sent[-1] == ("system:" + PREFIX, PROMPT), client.sent
+
+
+def check_classification_templates(_prompt_prefix) -> None:
+    """reclassify_articles.py splits both templates at ARTICLE_DETAILS_MARKER: the master list must come before it."""
+    for relative_path in CLASSIFICATION_TEMPLATES:
+        with open(os.path.join(BASE_DIR, relative_path), 'r', encoding='utf-8') as f:
+            template = f.read()
+        marker_position = template.find(ARTICLE_DETAILS_MARKER)
+        assert marker_position > 0, f"{relative_path}: no '{ARTICLE_DETAILS_MARKER}'"
+        prefix, rest = template[:marker_position], template[marker_position:]
+        assert "{master_classifications_list_str}" in prefix, f"{relative_path}: master list after the marker"
+        assert "{title}" in rest and "{title}" not in prefix, f"{relative_path}: article fields in the static prefix"
+
+
+CHECKS: List[Tuple[str, Callable]] = [
+    ("cached content", check_cached_mode),
+    ("system instruction", check_system_mode),
+    ("inline fallback", check_inline_fallback),
+    ("expired cache falls back to system instruction", check_cache_refresh_fallback),
+    ("classification templates split at the article details", check_classification_templates),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Checks the prompt prefix modes of scrape_evidence/prompt_prefix.py against a stub Gemini client (no API call).")
+    parser.add_argument("--verbose", action="store_true", help="Show the log of the checked module")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING, format="%(levelname)s - %(message)s")
+
+    install_stub_sdk()
+    import prompt_prefix
+
+    failures = 0
+    for name, check in CHECKS:
+        try:
+            check(prompt_prefix)
+        except AssertionError as e:
+            failures += 1
+            print(f"FAIL {name}: {e}")
+        else:
+            print(f"ok   {name}")
+    print(f"{len(CHECKS) - failures}/{len(CHECKS)} checks passed")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
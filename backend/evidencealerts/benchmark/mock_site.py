@@ -0,0 +1,251 @@
+import http.server
+import logging
+import os
+import random
+import threading
+import time
+from http.cookies import SimpleCookie
+from string import Template
+from typing import List, Optional, Set, Tuple
+from urllib.parse import parse_qs, urlparse
+
+# --- Configuration ---
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+SESSION_COOKIE_NAME = ".AspNet.ApplicationCookie"
+SESSION_COOKIE_VALUE = "benchmark-session"
+
+# Fields a scenario can remove from an article (on the EvidenceAlerts page or on its PubMed page)
+MISSING_FIELDS = ("doi", "journal", "date", "title", "abstract", "ratings", "pubmed_link")
+# complete: every field present. missing-optional: no DOI, journal or date on any PubMed page
+# (the fields most often absent in practice). mixed: article i lacks MISSING_FIELDS[i % 8], one in 8 is complete.
+SCENARIOS = ("complete", "missing-optional", "mixed")
+
+DISCIPLINES = [
+    ("Cardiology", "6", "5"),
+    ("Family Medicine (FM)/General Practice (GP)", "5", "4"),
+    ("Internal Medicine", "6", "6"),
+    ("Emergency Medicine", "Coming Soon...", "Coming Soon..."),
+    ("Hospital Doctor/Hospitalists", "5", "5"),
+    ("Nephrology", "4", "3"),
+]
+JOURNALS = ["N Engl J Med", "Lancet", "JAMA", "BMJ", "Ann Intern Med", "JAMA Intern Med"]
+
+PUBMED_LINK_HTML = '            <a class="btn btn-default article-record-button" href="$pubmed_url" target="_blank">View on PubMed</a>'
+PUBMED_TITLE_H1_HTML = '                <h1 class="heading-title">$title</h1>'
+PUBMED_JOURNAL_BUTTON_HTML = '                    <button id="full-view-journal-trigger" class="journal-actions-trigger trigger" title="$journal">$journal</button>'
+PUBMED_DOI_HTML = '                    <li><span class="identifier doi">DOI: <a class="id-link" href="https://doi.org/$doi" target="_blank">$doi</a></span></li>'
+PUBMED_META_HTML = '    <meta name="$name" content="$content" />'
+
+logger = logging.getLogger(__name__)
+
+
+def load_fixture(name: str) -> Template:
+    with open(os.path.join(FIXTURES_DIR, name), 'r', encoding='utf-8') as f:
+        return Template(f.read())
+
+
+def missing_fields_for(scenario: str, index: int) -> Set[str]:
+    """Fields removed from the index-th article of the listing in this scenario."""
+    if scenario == "missing-optional":
+        return {"doi", "journal", "date"}
+    if scenario == "mixed":
+        slot = index % (len(MISSING_FIELDS) + 1)
+        return {MISSING_FIELDS[slot]} if slot < len(MISSING_FIELDS) else set()
+    return set()
+
+
+class MockArticle:
+    """One fake alerted article and the data of its PubMed page."""
+
+    def __init__(self, index: int, scenario: str):
+        self.article_id = str(100000 + index)
+        self.pmid = str(38000000 + index)
+        self.title = f"Benchmark trial {index + 1}: intervention versus usual care in adults with condition {index % 17}"
+        self.journal = JOURNALS[index % len(JOURNALS)]
+        self.doi = f"10.1056/BENCH{index + 1:05d}"
+        self.published_at = f"2025/{index % 12 + 1:02d}/{index % 28 + 1:02d}"
+        self.abstract = " ".join(
+            f"Sentence {n + 1} of the structured abstract of benchmark article {index + 1}." for n in range(12)
+        )
+        self.ratings = DISCIPLINES[index % 3: index % 3 + 4]
+        self.missing = missing_fields_for(scenario, index)
+
+
+class MockSite:
+    """The fixture pages of a run: a fixed list of MockArticle rendered with the fixture templates."""
+
+    def __init__(self, articles: int, scenario: str = "complete"):
+        if scenario not in SCENARIOS:
+            raise ValueError(f"Unknown scenario '{scenario}' (expected one of {', '.join(SCENARIOS)})")
+        self.articles = [MockArticle(index, scenario) for index in range(articles)]
+        self.by_article_id = {article.article_id: article for article in self.articles}
+        self.by_pmid = {article.pmid: article for article in self.articles}
+        # Alerts removed with the listing's "Delete the selected items" form
+        self.deleted_ids: Set[str] = set()
+        self._lock = threading.Lock()
+        self.templates = {
+            name: load_fixture(f"{name}.html")
+            for name in ("login", "alerted", "alerted_row", "alerted_article", "ratings", "rating_row", "pubmed")
+        }
+
+    def render_login(self) -> str:
+        return self.templates["login"].substitute(token="benchmark-token")
+
+    def render_listing(self) -> str:
+        with self._lock:
+            listed = [article for article in self.articles if article.article_id not in self.deleted_ids]
+        rows = "".join(
+            self.templates["alerted_row"].substitute(article_id=article.article_id, title=article.title,
+                                                     journal=article.journal, alerted_on="2025-01-01")
+            for article in listed
+        )
+        return self.templates["alerted"].substitute(rows=rows, token="benchmark-token")
+
+    def delete_alerts(self, article_ids: List[str]):
+        with self._lock:
+            self.deleted_ids.update(article_id for article_id in article_ids if article_id in self.by_article_id)
+
+    def render_article(self, article: MockArticle, base_url: str) -> str:
+        pubmed_link = ""
+        if "pubmed_link" not in article.missing:
+            pubmed_link = Template(PUBMED_LINK_HTML).substitute(pubmed_url=f"{base_url}/pubmed/{article.pmid}/")
+        ratings = ""
+        if "ratings" not in article.missing:
+            rows = "".join(
+                self.templates["rating_row"].substitute(discipline=discipline, relevance=relevance,
+                                                        newsworthiness=newsworthiness)
+                for discipline, relevance, newsworthiness in article.ratings
+            )
+            ratings = self.templates["ratings"].substitute(rows=rows)
+        return self.templates["alerted_article"].substitute(
+            title=article.title, journal=article.journal, pubmed_link=pubmed_link,
+            abstract="" if "abstract" in article.missing else article.abstract, ratings=ratings,
+        )
+
+    def render_pubmed(self, article: MockArticle) -> str:
+        meta = []
+        if "title" not in article.missing:
+            meta.append(("citation_title", article.title))
+        if "journal" not in article.missing:
+            meta.append(("citation_journal_title", article.journal))
+        if "date" not in article.missing:
+            meta.append(("citation_date", article.published_at))
+        if "doi" not in article.missing:
+            meta.append(("citation_doi", article.doi))
+        meta.append(("citation_pmid", article.pmid))
+        meta_tags = "\n".join(Template(PUBMED_META_HTML).substitute(name=name, content=content) for name, content in meta)
+        return self.templates["pubmed"].substitute(
+            title=article.title, pmid=article.pmid, abstract=article.abstract, meta_tags=meta_tags,
+            title_h1="" if "title" in article.missing else Template(PUBMED_TITLE_H1_HTML).substitute(title=article.title),
+            journal_button="" if "journal" in article.missing else Template(PUBMED_JOURNAL_BUTTON_HTML).substitute(journal=article.journal),
+            doi_identifier="" if "doi" in article.missing else Template(PUBMED_DOI_HTML).substitute(doi=article.doi),
+        )
+
+
+class MockRequestHandler(http.server.BaseHTTPRequestHandler):
+    """Serves the login, listing, AlertedArticle and PubMed pages of the server's MockSite."""
+
+    server: "MockServer"
+
+    def log_message(self, format, *args):
+        logger.debug("mock site: " + format % args)
+
+    def _logged_in(self) -> bool:
+        cookies = SimpleCookie(self.headers.get("Cookie", ""))
+        return SESSION_COOKIE_NAME in cookies and cookies[SESSION_COOKIE_NAME].value == SESSION_COOKIE_VALUE
+
+    def _send_html(self, html: str, status: int = 200, headers: Optional[List[Tuple[str, str]]] = None):
+        body = html.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers or []:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _redirect(self, location: str, headers: Optional[List[Tuple[str, str]]] = None):
+        self.send_response(302)
+        self.send_header("Location", location)
+        self.send_header("Content-Length", "0")
+        for name, value in headers or []:
+            self.send_header(name, value)
+        self.end_headers()
+
+    def do_GET(self):
+        self.server.simulate_latency()
+        path = urlparse(self.path).path
+        site = self.server.site
+        parts = [part for part in path.split("/") if part]
+
+        if path == "/":
+            self._send_html("<!DOCTYPE html><html><body><p>EvidenceAlerts mock</p></body></html>")
+        elif path == "/Account/Login":
+            self._send_html(site.render_login())
+        elif path == "/Articles/Alerted":
+            if not self._logged_in():
+                self._redirect("/Account/Login?ReturnUrl=%2FArticles%2FAlerted")
+            else:
+                self._send_html(site.render_listing())
+        elif len(parts) == 3 and parts[:2] == ["Articles", "AlertedArticle"] and parts[2] in site.by_article_id:
+            if not self._logged_in():
+                self._redirect("/Account/Login?ReturnUrl=%2FArticles%2FAlerted")
+            else:
+                self._send_html(site.render_article(site.by_article_id[parts[2]], self.server.base_url))
+        elif len(parts) == 2 and parts[0] == "pubmed" and parts[1] in site.by_pmid:
+            self._send_html(site.render_pubmed(site.by_pmid[parts[1]]))
+        else:
+            self._send_html("<!DOCTYPE html><html><body><h1>Not Found</h1></body></html>", status=404)
+
+    def do_POST(self):
+        self.server.simulate_latency()
+        length = int(self.headers.get("Content-Length") or 0)
+        form = parse_qs(self.rfile.read(length).decode("utf-8"))
+        path = urlparse(self.path).path
+        if path == "/Articles/Alerted" and self._logged_in():
+            if form.get("__RequestVerificationToken") != ["benchmark-token"]:
+                self._send_html("<!DOCTYPE html><html><body><h1>Bad Request</h1></body></html>", status=400)
+                return
+            self.server.site.delete_alerts(form.get("selected", []))
+            self._redirect("/Articles/Alerted")
+            return
+        if path != "/Account/Login":
+            self._send_html("<!DOCTYPE html><html><body><h1>Not Found</h1></body></html>", status=404)
+            return
+        # Any credentials are accepted
+        self._redirect("/Articles/Alerted", headers=[
+            ("Set-Cookie", f"{SESSION_COOKIE_NAME}={SESSION_COOKIE_VALUE}; Path=/; HttpOnly"),
+        ])
+
+
+class MockServer(http.server.ThreadingHTTPServer):
+    """Threaded local HTTP server for a MockSite, adding latency (plus jitter) to every request."""
+
+    daemon_threads = True
+
+    def __init__(self, site: MockSite, latency_ms: float = 0, jitter_ms: float = 0,
+                 host: str = "127.0.0.1", port: int = 0, seed: int = 0):
+        super().__init__((host, port), MockRequestHandler)
+        self.site = site
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self.base_url = f"http://{host}:{self.server_address[1]}"
+
+    def simulate_latency(self):
+        delay_ms = self.latency_ms
+        if self.jitter_ms:
+            with self._random_lock:
+                delay_ms += self._random.uniform(0, self.jitter_ms)
+        if delay_ms > 0:
+            time.sleep(delay_ms / 1000)
+
+
+def start_mock_site(site: MockSite, latency_ms: float = 0, jitter_ms: float = 0,
+                    host: str = "127.0.0.1", port: int = 0) -> MockServer:
+    """Starts the mock site in a background thread. Stop it with server.shutdown()."""
+    server = MockServer(site, latency_ms=latency_ms, jitter_ms=jitter_ms, host=host, port=port)
+    threading.Thread(target=server.serve_forever, name="mock-site", daemon=True).start()
+    logger.info(f"Mock EvidenceAlerts/PubMed site serving {len(site.articles)} articles on {server.base_url}")
+    return server
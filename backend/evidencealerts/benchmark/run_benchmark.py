@@ -0,0 +1,304 @@
+import argparse
+import functools
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+# The scraper and its sibling modules are flat scripts living in scrape_evidence/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scrape_evidence"))
+
+import scrape_evidencealerts as scraper
+from mock_site import MockSite, SCENARIOS, start_mock_site
+
+# --- Configuration ---
+# sequential: one supervised driver (default browser mode). pool: --workers drivers sharing one login.
+# http: browserless mode (HTTP login + pooled requests).
+# archive: --from-archive re-extraction of pages archived by an http scrape (the scrape counts as setup,
+# and its function timings and wait statistics are left out of the report).
+MODES = ("sequential", "pool", "http", "archive")
+DEFAULT_ARTICLES = 30
+DEFAULT_POOL_WORKERS = 4
+# Extraction functions whose time is reported. Calls between them go through the module
+# globals, so wrapping the module attributes is enough. Times are inclusive (nested calls overlap).
+TIMED_FUNCTIONS = (
+    "perform_login",
+    "open_http_session",
+    "extract_article_links",
+    "parse_article_links_html",
+    "process_single_article",
+    "process_single_article_http",
+    "take_dom_snapshot",
+    "process_pubmed_interaction",
+    "process_pubmed_interaction_browser",
+    "fetch_pubmed_data_http",
+    "parse_pubmed_html",
+    "extract_data_from_pubmed",
+    "extract_data_from_pubmed_waits",
+    "extract_abstract",
+    "extract_categories",
+    "parse_rating_rows_html",
+    "translate_category_rows",
+    "extract_archived_article",
+)
+# One call of this function is one article of the mode
+ARTICLE_FUNCTIONS = {
+    "sequential": "process_single_article",
+    "pool": "process_single_article",
+    "http": "process_single_article_http",
+    "archive": "extract_archived_article",
+}
+RECORD_FIELDS = ("title", "link", "journal", "published_at", "abstract", "categories")
+
+logger = logging.getLogger("benchmark")
+
+
+def percentile(values: List[float], fraction: float) -> Optional[float]:
+    """Nearest-rank percentile (fraction in [0, 1]) of a list of values."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, min(len(ordered), int(round(fraction * len(ordered) + 0.5))))
+    return ordered[rank - 1]
+
+
+class FunctionTimer:
+    """Temporarily wraps scraper functions to record the duration of every call (thread-safe)."""
+
+    def __init__(self, module, names: tuple):
+        self.module = module
+        self.names = [name for name in names if hasattr(module, name)]
+        self.durations: Dict[str, List[float]] = {name: [] for name in self.names}
+        self._originals: Dict[str, Callable] = {}
+        self._lock = threading.Lock()
+
+    def _wrap(self, name: str, function: Callable) -> Callable:
+        @functools.wraps(function)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                with self._lock:
+                    self.durations[name].append(elapsed)
+        return timed
+
+    def reset(self):
+        """Forgets the durations recorded so far."""
+        with self._lock:
+            for durations in self.durations.values():
+                durations.clear()
+
+    def __enter__(self):
+        for name in self.names:
+            self._originals[name] = getattr(self.module, name)
+            setattr(self.module, name, self._wrap(name, self._originals[name]))
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        for name, function in self._originals.items():
+            setattr(self.module, name, function)
+
+
+def point_scraper_at(base_url: str):
+    """Redirects the scraper's EvidenceAlerts URLs to the mock site (PubMed links come from its pages)."""
+    scraper.BASE_URL = base_url
+    scraper.LOGIN_URL = f"{base_url}/Account/Login?ReturnUrl=%2FArticles%2FAlerted"
+    scraper.ALERTED_ARTICLES_URL = f"{base_url}/Articles/Alerted"
+
+
+# Every runner gets setup_done(), which drops what was measured so far (function timings, wait
+# statistics). Only run_archive calls it: its setup is a whole scrape, while the login and listing
+# timings of the other modes belong in their report.
+
+def run_sequential(args, collect: Callable[[Dict[str, Any]], Any], setup_done: Callable[[], None]) -> float:
+    """Runs the single-driver flow. Returns the seconds spent before the article loop (browser start + login + links)."""
+    setup_start = time.perf_counter()
+    supervisor = scraper.DriverSupervisor(scraper.perform_login, driver_profile=args.driver_profile)
+    try:
+        if not supervisor.start():
+            raise RuntimeError("Login on the mock site failed.")
+        links = scraper.extract_article_links(supervisor.driver)
+        setup_seconds = time.perf_counter() - setup_start
+        scraper.scrape_articles_sequential(supervisor, links, pubmed_fetch_mode=args.pubmed_mode, on_article=collect)
+        return setup_seconds
+    finally:
+        supervisor.quit()
+
+
+def run_pool(args, collect: Callable[[Dict[str, Any]], Any], setup_done: Callable[[], None]) -> float:
+    """Runs the driver pool flow. Returns the seconds spent before the article loop."""
+    setup_start = time.perf_counter()
+    supervisor = scraper.DriverSupervisor(scraper.perform_login, driver_profile=args.driver_profile)
+    try:
+        if not supervisor.start():
+            raise RuntimeError("Login on the mock site failed.")
+        links = scraper.extract_article_links(supervisor.driver)
+        cookies = scraper.get_session_cookies(supervisor.driver)
+    finally:
+        supervisor.quit()
+    setup_seconds = time.perf_counter() - setup_start
+    scraper.scrape_articles_parallel(links, cookies, min(args.workers, len(links)), pubmed_fetch_mode=args.pubmed_mode,
+                                     on_article=collect, driver_profile=args.driver_profile)
+    return setup_seconds
+
+
+def run_http(args, collect: Callable[[Dict[str, Any]], Any], setup_done: Callable[[], None]) -> float:
+    """Runs the browserless flow with a throwaway cookie jar. Returns the seconds spent before the article loop."""
+    setup_start = time.perf_counter()
+    scraper._http_session = None # Fresh connection pool for every run
+    with tempfile.TemporaryDirectory() as temp_dir:
+        listing_html = scraper.open_http_session(os.path.join(temp_dir, "cookies.json"), driver_profile=args.driver_profile)
+    if listing_html is None:
+        raise RuntimeError("Login on the mock site failed.")
+    links = scraper.parse_article_links_html(listing_html)
+    setup_seconds = time.perf_counter() - setup_start
+    scraper.scrape_articles_http(links, args.http_workers, on_article=collect)
+    return setup_seconds
+
+
+def run_archive(args, collect: Callable[[Dict[str, Any]], Any], setup_done: Callable[[], None]) -> float:
+    """Archives the mock site's pages with an http scrape, then times the offline re-extraction only."""
+    setup_start = time.perf_counter()
+    scraper._http_session = None
+    with tempfile.TemporaryDirectory() as temp_dir:
+        archive = scraper.open_page_archive(os.path.join(temp_dir, "page_archive"))
+        try:
+            listing_html = scraper.open_http_session(os.path.join(temp_dir, "cookies.json"), driver_profile=args.driver_profile)
+            if listing_html is None:
+                raise RuntimeError("Login on the mock site failed.")
+            scraper.scrape_articles_http(scraper.parse_article_links_html(listing_html), args.http_workers)
+            setup_seconds = time.perf_counter() - setup_start
+            setup_done()
+            scraper.reextract_from_archive(archive, on_article=collect)
+        finally:
+            scraper.close_page_archive()
+    return setup_seconds
+
+
+MODE_RUNNERS = {"sequential": run_sequential, "pool": run_pool, "http": run_http, "archive": run_archive}
+
+
+def benchmark_mode(mode: str, args) -> Dict[str, Any]:
+    """Runs one scraping mode against the mock site and returns its measurements."""
+    records: List[Dict[str, Any]] = []
+    records_lock = threading.Lock()
+
+    def collect(article_data: Dict[str, Any]):
+        with records_lock:
+            records.append(article_data)
+
+    timeouts_before = dict(scraper.WAIT_STATS.timeouts)
+    seconds_lost_before = dict(scraper.WAIT_STATS.seconds_lost)
+    logger.info(f"=== {mode}: {args.articles} articles, scenario '{args.scenario}', latency {args.latency_ms} ms ===")
+    start = time.perf_counter()
+    with FunctionTimer(scraper, TIMED_FUNCTIONS) as timer:
+        def setup_done():
+            timer.reset()
+            timeouts_before.update(scraper.WAIT_STATS.timeouts)
+            seconds_lost_before.update(scraper.WAIT_STATS.seconds_lost)
+
+        setup_seconds = MODE_RUNNERS[mode](args, collect, setup_done)
+    total_seconds = time.perf_counter() - start
+    article_seconds = total_seconds - setup_seconds
+
+    latencies = timer.durations.get(ARTICLE_FUNCTIONS[mode], [])
+    functions = {
+        name: {"calls": len(durations), "total_s": round(sum(durations), 3),
+               "mean_ms": round(1000 * sum(durations) / len(durations), 1)}
+        for name, durations in timer.durations.items() if durations
+    }
+    seconds_lost = {
+        field: round(seconds - seconds_lost_before.get(field, 0.0), 3)
+        for field, seconds in scraper.WAIT_STATS.seconds_lost.items()
+        if seconds - seconds_lost_before.get(field, 0.0) > 0
+    }
+    return {
+        "mode": mode,
+        "workers": {"sequential": 1, "pool": args.workers, "http": args.http_workers, "archive": 1}[mode],
+        "articles_scraped": len(records),
+        "setup_s": round(setup_seconds, 3),
+        "articles_s": round(article_seconds, 3),
+        "articles_per_minute": round(60 * len(records) / article_seconds, 1) if article_seconds > 0 else None,
+        "latency_p50_ms": round(1000 * percentile(latencies, 0.50), 1) if latencies else None,
+        "latency_p95_ms": round(1000 * percentile(latencies, 0.95), 1) if latencies else None,
+        "fields_found": {field: sum(1 for record in records if record.get(field)) for field in RECORD_FIELDS},
+        "wait_timeouts": {
+            field: count - timeouts_before.get(field, 0)
+            for field, count in scraper.WAIT_STATS.timeouts.items() if count - timeouts_before.get(field, 0)
+        },
+        "wait_seconds_lost": seconds_lost,
+        "functions": functions,
+    }
+
+
+def print_report(results: List[Dict[str, Any]]):
+    print("\n" + "=" * 78)
+    print(f"{'mode':<12}{'workers':>8}{'articles':>10}{'setup s':>10}{'art/min':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    for result in results:
+        print(f"{result['mode']:<12}{result['workers']:>8}{result['articles_scraped']:>10}{result['setup_s']:>10}"
+              f"{result['articles_per_minute'] or '-':>10}{result['latency_p50_ms'] or '-':>10}{result['latency_p95_ms'] or '-':>10}")
+    for result in results:
+        print(f"\n--- {result['mode']}: time per function (inclusive) ---")
+        for name, stats in sorted(result["functions"].items(), key=lambda item: item[1]["total_s"], reverse=True):
+            print(f"  {name:<36}{stats['calls']:>6} calls {stats['total_s']:>9.3f} s {stats['mean_ms']:>9.1f} ms/call")
+        print(f"  fields found: {result['fields_found']}")
+        if result["wait_timeouts"]:
+            print(f"  wait timeouts: {result['wait_timeouts']} (seconds lost: {result['wait_seconds_lost']})")
+    print("=" * 78)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Offline throughput benchmark of the EvidenceAlerts scraper against a local mock site."
+    )
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES), help="Scraping modes to run (default: all)")
+    parser.add_argument("--articles", type=int, default=DEFAULT_ARTICLES, help=f"Number of alerted articles on the mock site (default: {DEFAULT_ARTICLES})")
+    parser.add_argument("--scenario", choices=SCENARIOS, default="complete",
+                        help="complete: every field present; missing-optional: no DOI/journal/date on PubMed; mixed: one field missing per article (default: complete)")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Latency added to every mock request, in ms (default: 0)")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="Random extra latency per request, up to this many ms (default: 0)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_POOL_WORKERS, help=f"Drivers in pool mode (default: {DEFAULT_POOL_WORKERS})")
+    parser.add_argument("--http-workers", type=int, default=scraper.DEFAULT_HTTP_WORKERS, help=f"Concurrent fetches in http mode (default: {scraper.DEFAULT_HTTP_WORKERS})")
+    parser.add_argument("--pubmed-mode", choices=scraper.PUBMED_FETCH_MODES, default=scraper.PUBMED_FETCH_MODE, help="PubMed fetch mode of the browser modes")
+    parser.add_argument("--driver-profile", choices=scraper.DRIVER_PROFILES, default=scraper.DRIVER_PROFILE, help="Chrome profile of the browser modes")
+    parser.add_argument("--field-timeout", type=float, default=scraper.OPTIONAL_FIELD_WAIT_TIMEOUT, help="Wait budget of optional fields, in seconds")
+    parser.add_argument("--article-deadline", type=float, default=scraper.ARTICLE_DEADLINE, help="Per-article deadline, in seconds")
+    parser.add_argument("--output", help="Also write the results to this JSON file")
+    parser.add_argument("--verbose", action="store_true", help="Keep the scraper's INFO logs")
+    args = parser.parse_args()
+    if args.articles < 1 or args.workers < 1 or args.http_workers < 1:
+        parser.error("--articles, --workers and --http-workers must be at least 1")
+
+    if not args.verbose:
+        logging.getLogger(scraper.__name__).setLevel(logging.WARNING)
+    scraper.WAIT_POLICY.field_timeout = args.field_timeout
+    scraper.WAIT_POLICY.article_deadline = args.article_deadline
+
+    server = start_mock_site(MockSite(args.articles, args.scenario), latency_ms=args.latency_ms, jitter_ms=args.jitter_ms)
+    point_scraper_at(server.base_url)
+    results = []
+    try:
+        for mode in args.modes:
+            try:
+                results.append(benchmark_mode(mode, args))
+            except Exception as mode_err:
+                logger.error(f"Benchmark of mode '{mode}' failed: {mode_err}")
+    finally:
+        server.shutdown()
+
+    print_report(results)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({"articles": args.articles, "scenario": args.scenario, "latency_ms": args.latency_ms,
+                       "jitter_ms": args.jitter_ms, "results": results}, f, indent=2)
+        logger.info(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
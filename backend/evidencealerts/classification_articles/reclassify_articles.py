@@ -1,6 +1,8 @@
 import asyncio
+import datetime
 import os
 import json
+import threading
 import time
 import logging
 from typing import List, Dict, Set, Tuple, Optional, Any
@@ -44,6 +46,15 @@ PROCESS_CONCURRENCY = 1
 BATCH_SIZE = 1
 LOOP_DELAY_SECONDS = 1
 MAX_CONTENT_LENGTH = 1500000
+# Everything before this line of the prompt templates (instructions + master classifications list) is
+# the same for every article: it is given to Gemini once per API key (see PrefixedModel)
+ARTICLE_DETAILS_MARKER = "**Article Details:**"
+# As in scrape_evidence/prompt_prefix.py: 'cached' (Gemini CachedContent), 'system' (system instruction),
+# 'inline' (whole prompt in every call); 'auto' takes the first that works
+PREFIX_MODES = ("cached", "system", "inline")
+PROMPT_PREFIX_MODE = "auto"
+PREFIX_CACHE_TTL_SECONDS = 3600
+PREFIX_CACHE_REFRESH_MARGIN_SECONDS = 300 # The TTL is extended when less than this is left
 RESULT_DIR = Path("result_arbitration")
 DELAY_BETWEEN_CALLS = 1.0
 
@@ -55,6 +66,12 @@ sub_disciplines_map: Dict[int, Dict[str, int]] = {}
 prompt_template_cache: Optional[str] = None
 arbitration_prompt_template_cache: Optional[str] = None
 master_classifications_list_str_cache: Optional[str] = None
+prompt_prefixes: Dict[str, str] = {} # Prompt kind -> static prefix, master list included
+prefixed_models: Dict[Tuple[str, str], "PrefixedModel"] = {} # (API key, prompt kind) -> model holding that prefix
+prefixed_models_lock = asyncio.Lock()
+# genai.configure() sets the API key of the whole process, and the SDK reads it on each call (generate,
+# cached content create/update/delete): every configure + SDK call pair runs under this lock
+genai_lock = threading.Lock()
 
 def load_api_key():
     global current_google_api_key_index
@@ -198,6 +215,133 @@ def format_arbitration_prompt_content(
         logger.error(f"Error formatting arbitration prompt: {e}", exc_info=True)
         return None
 
+def build_prompt_prefixes() -> None:
+    """Splits both templates at ARTICLE_DETAILS_MARKER; the part before it, master list filled in, is their static prefix."""
+    global prompt_prefixes
+    prompt_prefixes = {}
+    templates = (("reclassification", load_prompt_template()),
+                 ("arbitration", load_prompt_template(filepath=ARBITRATION_PROMPT_FILENAME, is_arbitration=True)))
+    for kind, template in templates:
+        marker_position = template.find(ARTICLE_DETAILS_MARKER) if template else -1
+        if marker_position <= 0:
+            logger.warning(f"'{ARTICLE_DETAILS_MARKER}' not found in the {kind} prompt template: the whole prompt is sent with every call.")
+            continue
+        prefix = template[:marker_position].replace("{master_classifications_list_str}", master_classifications_list_str_cache)
+        prompt_prefixes[kind] = prefix
+        logger.info(f"Static prefix of the {kind} prompt: {len(prefix)} of {len(template)} template chars (master list included).")
+
+def run_with_api_key(api_key: str, function, *args, **kwargs):
+    """Runs a blocking SDK call with api_key configured, without another thread switching the key in between."""
+    with genai_lock:
+        genai.configure(api_key=api_key)
+        return function(*args, **kwargs)
+
+class PrefixedModel:
+    """
+    Local copy of scrape_evidence/prompt_prefix.PrefixedModel, bound to one API key (a cached
+    content belongs to that key's project): the static prefix is given once, in the first of
+    PREFIX_MODES that works, and generate_content() only takes the per-article part.
+    Every SDK call goes through run_with_api_key. Blocking: call it from a worker thread.
+    """
+
+    def __init__(self, api_key: str, prefix: str, mode: str = PROMPT_PREFIX_MODE, name: str = "prompt"):
+        self.api_key = api_key
+        self.prefix = prefix
+        self.name = name
+        self.mode = None
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+        self._model = None
+        self._cache = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+        self._setup(PREFIX_MODES[0] if mode == "auto" else mode)
+
+    def _setup(self, first_mode: str):
+        for mode in PREFIX_MODES[PREFIX_MODES.index(first_mode):]:
+            try:
+                run_with_api_key(self.api_key, self._create_model, mode)
+            except Exception as e:
+                logger.info(f"{self.name}: prefix mode '{mode}' unavailable ({type(e).__name__}: {e}).")
+                continue
+            self.mode = mode
+            logger.info(f"{self.name}: static prompt prefix ({len(self.prefix)} chars) sent in '{mode}' mode.")
+            return
+        raise RuntimeError(f"{self.name}: could not initialize model '{GEMINI_MODEL}'")
+
+    def _create_model(self, mode: str):
+        generation_config = genai.types.GenerationConfig(response_mime_type="application/json")
+        if mode == "cached":
+            self._cache = genai.caching.CachedContent.create(
+                model=f"models/{GEMINI_MODEL}",
+                display_name=self.name,
+                system_instruction=self.prefix,
+                ttl=datetime.timedelta(seconds=PREFIX_CACHE_TTL_SECONDS),
+            )
+            self._expires_at = time.monotonic() + PREFIX_CACHE_TTL_SECONDS
+            self._model = genai.GenerativeModel.from_cached_content(cached_content=self._cache, generation_config=generation_config)
+        elif mode == "system":
+            self._model = genai.GenerativeModel(GEMINI_MODEL, generation_config=generation_config, system_instruction=self.prefix)
+        else:
+            self._model = genai.GenerativeModel(GEMINI_MODEL, generation_config=generation_config)
+
+    def _keep_cache_alive(self):
+        with self._lock:
+            if self.mode != "cached" or self._expires_at - time.monotonic() > PREFIX_CACHE_REFRESH_MARGIN_SECONDS:
+                return
+            try:
+                run_with_api_key(self.api_key, self._cache.update, ttl=datetime.timedelta(seconds=PREFIX_CACHE_TTL_SECONDS))
+                self._expires_at = time.monotonic() + PREFIX_CACHE_TTL_SECONDS
+            except Exception as e:
+                logger.warning(f"{self.name}: could not extend the cached prefix ({e}). Falling back to the system instruction.")
+                self._cache = None
+                self._setup("system")
+
+    def generate_content(self, prompt: str):
+        self._keep_cache_alive()
+        contents = self.prefix + prompt if self.mode == "inline" else prompt
+        response = run_with_api_key(self.api_key, self._model.generate_content, contents)
+        usage = getattr(response, "usage_metadata", None)
+        with self._lock:
+            self.calls += 1
+            self.prompt_tokens += getattr(usage, "prompt_token_count", 0) or 0
+            self.cached_tokens += getattr(usage, "cached_content_token_count", 0) or 0
+        return response
+
+    def usage_summary(self) -> str:
+        return (f"{self.name}: {self.calls} calls in '{self.mode}' mode, {self.prompt_tokens} prompt tokens "
+                f"({self.cached_tokens} served from the cache)")
+
+    def close(self):
+        """Deletes the cached content, if any (it is otherwise billed until its TTL expires)."""
+        with self._lock:
+            if self._cache is None:
+                return
+            try:
+                run_with_api_key(self.api_key, self._cache.delete)
+            except Exception as e:
+                logger.warning(f"{self.name}: could not delete the cached prefix ({e}). It expires with its TTL.")
+            self._cache = None
+
+async def get_prefixed_model(api_key: str, kind: str) -> PrefixedModel:
+    """The model holding the static prefix of `kind` for this API key (created once per key and kind)."""
+    async with prefixed_models_lock:
+        model = prefixed_models.get((api_key, kind))
+        if model is None:
+            model = await asyncio.to_thread(
+                PrefixedModel, api_key, prompt_prefixes[kind], mode=PROMPT_PREFIX_MODE,
+                name=f"{kind} prompt (key {GOOGLE_API_KEYS_LIST.index(api_key)})",
+            )
+            prefixed_models[(api_key, kind)] = model
+        return model
+
+def close_prefixed_models() -> None:
+    for model in prefixed_models.values():
+        logger.info(model.usage_summary())
+        model.close()
+    prefixed_models.clear()
+
 async def call_gemini_api(prompt: str, semaphore: asyncio.Semaphore) -> Optional[Dict[str, Any]]:
     try:
         api_key = load_api_key()
@@ -205,18 +349,27 @@ async def call_gemini_api(prompt: str, semaphore: asyncio.Semaphore) -> Optional
         logger.error(f"Failed to load API key: {e}")
         return None
         
-    genai.configure(api_key=api_key)
-    model = genai.GenerativeModel(
-        GEMINI_MODEL,
-        generation_config=genai.types.GenerationConfig(response_mime_type="application/json")
-    )
+    kind = next((kind for kind, prefix in prompt_prefixes.items() if prompt.startswith(prefix)), None)
+    if kind is not None:
+        # Only the article-specific part is sent; the model already holds the prefix
+        model = await get_prefixed_model(api_key, kind)
+        prompt = prompt[len(prompt_prefixes[kind]):]
+        generate = model.generate_content
+    else:
+        model = genai.GenerativeModel(
+            GEMINI_MODEL,
+            generation_config=genai.types.GenerationConfig(response_mime_type="application/json")
+        )
+
+        def generate(contents: str):
+            return run_with_api_key(api_key, model.generate_content, contents)
     attempts = 0
     async with semaphore:
         while attempts < MAX_GEMINI_RETRIES:
             attempts += 1
             try:
                 logger.debug(f"Calling Gemini API (Attempt {attempts})...")
-                response = await asyncio.to_thread(model.generate_content, prompt)
+                response = await asyncio.to_thread(generate, prompt)
                 
                 if not response.parts:
                     logger.warning(f"Gemini call attempt {attempts} returned no parts.")
@@ -538,6 +691,7 @@ async def main():
     if not await fetch_master_discipline_data(supabase):
         logger.critical("Failed to load master discipline data. Cannot proceed.")
         return
+    build_prompt_prefixes()
 
     actual_concurrency_limit = max(3, GEMINI_CONCURRENCY_LIMIT) 
     gemini_semaphore = asyncio.Semaphore(actual_concurrency_limit)
@@ -597,6 +751,7 @@ async def main():
             logger.info(f"Attempting to wait for {len(processing_tasks)} active tasks before exiting due to critical error...")
             await asyncio.gather(*processing_tasks, return_exceptions=True)
     finally:
+        close_prefixed_models()
         logger.info("Processing loop finished.")
 
 if __name__ == "__main__":
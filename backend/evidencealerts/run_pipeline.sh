@@ -34,6 +34,13 @@ echo
 SCRAPER_SCRIPT="scrape_evidence/scrape_evidencealerts.py"
 GENERATOR_SCRIPT="scrape_evidence/generate_summaries.py"
 EXPORTER_SCRIPT="scrape_evidence/export_to_db.py"
+PURGE_SCRIPT="scrape_evidence/purge_alerts.py"
+# Optional: set to 1 (PURGE_EXPORTED_ALERTS=1 ./run_pipeline.sh) to delete the exported alerts
+# from the EvidenceAlerts "Alerted" page after the export. Off by default: the deletion cannot be undone.
+PURGE_EXPORTED_ALERTS="${PURGE_EXPORTED_ALERTS:-0}"
+# Optional: set to 1 (ARCHIVE_PAGES=1 ./run_pipeline.sh) to keep the raw pages of each scraped article in
+# page_archive/ for --from-archive re-extraction. Off by default: the archive is never pruned and grows every run.
+ARCHIVE_PAGES="${ARCHIVE_PAGES:-0}"
 CLASSIFICATION_SCRIPT="classification_articles/reclassify_articles.py"
 GRADING_SCRIPT="grade_articles/pubmed_grading.py"
 
@@ -42,7 +49,8 @@ TODAY_DATE=$(date +'%Y%m%d')
 
 # Define expected output paths based on the Python scripts' logic
 DATA_DIR="data/${TODAY_DATE}"
-DATA_FILE="${DATA_DIR}/data.json"
+# The scraper streams one article per line to data.jsonl (data.json is only written at the end)
+DATA_FILE="${DATA_DIR}/data.jsonl"
 SUMMARIES_DIR="summaries/${TODAY_DATE}"
 
 # --- Execution ---
@@ -53,25 +61,51 @@ echo "Date: ${TODAY_DATE}"
 echo "========================================"
 echo
 
-# 1. Run the Scraper
+# 1 & 2. Run the Scraper, with the Summary Generator following its output
+# The generator tails ${DATA_FILE} and summarizes each article as soon as it is scraped;
+# it stops once the scraper closes the file (${DATA_FILE}.done).
+# A file from an earlier run today is kept as ${DATA_FILE}.<timestamp> (as the scraper's JsonlWriter does):
+# it must be moved away before the generator starts following the path
+if [ -s "${DATA_FILE}" ]; then
+    ROTATED_DATA_FILE="${DATA_FILE}.$(date +%Y%m%d_%H%M%S)"
+    mv "${DATA_FILE}" "${ROTATED_DATA_FILE}"
+    echo "Kept the earlier run's ${DATA_FILE} as ${ROTATED_DATA_FILE}."
+fi
+rm -f "${DATA_FILE}" "${DATA_FILE}.done"
+GENERATOR_PID=""
+# Whatever makes this script exit (scraper failure, set -e, Ctrl-C), never leave the generator tailing in the background
+stop_generator() {
+    if [ -n "${GENERATOR_PID}" ] && kill -0 "${GENERATOR_PID}" 2>/dev/null; then
+        echo "Stopping Summary Generator (PID ${GENERATOR_PID})..."
+        kill "${GENERATOR_PID}" 2>/dev/null || true
+        wait "${GENERATOR_PID}" 2>/dev/null || true
+    fi
+}
+trap stop_generator EXIT
+
+echo "[Step 2/5] Starting Summary Generator in follow mode: ${GENERATOR_SCRIPT}"
+python3 "${GENERATOR_SCRIPT}" --follow "${DATA_FILE}" &
+GENERATOR_PID=$!
+
 echo "[Step 1/5] Running Scraper: ${SCRAPER_SCRIPT}"
-python3 "${SCRAPER_SCRIPT}"
+SCRAPER_ARGS=""
+if [ "${ARCHIVE_PAGES}" = "1" ]; then
+    SCRAPER_ARGS="--archive-pages"
+    echo "[Step 1/5] Raw pages are archived in page_archive/ (ARCHIVE_PAGES=1)."
+fi
+SCRAPER_STATUS=0
+python3 "${SCRAPER_SCRIPT}" ${SCRAPER_ARGS} || SCRAPER_STATUS=$?
+if [ "${SCRAPER_STATUS}" -ne 0 ]; then
+    echo "[Step 1/5] Error: Scraper failed with exit status ${SCRAPER_STATUS}. Stopping the pipeline."
+    exit "${SCRAPER_STATUS}" # The EXIT trap stops the generator
+fi
 echo "[Step 1/5] Scraper finished."
 echo
 
-# 2. Check if scraper output exists and run the Summary Generator
-echo "[Step 2/5] Checking for scraped data file: ${DATA_FILE}"
-
-if [ -f "${DATA_FILE}" ]; then
-    echo "[Step 2/5] Data file found. Running Summary Generator: ${GENERATOR_SCRIPT}"
-    # Pass the path to the generated data.json file as an argument
-    python3 "${GENERATOR_SCRIPT}" "${DATA_FILE}"
-    echo "[Step 2/5] Summary Generator finished."
-else
-    echo "[Step 2/5] Warning: Scraped data file ${DATA_FILE} not found."
-    echo "[Step 2/5] This might be okay if no new articles were found."
-    echo "[Step 2/5] Summary Generator will be skipped."
-fi
+echo "[Step 2/5] Waiting for Summary Generator to finish..."
+wait "${GENERATOR_PID}"
+GENERATOR_PID=""
+echo "[Step 2/5] Summary Generator finished."
 echo
 
 # 3. Check if summaries directory exists and run the DB Exporter
@@ -82,6 +116,11 @@ if [ -d "${SUMMARIES_DIR}" ]; then
     # Pass the path to the directory containing summary JSON files
     python3 "${EXPORTER_SCRIPT}" "${SUMMARIES_DIR}"
     echo "[Step 3/5] Database Exporter finished."
+    if [ "${PURGE_EXPORTED_ALERTS}" = "1" ]; then
+        # Deletes only the alerts the article index marks as exported, so the next listing stays small
+        echo "[Step 3/5] Deleting exported alerts from EvidenceAlerts: ${PURGE_SCRIPT}"
+        python3 "${PURGE_SCRIPT}" || echo "[Step 3/5] Warning: alert purge failed. Exported alerts stay listed (the scraper skips them)."
+    fi
 else
     echo "[Step 3/5] Warning: Summaries directory ${SUMMARIES_DIR} not found or wasn't created."
     echo "[Step 3/5] Database Exporter will be skipped."
@@ -115,6 +154,11 @@ echo "========================================"
 echo "Cleaning up temporary directories..."
 echo "========================================"
 
+# article_index.sqlite3 is kept: it remembers which alerts were already scraped/exported
+# pmid_cache.sqlite3 is kept too: DOI -> PMID answers used for canonical PubMed links
+# metrics/ is kept as well: one JSON file per scraper run plus the Prometheus textfile
+# page_archive/ (only written with ARCHIVE_PAGES=1) is kept: the raw pages that --from-archive re-extracts offline
+# summary_cache.sqlite3 is kept: validated Gemini responses, reused when an article is summarized again
 echo "Removing temporary directories: data, links, summaries, result_arbitration"
 rm -rf data links summaries result_arbitration
 echo "Cleanup completed."
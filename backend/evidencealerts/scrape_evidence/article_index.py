@@ -0,0 +1,195 @@
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import List, Dict, Optional, Any, Tuple
+
+# --- Configuration ---
+# Lives next to run_pipeline.sh, outside the data/links/summaries directories that the pipeline deletes.
+DEFAULT_INDEX_PATH = "article_index.sqlite3"
+
+ALERTED_ARTICLE_ID_PATTERN = re.compile(r'/Articles/AlertedArticle/(\d+)', re.IGNORECASE)
+DOI_PATTERN = re.compile(r'(10\.\d{4,9}/[-._;()/:A-Z0-9]+)', re.IGNORECASE)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    article_id    TEXT PRIMARY KEY,
+    url           TEXT,
+    doi           TEXT,
+    link          TEXT,
+    record        TEXT,
+    scraped_at    REAL,
+    summarized_at REAL,
+    exported_at   REAL
+);
+CREATE INDEX IF NOT EXISTS idx_articles_doi ON articles (doi);
+CREATE INDEX IF NOT EXISTS idx_articles_link ON articles (link);
+"""
+
+logger = logging.getLogger(__name__)
+
+
+def extract_alerted_article_id(url: Optional[str]) -> Optional[str]:
+    """Returns the numeric EvidenceAlerts AlertedArticle ID from an article URL."""
+    if not url:
+        return None
+    match = ALERTED_ARTICLE_ID_PATTERN.search(url)
+    return match.group(1) if match else None
+
+
+def extract_doi(value: Optional[str]) -> Optional[str]:
+    """Returns the lower-cased DOI contained in a DOI, doi.org URL or PubMed '?term=' link."""
+    if not value:
+        return None
+    match = DOI_PATTERN.search(value)
+    return match.group(1).lower() if match else None
+
+
+class ArticleIndex:
+    """
+    Small SQLite index of the articles the pipeline has already handled, keyed by
+    AlertedArticle ID (with a secondary index on DOI and PubMed link).
+    Records which articles were scraped (with the scraped record itself, so a re-run can
+    reuse it without opening any page), summarized and exported to Supabase.
+    Safe to share between threads.
+    """
+
+    def __init__(self, path: str = DEFAULT_INDEX_PATH):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+        logger.info(f"Opened article index: {path}")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    # --- Writes ---
+
+    def record_scraped(self, record: Dict[str, Any]):
+        """Stores a scraped article record (as produced by the scraper) and marks it scraped."""
+        article_id = extract_alerted_article_id(record.get("url"))
+        if not article_id:
+            logger.warning(f"Cannot index record without an AlertedArticle ID: {record.get('url')}")
+            return
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT INTO articles (article_id, url, doi, link, record, scraped_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(article_id) DO UPDATE SET
+                    url = excluded.url, doi = excluded.doi, link = excluded.link,
+                    record = excluded.record, scraped_at = excluded.scraped_at
+                """,
+                (article_id, record.get("url"), extract_doi(record.get("doi")) or extract_doi(record.get("link")), record.get("link"),
+                 json.dumps(record, ensure_ascii=False), time.time()),
+            )
+            self._conn.commit()
+
+    def mark_summarized(self, url: Optional[str]):
+        """Marks the article behind an EvidenceAlerts URL as summarized."""
+        self._mark("summarized_at", url=url)
+
+    def mark_exported(self, url: Optional[str] = None, link: Optional[str] = None):
+        """Marks an article as exported to Supabase, by EvidenceAlerts URL or by PubMed link/DOI."""
+        self._mark("exported_at", url=url, link=link)
+
+    def _mark(self, column: str, url: Optional[str] = None, link: Optional[str] = None):
+        article_id = extract_alerted_article_id(url)
+        doi = extract_doi(link)
+        now = time.time()
+        with self._lock:
+            if article_id:
+                self._conn.execute(
+                    f"INSERT INTO articles (article_id, url, link, doi, {column}) VALUES (?, ?, ?, ?, ?) "
+                    f"ON CONFLICT(article_id) DO UPDATE SET {column} = excluded.{column}",
+                    (article_id, url, link, doi, now),
+                )
+            elif link or doi:
+                self._conn.execute(
+                    f"UPDATE articles SET {column} = ? WHERE link = ? OR (doi IS NOT NULL AND doi = ?)",
+                    (now, link, doi),
+                )
+            else:
+                logger.debug(f"Nothing to mark as {column}: no URL or link given.")
+                return
+            self._conn.commit()
+
+    # --- Reads ---
+
+    def get(self, article_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT article_id, url, doi, link, record, scraped_at, summarized_at, exported_at "
+                "FROM articles WHERE article_id = ?",
+                (article_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        keys = ("article_id", "url", "doi", "link", "record", "scraped_at", "summarized_at", "exported_at")
+        return dict(zip(keys, row))
+
+    def is_exported(self, url: Optional[str] = None, link: Optional[str] = None, doi: Optional[str] = None) -> bool:
+        """True if the article (by EvidenceAlerts URL, or by PubMed link/DOI) was already exported."""
+        article_id = extract_alerted_article_id(url)
+        doi = extract_doi(doi) or extract_doi(link)
+        with self._lock:
+            if article_id:
+                row = self._conn.execute(
+                    "SELECT 1 FROM articles WHERE article_id = ? AND exported_at IS NOT NULL", (article_id,)
+                ).fetchone()
+                if row:
+                    return True
+            if doi:
+                row = self._conn.execute(
+                    "SELECT 1 FROM articles WHERE doi = ? AND exported_at IS NOT NULL", (doi,)
+                ).fetchone()
+                if row:
+                    return True
+            if link:
+                row = self._conn.execute(
+                    "SELECT 1 FROM articles WHERE link = ? AND exported_at IS NOT NULL", (link,)
+                ).fetchone()
+                if row:
+                    return True
+        return False
+
+    def partition_links(self, article_links: List[str]) -> Tuple[List[str], Dict[str, Dict[str, Any]], List[str]]:
+        """
+        Splits listing links before any page is opened:
+          - links that still have to be scraped,
+          - {link: stored record} for articles scraped earlier but not exported yet,
+          - links of articles that were already exported (nothing left to do).
+        """
+        to_scrape: List[str] = []
+        reusable: Dict[str, Dict[str, Any]] = {}
+        exported: List[str] = []
+        for link in article_links:
+            article_id = extract_alerted_article_id(link)
+            entry = self.get(article_id) if article_id else None
+            if entry is None:
+                to_scrape.append(link)
+            elif entry["exported_at"]:
+                exported.append(link)
+            elif entry["record"]:
+                try:
+                    reusable[link] = json.loads(entry["record"])
+                except json.JSONDecodeError:
+                    to_scrape.append(link)
+            else:
+                to_scrape.append(link)
+        return to_scrape, reusable, exported
@@ -0,0 +1,92 @@
+import json
+import logging
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+try:
+    import ijson # Incremental JSON parser: constant memory on large JSON arrays
+except ImportError:
+    ijson = None
+
+from jsonl_stream import iter_jsonl_entries, FOLLOW_IDLE_TIMEOUT_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+class ArticleSource:
+    """
+    Streams the article records of a scraper output file, so processing starts on the first
+    record and memory does not grow with the file:
+    - '.jsonl': one record per line (see jsonl_stream), optionally tailed with follow=True;
+    - otherwise a JSON array, parsed incrementally with ijson (loaded whole if ijson is missing).
+    A run can resume where another stopped: start_index skips the first records (both formats),
+    start_offset seeks to a byte offset of a JSONL file. resume_point() tells, for each record
+    in input order, where the next run should start.
+    """
+
+    def __init__(self, path: str, start_index: int = 0, start_offset: int = 0, follow: bool = False,
+                 idle_timeout: float = FOLLOW_IDLE_TIMEOUT_SECONDS):
+        self.path = path
+        self.is_jsonl = path.endswith(".jsonl")
+        if start_offset and not self.is_jsonl:
+            raise ValueError("A byte offset can only be resumed from in a JSONL file")
+        if follow and not self.is_jsonl:
+            raise ValueError("Only a JSONL file can be followed")
+        self.start_index = start_index
+        self.start_offset = start_offset
+        self.follow = follow
+        self.idle_timeout = idle_timeout
+        self.records_read = 0
+        self._end_offsets: Dict[int, int] = {} # Record number in this run -> byte offset after it (JSONL)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        entries = self._jsonl_entries() if self.is_jsonl else self._json_array_entries()
+        for index, (end_offset, record) in enumerate(entries):
+            if index < self.start_index:
+                continue
+            if end_offset is not None:
+                self._end_offsets[self.records_read] = end_offset
+            self.records_read += 1
+            yield record
+
+    def _jsonl_entries(self) -> Iterator[Tuple[Optional[int], Dict[str, Any]]]:
+        return iter_jsonl_entries(self.path, follow=self.follow, idle_timeout=self.idle_timeout,
+                                  start_offset=self.start_offset)
+
+    def _json_array_entries(self) -> Iterator[Tuple[Optional[int], Dict[str, Any]]]:
+        if ijson is None:
+            logger.warning("ijson is not installed: loading the whole JSON file in memory (pip install ijson to stream it).")
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if not isinstance(data, list):
+                logger.error(f"Source JSON file {self.path} does not contain a list.")
+                return
+            records = iter(data)
+        else:
+            f = open(self.path, 'rb')
+            records = ijson.items(f, 'item', use_float=True)
+        try:
+            found_any = False
+            for position, record in enumerate(records):
+                found_any = True
+                if isinstance(record, dict):
+                    yield None, record
+                else:
+                    logger.warning(f"Skipping item {position} of {self.path}: not a JSON object.")
+            if not found_any:
+                logger.warning(f"No article found in {self.path} (expected a JSON array of objects).")
+        except Exception as e: # ijson.JSONError on malformed input; records parsed so far were already yielded
+            logger.error(f"Error decoding source JSON file {self.path}: {e}. Stopping after the records read so far.")
+        finally:
+            if ijson is not None:
+                f.close()
+
+    def resume_point(self, number: int) -> Tuple[int, Optional[int]]:
+        """
+        (record index, byte offset or None) from which a new run would start right after the
+        number-th record of this run (0-based). Call it once per record, in input order.
+        """
+        end_offset = self._end_offsets.pop(number, None)
+        if end_offset is not None:
+            # An offset run counts records from the offset, so index 0 from there
+            return 0, end_offset
+        return self.start_index + number + 1, None
@@ -1,5 +1,4 @@
 import os
-import json
 import argparse
 from datetime import datetime
 from supabase import create_client, Client
@@ -7,6 +6,10 @@ from dotenv import load_dotenv
 import logging
 import re # Import regex for more robust splitting
 
+from article_index import ArticleIndex, DEFAULT_INDEX_PATH
+from pubmed_resolver import PmidResolver, DEFAULT_PMID_CACHE_PATH
+from summary_bundle import iter_summary_records
+
 # --- Configuration ---
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -59,14 +62,19 @@ def get_discipline_id(discipline_name: str) -> int | None:
         logging.warning(f"Discipline name '{discipline_name}' not found in cache (or database).")
     return discipline_id
 
-def check_link_exists(supabase: Client, link: str) -> bool:
-    """Checks if an article with the given link already exists."""
+def check_link_exists(supabase: Client, link: str, resolver: PmidResolver | None = None) -> bool:
+    """
+    Checks if an article with the given link already exists.
+    With a PMID resolver, the other form of the same PubMed link (canonical /<pmid>/ or
+    legacy '?term=<doi>' search URL) is checked too.
+    """
     if not link:
         logging.warning("Skipping check for empty link.")
         return False
 
+    links = resolver.link_variants(link) if resolver is not None else [link]
     try:
-        response = supabase.table('articles').select('id', count='exact').eq('link', link).limit(1).execute()
+        response = supabase.table('articles').select('id', count='exact').in_('link', links).limit(1).execute()
         if response.count is not None and response.count > 0:
             return True
         elif hasattr(response, 'data') and response.data:
@@ -177,8 +185,13 @@ def link_article_to_discipline(supabase: Client, article_id: int, discipline_id:
 
 # --- File Processing ---
 
-def process_directory(dir_path: str, supabase: Client):
-    """Processes all .json files in the given directory."""
+def process_directory(dir_path: str, supabase: Client, index: ArticleIndex | None = None,
+                      resolver: PmidResolver | None = None):
+    """
+    Processes all summaries of the given directory: its summaries.jsonl bundle, then any .json files.
+    Articles inserted (or found to already exist) are marked as exported in the article index.
+    With a PMID resolver, existing articles are matched on both forms of their PubMed link.
+    """
     if not os.path.isdir(dir_path):
         logging.error(f"Error: Provided path '{dir_path}' is not a valid directory.")
         return
@@ -198,80 +211,78 @@ def process_directory(dir_path: str, supabase: Client):
     discipline_link_failed_count = 0
     processed_files = 0
 
-    for filename in os.listdir(dir_path):
-        if filename.lower().endswith(".json"):
-            file_path = os.path.join(dir_path, filename)
-            logging.info(f"--- Processing file: {filename} ---")
-            processed_files += 1
-            new_article_id = None # Reset for each file
-
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    try:
-                        article_data = json.load(f)
-                    except json.JSONDecodeError as json_e:
-                        logging.error(f"Error decoding JSON from file {filename}: {json_e}")
-                        article_error_count += 1
-                        continue # Skip to next file
-
-                # === Article Insertion ===
-                link = article_data.get('link')
-                if not link:
-                    logging.warning(f"Skipping file {filename}: 'link' field is missing or empty in the JSON.")
-                    article_skipped_count += 1
-                    continue
-
-                if check_link_exists(supabase, link):
-                    logging.info(f"Skipping file {filename}: Link '{link}' already exists in the database.")
-                    article_skipped_count += 1
+    for filename, article_data in iter_summary_records(dir_path):
+        logging.info(f"--- Processing file: {filename} ---")
+        processed_files += 1
+        new_article_id = None # Reset for each file
+
+        try:
+            if article_data is None:
+                article_error_count += 1 # Read/decode error logged by iter_summary_records
+                continue
+
+            # === Article Insertion ===
+            link = article_data.get('link')
+            if not link:
+                logging.warning(f"Skipping file {filename}: 'link' field is missing or empty in the JSON.")
+                article_skipped_count += 1
+                continue
+
+            if check_link_exists(supabase, link, resolver=resolver):
+                logging.info(f"Skipping file {filename}: Link '{link}' already exists in the database.")
+                article_skipped_count += 1
+                if index is not None:
+                    index.mark_exported(url=article_data.get('original_source_url'), link=link)
+            else:
+                new_article_id = insert_article(supabase, article_data) # Attempt insert
+                if new_article_id:
+                    article_inserted_count += 1
+                    if index is not None:
+                        index.mark_exported(url=article_data.get('original_source_url'), link=link)
                 else:
-                    new_article_id = insert_article(supabase, article_data) # Attempt insert
-                    if new_article_id:
-                        article_inserted_count += 1
-                    else:
-                        article_error_count += 1 # Error logged in insert_article
-
-                # === Discipline Linking (only if article was newly inserted) ===
-                if new_article_id and cache_loaded: # Only proceed if insert succeeded AND cache is loaded
-                    categories = article_data.get('categories', [])
-                    if isinstance(categories, list) and categories:
-                        logging.info(f"Attempting to link disciplines for article ID {new_article_id}...")
-                        for category_name in categories:
-                            if not isinstance(category_name, str) or not category_name.strip():
-                                logging.warning(f"Skipping invalid category name: {category_name}")
-                                continue
-
-                            discipline_id = get_discipline_id(category_name.strip()) # Use cached lookup
-                            if discipline_id:
-                                if link_article_to_discipline(supabase, new_article_id, discipline_id):
-                                    discipline_linked_count += 1
-                                else:
-                                    discipline_link_failed_count += 1
+                    article_error_count += 1 # Error logged in insert_article
+
+            # === Discipline Linking (only if article was newly inserted) ===
+            if new_article_id and cache_loaded: # Only proceed if insert succeeded AND cache is loaded
+                categories = article_data.get('categories', [])
+                if isinstance(categories, list) and categories:
+                    logging.info(f"Attempting to link disciplines for article ID {new_article_id}...")
+                    for category_name in categories:
+                        if not isinstance(category_name, str) or not category_name.strip():
+                            logging.warning(f"Skipping invalid category name: {category_name}")
+                            continue
+
+                        discipline_id = get_discipline_id(category_name.strip()) # Use cached lookup
+                        if discipline_id:
+                            if link_article_to_discipline(supabase, new_article_id, discipline_id):
+                                discipline_linked_count += 1
                             else:
-                                # Warning already logged by get_discipline_id
-                                discipline_link_failed_count += 1 # Count as failed if discipline not found
-                    elif categories:
-                         logging.warning(f"Categories field in {filename} is not a list or is empty. Skipping discipline linking.")
-                    # else: # No categories field, which is fine.
-                    #    logging.debug(f"No categories found in {filename} for article {new_article_id}.")
-
-
-            except IOError as io_e:
-                logging.error(f"Error reading file {filename}: {io_e}")
-                article_error_count += 1
-            except KeyError as key_e:
-                 logging.error(f"Missing expected key '{key_e}' in file {filename}.")
-                 article_error_count += 1
-            except Exception as e:
-                logging.error(f"An unexpected error occurred processing file {filename}: {e}")
-                article_error_count += 1
-            finally:
-                logging.info(f"--- Finished processing file: {filename} ---")
+                                discipline_link_failed_count += 1
+                        else:
+                            # Warning already logged by get_discipline_id
+                            discipline_link_failed_count += 1 # Count as failed if discipline not found
+                elif categories:
+                     logging.warning(f"Categories field in {filename} is not a list or is empty. Skipping discipline linking.")
+                # else: # No categories field, which is fine.
+                #    logging.debug(f"No categories found in {filename} for article {new_article_id}.")
+
+
+        except IOError as io_e:
+            logging.error(f"Error reading file {filename}: {io_e}")
+            article_error_count += 1
+        except KeyError as key_e:
+             logging.error(f"Missing expected key '{key_e}' in file {filename}.")
+             article_error_count += 1
+        except Exception as e:
+            logging.error(f"An unexpected error occurred processing file {filename}: {e}")
+            article_error_count += 1
+        finally:
+            logging.info(f"--- Finished processing file: {filename} ---")
 
 
     logging.info("=" * 30)
     logging.info("Processing Summary:")
-    logging.info(f"Total JSON files processed: {processed_files}")
+    logging.info(f"Total summaries processed: {processed_files}")
     logging.info(f"Articles inserted:        {article_inserted_count}")
     logging.info(f"Articles skipped (exists):  {article_skipped_count}")
     logging.info(f"Article processing errors: {article_error_count}")
@@ -285,8 +296,11 @@ def process_directory(dir_path: str, supabase: Client):
 # --- Main Execution ---
 
 if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description="Export JSON files from a directory to Supabase 'articles' and 'article_disciplines' tables.")
-    parser.add_argument("directory", help="Path to the directory containing the .json files.")
+    parser = argparse.ArgumentParser(description="Export the summaries of a directory (summaries.jsonl bundle and/or .json files) to Supabase 'articles' and 'article_disciplines' tables.")
+    parser.add_argument("directory", help="Path to the directory containing the summaries.jsonl bundle and/or .json files.")
+    parser.add_argument("--index", default=DEFAULT_INDEX_PATH, help=f"SQLite index of already exported articles (default: {DEFAULT_INDEX_PATH})")
+    parser.add_argument("--no-index", action="store_true", help="Do not update the article index")
+    parser.add_argument("--pmid-cache", default=DEFAULT_PMID_CACHE_PATH, help=f"DOI -> PMID cache used to also match legacy '?term=' / canonical links (default: {DEFAULT_PMID_CACHE_PATH})")
     args = parser.parse_args()
 
     try:
@@ -300,7 +314,12 @@ if __name__ == "__main__":
              logging.error(f"Supabase connection test failed: {conn_e}")
              exit(1)
 
-        process_directory(args.directory, supabase)
+        index = None if args.no_index else ArticleIndex(args.index)
+        resolver = PmidResolver(args.pmid_cache, offline=True)
+        process_directory(args.directory, supabase, index=index, resolver=resolver)
+        resolver.close()
+        if index is not None:
+            index.close()
     except Exception as e:
         logging.error(f"Failed to connect to Supabase or critical error: {e}")
         exit(1)
@@ -4,13 +4,30 @@ import json
 import logging
 import time
 import re
-# --- MODIFIED: Use datetime from datetime for consistency ---
-from datetime import datetime, timezone, date # Added 'date'
+import random
+from datetime import date
 from dotenv import load_dotenv
 import google.generativeai as genai
-from dateutil.parser import parse as dateutil_parse
-from google.api_core.exceptions import GoogleAPIError
+from google.api_core.exceptions import (GoogleAPIError, TooManyRequests, InvalidArgument, FailedPrecondition,
+                                         PermissionDenied, Unauthenticated, NotFound)
 import hashlib
+import contextlib
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from article_index import ArticleIndex, DEFAULT_INDEX_PATH
+from jsonl_stream import FOLLOW_IDLE_TIMEOUT_SECONDS
+from article_source import ArticleSource
+from known_links import KnownArticleFilter, DEFAULT_LINK_CHECK_CHUNK_SIZE, DEFAULT_LINK_CHECK_MAX_WAIT_SECONDS
+from pubmed_resolver import PmidResolver, DEFAULT_PMID_CACHE_PATH
+from rate_limit import TokenBucket, AimdLimiter
+from request_batcher import RequestBatcher, DEFAULT_MAX_WAIT_SECONDS
+from model_tiers import TierStats, ACCEPTED, parse_model_tiers
+from prompt_prefix import PrefixedModel, PREFIX_MODES, DEFAULT_PREFIX_MODE
+from publication_dates import normalize_publication_date
+from summary_bundle import SummaryBundle, SUMMARY_FORMATS, bundle_path
+from summary_cache import SummaryCache, DEFAULT_SUMMARY_CACHE_PATH, DEFAULT_MAX_CACHE_MB, cache_key
 
 # --- Configuration ---
 # --- MODIFIED: Changed base output directory name ---
@@ -18,9 +35,61 @@ OUTPUT_DIR = "summaries"  # Base directory to save date-specific summary folders
 # --- MODIFIED: Add timestamp format for consistency ---
 TIMESTAMP_FORMAT = '%Y%m%d' # YYYYMMDD format
 MODEL_NAME = "gemini-2.0-flash" # Or "gemini-1.0-pro" if JSON mode is desired and available
-API_RETRY_DELAY = 5
+# Models tried in turn for each article (--models), cheapest first: the next one is only asked when the
+# answer is not valid JSON, lacks keys or is truncated. MODEL_NAME also serves batch requests.
+DEFAULT_SUMMARY_MODELS = "gemini-2.0-flash-lite,gemini-2.0-flash"
+API_RETRY_DELAY = 5 # Base of the exponential backoff between retries (seconds)
+API_MAX_RETRY_DELAY = 60 # Backoff cap, unless the server asks for a longer delay
 API_MAX_RETRIES = 3
+# API errors that fail the same way on retry. Other 4xx (408 timeout, 499 cancelled...) go through backoff.
+PERMANENT_API_ERRORS = (InvalidArgument, FailedPrecondition, PermissionDenied, Unauthenticated, NotFound)
+# Exceptions raised by the SDK for blocked prompts/answers: retrying cannot help
+PERMANENT_ERROR_NAMES = ("BlockedPromptException", "StopCandidateException")
+# safe_api_call(reject_truncated=True) result for an answer cut by the output token limit
+TRUNCATED_RESPONSE = "ERROR: Truncated (MAX_TOKENS)"
 DEFAULT_GRADE = "A"
+# Part of the summary cache key: bump it whenever the prompt of generate_summary_json_with_translation
+# (or of build_batch_prompt, whose answers are cached under the same keys) changes
+SUMMARY_PROMPT_VERSION = 2
+# Static part of the single-article summary prompt (the title and abstract follow it). Sent once per run
+# as a cached prefix or system instruction (see prompt_prefix), or prepended to each prompt (--prompt-prefix inline).
+SUMMARY_INSTRUCTIONS = """
+    Rôle: Tu es un expert en rédaction médicale bilingue (anglais/français).
+
+    Tâche:
+    1. Traduis le TITRE ANGLAIS fourni ci-dessous en français.
+    2. Lis l'ABSTRACT MÉDICAL suivant (en anglais). Extrais les informations clés (contexte, méthodologie, résultats, impact clinique) et formule-les en français.
+    3. Retourne TOUTES ces informations (titre traduit ET composants de l'abstract) sous forme d'un objet JSON **valide**.
+
+    Format JSON Requis (utilise exactement ces clés):
+    {
+      "titre_traduit": "La traduction française concise et informative du titre anglais fourni.",
+      "contexte": "Brève description du contexte et de la problématique abordée (en français, basée sur l'abstract).",
+      "methodologie": "Description succincte de la méthodologie utilisée (étude, population, intervention, etc. en français, basée sur l'abstract).",
+      "resultats": "Principaux résultats quantitatifs ou qualitatifs rapportés (en français, basée sur l'abstract).",
+      "impact_clinique": "Synthèse de l'impact ou de la pertinence clinique des résultats (en français, basée sur l'abstract)."
+    }
+
+    Instructions:
+    1.  **Sortie JSON Uniquement:** Ta réponse doit être UNIQUEMENT un objet JSON valide, sans texte explicatif avant ou après. Ne pas utiliser de blocs de code markdown (```json ... ```).
+    2.  **Langue du Contenu:** Toutes les valeurs textuelles dans le JSON doivent être en **français**.
+    3.  **Contenu Abstract:** Base-toi EXCLUSIVEMENT sur l'abstract fourni pour les champs `contexte`, `methodologie`, `resultats`, `impact_clinique`. N'ajoute aucune information externe. Sois concis et factuel.
+    4.  **Contenu Titre:** Base-toi EXCLUSIVEMENT sur le titre anglais fourni pour le champ `titre_traduit`.
+    5.  **Champs Abstract:** Si une information (contexte, etc.) n'est absolument pas présente dans l'abstract, utilise la valeur "Non précisé dans l'abstract".
+    6.  **Abréviations:** Évite les abréviations non communes dans les valeurs JSON, ou explique-les lors de la première utilisation (ex: "accident vasculaire cérébral (AVC)").
+
+    """
+SUMMARY_KEYS = ("titre_traduit", "contexte", "methodologie", "resultats", "impact_clinique")
+# Articles per Gemini request in batch mode (--batch-size); 1 sends one request per article
+DEFAULT_BATCH_SIZE = 1
+# Output token budget of a batch request: max_output_tokens per article, capped by the model's output limit
+BATCH_MAX_OUTPUT_TOKENS = 8192
+# Articles summarized in parallel; every Gemini request (retries included) goes through the rate limiter
+DEFAULT_CONCURRENCY = 4
+# The concurrency limit adapts (AIMD) between 1 and --max-concurrency (default: twice --concurrency)
+MAX_CONCURRENCY_FACTOR = 2
+# Requests-per-minute quota of the API key (free tier of gemini-2.0-flash: 15). Set GEMINI_RPM in .env for a paid tier.
+DEFAULT_REQUESTS_PER_MINUTE = 15
 
 # Configure logging
 logging.basicConfig(
@@ -31,6 +100,10 @@ logger = logging.getLogger(__name__)
 # Load environment variables
 load_dotenv()
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
+# Optional here: only used to skip articles already in the database before summarizing them
+SUPABASE_URL = os.getenv("SUPABASE_URL")
+SUPABASE_KEY = os.getenv("SUPABASE_KEY")
+GEMINI_RPM = float(os.getenv("GEMINI_RPM") or DEFAULT_REQUESTS_PER_MINUTE)
 
 # --- Google AI Setup ---
 if not GOOGLE_API_KEY:
@@ -39,11 +112,12 @@ if not GOOGLE_API_KEY:
 
 genai.configure(api_key=GOOGLE_API_KEY)
 
-generation_config = genai.GenerationConfig(
+GENERATION_SETTINGS = dict(
     # response_mime_type="application/json", # Keep commented unless using Pro with native JSON support
     temperature=0.3,
     max_output_tokens=2000, # Adjust if needed, 2000 is reasonable for summaries
 )
+generation_config = genai.GenerationConfig(**GENERATION_SETTINGS)
 
 try:
     model = genai.GenerativeModel(
@@ -55,16 +129,85 @@ except Exception as e:
     logger.error(f"Failed to initialize Google AI Model: {e}")
     exit(1)
 
+# Shared by all worker threads; main() sets the rate from --rpm
+rate_limiter = TokenBucket(GEMINI_RPM)
+# Adaptive limit on concurrent Gemini calls, shared by all worker threads; main() sizes it from --concurrency
+api_limiter = AimdLimiter(DEFAULT_CONCURRENCY, maximum=DEFAULT_CONCURRENCY * MAX_CONCURRENCY_FACTOR)
+# Validated responses, opened in main() unless --no-cache
+summary_cache = None
+# One model per tier (--models, cheapest first), each holding SUMMARY_INSTRUCTIONS as a static prefix
+# (--prompt-prefix), set in main()
+summary_models = []
+# Per-tier outcomes of the summary requests, set in main()
+tier_stats = None
+# Groups the summary requests of the workers in batch mode (--batch-size > 1), set in main()
+summary_batcher = None
+# Append-only summaries.jsonl of the output directory, opened in main() unless --summary-format files
+summary_bundle = None
+# Links already in the Supabase 'articles' table, looked up in chunks as the input is read (unless --no-db-check)
+known_articles = None
+
 # --- Helper Functions (No changes needed in these helpers) ---
 
-def safe_api_call(prompt, max_retries=API_MAX_RETRIES, delay=API_RETRY_DELAY):
-    """Makes an API call with retry logic, expects text response."""
+def is_throttling_error(error):
+    """HTTP 429 / ResourceExhausted: the quota is exhausted for now."""
+    return isinstance(error, TooManyRequests) # ResourceExhausted is a subclass
+
+
+def is_permanent_api_error(error):
+    """Errors that fail again on retry: invalid argument, failed precondition, auth, not found, blocked content."""
+    return isinstance(error, PERMANENT_API_ERRORS) or type(error).__name__ in PERMANENT_ERROR_NAMES
+
+
+def retry_after_seconds(error):
+    """
+    The retry delay the server asked for, if any: RetryInfo in the error details (gRPC),
+    a Retry-After header (REST), or the delay quoted in the message. None otherwise.
+    """
+    for detail in getattr(error, "details", None) or []:
+        retry_delay = getattr(detail, "retry_delay", None)
+        if retry_delay is not None and hasattr(retry_delay, "seconds"):
+            return retry_delay.seconds + getattr(retry_delay, "nanos", 0) / 1e9
+    response = getattr(error, "response", None)
+    header = getattr(response, "headers", {}).get("Retry-After") if response is not None else None
+    if header:
+        try:
+            return float(header)
+        except ValueError:
+            pass # HTTP-date form: fall back to the message / our own backoff
+    match = re.search(r"retry_delay\s*\{\s*seconds:\s*(\d+)|retry in ([\d.]+)\s*s", str(error), re.IGNORECASE)
+    if match:
+        return float(match.group(1) or match.group(2))
+    return None
+
+
+def backoff_delay(attempt, base=API_RETRY_DELAY, server_delay=None):
+    """Exponential backoff with jitter (half fixed, half random), never shorter than the server's retry delay."""
+    ceiling = min(API_MAX_RETRY_DELAY, base * 2 ** (attempt - 1))
+    delay = ceiling / 2 + random.uniform(0, ceiling / 2)
+    if server_delay is not None:
+        delay = max(delay, server_delay + random.uniform(0, 1))
+    return delay
+
+
+def safe_api_call(prompt, max_retries=API_MAX_RETRIES, delay=API_RETRY_DELAY, generation_config=None, target_model=None,
+                  reject_truncated=False):
+    """
+    Makes an API call with retry logic, expects text response. generation_config overrides the model's;
+    target_model (e.g. a PrefixedModel) replaces the default model. With reject_truncated, an answer
+    cut by the output token limit returns TRUNCATED_RESPONSE instead of its partial text.
+    Calls go through the adaptive concurrency limit (api_limiter) and the requests-per-minute quota
+    (rate_limiter). Throttling errors shrink the limit and honour the server's retry delay;
+    permanent errors (invalid request, blocked content) are not retried.
+    """
     retries = 0
     while retries < max_retries:
         try:
-            time.sleep(1) # Small delay before each call
-            logger.debug(f"Sending API request (attempt {retries + 1}/{max_retries})...")
-            response = model.generate_content(prompt)
+            with api_limiter.slot(): # Waits while too many calls are in flight, or the API asked us to pause
+                rate_limiter.acquire() # Waits for a free slot of the requests-per-minute quota
+                logger.debug(f"Sending API request (attempt {retries + 1}/{max_retries})...")
+                response = (target_model or model).generate_content(prompt, generation_config=generation_config)
+            api_limiter.on_success()
 
             # Check for blocking reasons first
             if response.prompt_feedback and response.prompt_feedback.block_reason:
@@ -91,6 +234,9 @@ def safe_api_call(prompt, max_retries=API_MAX_RETRIES, delay=API_RETRY_DELAY):
                 # Convert finish_reason enum to string if necessary
                 finish_reason_str = finish_reason.name if hasattr(finish_reason, 'name') else str(finish_reason)
 
+                if reject_truncated and finish_reason_str == "MAX_TOKENS":
+                    logger.warning("API response truncated (MAX_TOKENS).")
+                    return TRUNCATED_RESPONSE
                 if finish_reason_str not in ["STOP", "MAX_TOKENS"]:
                     logger.warning(f"API response finished unexpectedly. Reason: {finish_reason_str}.")
                     # Consider SAFETY/RECITATION/OTHER as definite errors
@@ -143,133 +289,76 @@ def safe_api_call(prompt, max_retries=API_MAX_RETRIES, delay=API_RETRY_DELAY):
         except (GoogleAPIError, Exception) as e:
             retries += 1
             error_type = type(e).__name__
-            logger.warning(f"API call failed (Attempt {retries}/{max_retries}): {error_type} - {e}")
+            if is_permanent_api_error(e):
+                logger.error(f"API call failed with a permanent error: {error_type} - {e}. Not retrying.")
+                return f"ERROR: Permanent API Error ({error_type})"
+            server_delay = retry_after_seconds(e)
+            if is_throttling_error(e):
+                api_limiter.on_throttle(server_delay)
+                logger.warning(f"API call throttled (Attempt {retries}/{max_retries}): {error_type}. "
+                               f"Concurrency limit now {api_limiter.limit}" + (f", server asks to retry in {server_delay:.1f}s." if server_delay else "."))
+            else:
+                logger.warning(f"API call failed (Attempt {retries}/{max_retries}): {error_type} - {e}")
             if retries >= max_retries:
                 logger.error("Max retries reached. Skipping API call.")
                 return f"ERROR: Max Retries Reached ({error_type})"
-            logger.info(f"Retrying in {delay} seconds...")
-            time.sleep(delay)
+            wait = backoff_delay(retries, base=delay, server_delay=server_delay)
+            logger.info(f"Retrying in {wait:.1f} seconds...")
+            time.sleep(wait)
     return "ERROR: Max Retries Reached (Loop Exit)"
 
 
-def load_articles_from_json(filepath):
-    """Loads article data from a source JSON file."""
-    try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        if not isinstance(data, list):
-            logger.error(f"Source JSON file {filepath} does not contain a list.")
-            return None
-        logger.info(f"Successfully loaded {len(data)} articles from {filepath}")
-        return data
-    except FileNotFoundError:
-        logger.error(f"Source JSON file not found: {filepath}")
-        return None
-    except json.JSONDecodeError as e:
-        logger.error(f"Error decoding source JSON file {filepath}: {e}")
-        return None
-    except Exception as e:
-        logger.error(f"An unexpected error occurred loading {filepath}: {e}")
-        return None
-
-def format_publication_date_iso(date_str):
-    """Attempts to parse date and format as ISO 8601 (YYYY-MM-DDTHH:MM:SZ). Returns None if invalid."""
-    if not date_str:
-        return None
-    try:
-        # Handle potential MM/DD/YYYY format specifically before general parsing
-        if re.match(r'\d{1,2}/\d{1,2}/\d{4}', date_str):
-             dt = datetime.strptime(date_str, '%m/%d/%Y')
-        else:
-            dt = dateutil_parse(date_str)
-
-        # Ensure UTC timezone if none is present
-        if dt.tzinfo is None:
-             dt = dt.replace(tzinfo=timezone.utc)
-
-        # Format to ISO 8601 with timezone offset Z for UTC
-        return dt.strftime('%Y-%m-%dT%H:%M:%SZ')
-
-    except (ValueError, TypeError, OverflowError) as e:
-        logger.warning(f"Could not parse date '{date_str}' to ISO 8601: {e}. Trying YYYY-MM-DD extraction.")
-        # Regex to find YYYY-MM-DD pattern
-        match = re.search(r"(\d{4}-\d{2}-\d{2})", str(date_str))
-        if match:
-             try:
-                 # Convert extracted date to datetime and format as ISO with T00:00:00Z
-                 dt_date_only = datetime.strptime(match.group(0), "%Y-%m-%d")
-                 dt_utc = dt_date_only.replace(tzinfo=timezone.utc)
-                 return dt_utc.strftime('%Y-%m-%dT00:00:00Z') # Use explicit format for consistency
-             except Exception as inner_e:
-                 logger.warning(f"Could not create ISO string from extracted date {match.group(0)}: {inner_e}")
-                 return None # Fail if extraction doesn't lead to valid ISO
-        logger.error(f"Completely unable to parse date: '{date_str}' for ISO format. Returning None.")
+def load_articles_from_json(filepath, follow=False, idle_timeout=FOLLOW_IDLE_TIMEOUT_SECONDS, start_index=0, start_offset=0):
+    """
+    Opens the article data of a source JSON file (a list of articles) or JSONL file (one
+    article per line, as streamed by the scraper) as a stream (see ArticleSource): records
+    are read one by one as processing goes. With follow=True a JSONL file is tailed until
+    the scraper closes it. start_index / start_offset resume an interrupted run.
+    Returns None if the file does not exist.
+    """
+    if not follow and not os.path.exists(filepath):
+        logger.error(f"Source file not found: {filepath}")
         return None
-    except Exception as e:
-         logger.error(f"Unexpected error parsing date '{date_str}' for ISO: {e}. Returning None.")
-         return None
-
-
-def format_publication_date_for_ref(date_str):
-    """Attempts to parse date into 'YYYY-MM-DD' or returns 'Inconnue'. For reference line."""
-    if not date_str:
-        return "Inconnue"
-    try:
-        # Use the ISO formatter first, then extract the date part
-        iso_date = format_publication_date_iso(date_str)
-        if iso_date:
-            return iso_date[:10] # Extract YYYY-MM-DD part
-        else:
-             # Fallback: try MM/DD/YYYY specifically
-             if re.match(r'\d{1,2}/\d{1,2}/\d{4}', date_str):
-                 dt = datetime.strptime(date_str, '%m/%d/%Y')
-                 return dt.strftime("%Y-%m-%d")
-             # Fallback: try general parsing if ISO failed
-             dt = dateutil_parse(date_str)
-             return dt.strftime("%Y-%m-%d")
-    except (ValueError, TypeError, OverflowError, AttributeError) as e: # Added AttributeError
-        logger.warning(f"Could not parse date '{date_str}' for reference line: {e}. Trying regex.")
-        match = re.search(r"(\d{4}-\d{2}-\d{2})", str(date_str))
-        if match:
-            return match.group(0)
-        logger.warning(f"Could not format date '{date_str}' for reference. Returning 'Inconnue'.")
-        return "Inconnue"
-    except Exception as e:
-        logger.warning(f"Unexpected error parsing date '{date_str}' for reference: {e}. Returning 'Inconnue'.")
-        return "Inconnue"
-
-
-def generate_summary_json_with_translation(original_title, original_abstract):
+    if start_offset:
+        logger.info(f"Resuming {filepath} from byte offset {start_offset}")
+    if start_index:
+        logger.info(f"Resuming {filepath} from record index {start_index}")
+    logger.info(f"Reading articles from {filepath}{' (following)' if follow else ''}")
+    return ArticleSource(filepath, start_index=start_index, start_offset=start_offset, follow=follow, idle_timeout=idle_timeout)
+
+def generate_summary_json_with_translation(original_title, original_abstract, article_id=None):
     """
     Generates structured summary components (JSON) from the English abstract
     AND translates the provided English title.
+    The models of summary_models are tried cheapest first; the next one is only asked
+    when an answer fails validation or is truncated (see summary_from_model).
+    Validated responses are cached (see summary_cache): the same title and abstract
+    with the same model, settings and prompt version never cost a second API call.
+    In batch mode (summary_batcher set), the article is first sent with others in one
+    request; if its entry is missing or invalid there, it is asked again on its own.
     """
-    prompt = f"""
-    Rôle: Tu es un expert en rédaction médicale bilingue (anglais/français).
-
-    Tâche:
-    1. Traduis le TITRE ANGLAIS fourni ci-dessous en français.
-    2. Lis l'ABSTRACT MÉDICAL suivant (en anglais). Extrais les informations clés (contexte, méthodologie, résultats, impact clinique) et formule-les en français.
-    3. Retourne TOUTES ces informations (titre traduit ET composants de l'abstract) sous forme d'un objet JSON **valide**.
-
-    Format JSON Requis (utilise exactement ces clés):
-    {{
-      "titre_traduit": "La traduction française concise et informative du titre anglais fourni.",
-      "contexte": "Brève description du contexte et de la problématique abordée (en français, basée sur l'abstract).",
-      "methodologie": "Description succincte de la méthodologie utilisée (étude, population, intervention, etc. en français, basée sur l'abstract).",
-      "resultats": "Principaux résultats quantitatifs ou qualitatifs rapportés (en français, basée sur l'abstract).",
-      "impact_clinique": "Synthèse de l'impact ou de la pertinence clinique des résultats (en français, basée sur l'abstract)."
-    }}
-
-    Instructions:
-    1.  **Sortie JSON Uniquement:** Ta réponse doit être UNIQUEMENT un objet JSON valide, sans texte explicatif avant ou après. Ne pas utiliser de blocs de code markdown (```json ... ```).
-    2.  **Langue du Contenu:** Toutes les valeurs textuelles dans le JSON doivent être en **français**.
-    3.  **Contenu Abstract:** Base-toi EXCLUSIVEMENT sur l'abstract fourni pour les champs `contexte`, `methodologie`, `resultats`, `impact_clinique`. N'ajoute aucune information externe. Sois concis et factuel.
-    4.  **Contenu Titre:** Base-toi EXCLUSIVEMENT sur le titre anglais fourni pour le champ `titre_traduit`.
-    5.  **Champs Abstract:** Si une information (contexte, etc.) n'est absolument pas présente dans l'abstract, utilise la valeur "Non précisé dans l'abstract".
-    6.  **Abréviations:** Évite les abréviations non communes dans les valeurs JSON, ou explique-les lors de la première utilisation (ex: "accident vasculaire cérébral (AVC)").
-
-    TITRE ANGLAIS Fourni:
+    if summary_cache is not None:
+        # An answer accepted from any tier (or from a batch request, made with MODEL_NAME) will do
+        model_names = dict.fromkeys([model.model_name for model in summary_models] + [MODEL_NAME])
+        cached = summary_cache.get_any([cache_key(model_name, GENERATION_SETTINGS, SUMMARY_PROMPT_VERSION, original_title, original_abstract)
+                                        for model_name in model_names])
+        if cached is not None:
+            logger.info("  Summary/translation taken from the cache (no API call).")
+            return cached
+
+    if summary_batcher is not None and article_id is not None:
+        try:
+            summary_data = summary_batcher.submit((article_id, original_title, original_abstract)).result()
+        except Exception:
+            summary_data = None # Already logged by the batcher
+        if summary_data is not None:
+            logger.info("  Summary/translation received in a batch request.")
+            if summary_cache is not None:
+                summary_cache.put(cache_key(MODEL_NAME, GENERATION_SETTINGS, SUMMARY_PROMPT_VERSION, original_title, original_abstract), summary_data)
+            return summary_data
+        logger.warning(f"  Article {article_id} missing or invalid in the batch response. Retrying it on its own.")
+
+    prompt = f"""TITRE ANGLAIS Fourni:
     {original_title}
 
     Abstract original (en anglais):
@@ -277,32 +366,163 @@ def generate_summary_json_with_translation(original_title, original_abstract):
 
     Réponse JSON attendue (uniquement le JSON):
     """
+    # Cheap-first: each tier's answer is validated, and only a rejected one goes to the next (stronger) model
+    tiers = summary_models or [None] # None: the default model, instructions inline in the prompt
+    summary_data = None
+    for position, tier_model in enumerate(tiers):
+        tier_name = tier_model.model_name if tier_model is not None else MODEL_NAME
+        final = position == len(tiers) - 1
+        call_start = time.time()
+        summary_data, problem = summary_from_model(prompt, tier_model, final)
+        if tier_stats is not None:
+            tier_stats.record(tier_name, problem or ACCEPTED, time.time() - call_start)
+        if problem is None:
+            if summary_cache is not None:
+                # Only complete responses are cached; incomplete ones are asked again next time
+                summary_cache.put(cache_key(tier_name, GENERATION_SETTINGS, SUMMARY_PROMPT_VERSION, original_title, original_abstract), summary_data)
+            if len(tiers) > 1:
+                logger.info(f"  Summary/translation accepted from {tier_name}.")
+            return summary_data
+        if not final:
+            logger.warning(f"  {tier_name} answer not accepted ({problem}). Escalating to {tiers[position + 1].model_name}.")
+    return summary_data
+
+def summary_from_model(prompt, tier_model=None, final=True):
+    """
+    Asks one model for the summary of the prompt's article. Returns (summary_data, problem):
+    problem is None for a complete answer, else one of model_tiers.ESCALATION_REASONS.
+    A truncated answer (MAX_TOKENS) is only rejected before the final tier; on the final
+    tier, missing keys are filled with an error message, as the data is kept anyway.
+    """
+    log_level = logging.ERROR if final else logging.WARNING
     logger.debug("Sending JSON generation request (with title translation) to API.")
-    json_string = safe_api_call(prompt)
+    if tier_model is not None:
+        json_string = safe_api_call(prompt, target_model=tier_model, reject_truncated=not final)
+    else:
+        json_string = safe_api_call(SUMMARY_INSTRUCTIONS + prompt, reject_truncated=not final)
 
+    if json_string == TRUNCATED_RESPONSE:
+        return None, "truncated"
     if not json_string or json_string.startswith("ERROR:"):
-        logger.error(f"Failed to get valid response from API for title/abstract. Response: {json_string}")
-        return None
+        logger.log(log_level, f"Failed to get valid response from API for title/abstract. Response: {json_string}")
+        return None, "api_error"
 
     try:
         summary_data = json.loads(json_string)
-        required_keys = {"titre_traduit", "contexte", "methodologie", "resultats", "impact_clinique"}
+        required_keys = set(SUMMARY_KEYS)
         missing_keys = required_keys - summary_data.keys()
         if missing_keys:
-            logger.error(f"API response is valid JSON but missing required keys: {missing_keys}. Found: {list(summary_data.keys())}")
-            for key in missing_keys:
-                summary_data[key] = f"Erreur: Clé '{key}' manquante dans la réponse de l'IA"
+            logger.log(log_level, f"API response is valid JSON but missing required keys: {missing_keys}. Found: {list(summary_data.keys())}")
+            if not final:
+                return None, "missing_keys"
+            for missing_key in missing_keys:
+                summary_data[missing_key] = f"Erreur: Clé '{missing_key}' manquante dans la réponse de l'IA"
             # Decide whether to return partially filled data or None
             # return None # Option: fail strictly if keys are missing
+            return summary_data, "missing_keys"
         logger.debug("JSON parsing and basic validation successful.")
-        return summary_data
+        return summary_data, None
     except json.JSONDecodeError as e:
-        logger.error(f"Failed to decode JSON response from API: {e}")
-        logger.error(f"Invalid JSON string received:\n{'-'*20}\n{json_string}\n{'-'*20}")
-        return None
+        logger.log(log_level, f"Failed to decode JSON response from API: {e}")
+        logger.log(log_level, f"Invalid JSON string received:\n{'-'*20}\n{json_string}\n{'-'*20}")
+        return None, "invalid_json"
     except Exception as e:
-        logger.error(f"Unexpected error processing API JSON response: {e}")
-        return None
+        logger.log(log_level, f"Unexpected error processing API JSON response: {e}")
+        return None, "invalid_json"
+
+# --- Batch Mode ---
+
+def build_batch_prompt(articles):
+    """Prompt asking for the summary of several articles, given as (article_id, title, abstract) tuples."""
+    articles_json = json.dumps(
+        [{"id": article_id, "titre_anglais": title, "abstract": abstract} for article_id, title, abstract in articles],
+        ensure_ascii=False, indent=1,
+    )
+    return f"""
+    Rôle: Tu es un expert en rédaction médicale bilingue (anglais/français).
+
+    Tâche: Pour CHACUN des {len(articles)} articles fournis ci-dessous (liste JSON, chaque article a un "id", un "titre_anglais" et un "abstract" en anglais):
+    1. Traduis le titre anglais en français.
+    2. Extrais de l'abstract les informations clés (contexte, méthodologie, résultats, impact clinique) et formule-les en français.
+
+    Format JSON Requis: un tableau JSON **valide** contenant un objet par article, dans le même ordre, avec exactement ces clés:
+    [
+      {{
+        "id": "L'id de l'article, recopié à l'identique.",
+        "titre_traduit": "La traduction française concise et informative du titre anglais de l'article.",
+        "contexte": "Brève description du contexte et de la problématique abordée (en français, basée sur l'abstract).",
+        "methodologie": "Description succincte de la méthodologie utilisée (étude, population, intervention, etc. en français, basée sur l'abstract).",
+        "resultats": "Principaux résultats quantitatifs ou qualitatifs rapportés (en français, basée sur l'abstract).",
+        "impact_clinique": "Synthèse de l'impact ou de la pertinence clinique des résultats (en français, basée sur l'abstract)."
+      }}
+    ]
+
+    Instructions:
+    1.  **Sortie JSON Uniquement:** Ta réponse doit être UNIQUEMENT le tableau JSON, sans texte explicatif avant ou après. Ne pas utiliser de blocs de code markdown (```json ... ```).
+    2.  **Un Objet par Article:** N'omets aucun article et ne mélange jamais les informations de deux articles.
+    3.  **Langue du Contenu:** Toutes les valeurs textuelles (sauf "id") doivent être en **français**.
+    4.  **Contenu:** Base-toi EXCLUSIVEMENT sur le titre et l'abstract de chaque article. N'ajoute aucune information externe. Sois concis et factuel.
+    5.  **Champs Abstract:** Si une information (contexte, etc.) n'est absolument pas présente dans l'abstract, utilise la valeur "Non précisé dans l'abstract".
+    6.  **Abréviations:** Évite les abréviations non communes dans les valeurs JSON, ou explique-les lors de la première utilisation (ex: "accident vasculaire cérébral (AVC)").
+
+    Articles fournis:
+    {articles_json}
+
+    Réponse JSON attendue (uniquement le tableau JSON):
+    """
+
+
+def parse_batch_response(json_string, article_ids):
+    """
+    Returns the summary of each article ID from a batch response, in the same order: a
+    dict with the SUMMARY_KEYS, or None when the article's entry is missing or incomplete.
+    Accepts a list of objects with an "id", or an object keyed by ID.
+    """
+    try:
+        data = json.loads(json_string)
+    except json.JSONDecodeError as e:
+        logger.error(f"Failed to decode JSON batch response from API: {e}")
+        return [None] * len(article_ids)
+
+    if isinstance(data, dict):
+        entries = {str(entry_id): entry for entry_id, entry in data.items()}
+    elif isinstance(data, list):
+        entries = {str(entry.get("id")): entry for entry in data if isinstance(entry, dict)}
+    else:
+        entries = {}
+
+    results = []
+    for article_id in article_ids:
+        entry = entries.get(str(article_id))
+        if isinstance(entry, dict) and all(isinstance(entry.get(k), str) and entry[k].strip() for k in SUMMARY_KEYS):
+            results.append({k: entry[k] for k in SUMMARY_KEYS})
+        else:
+            results.append(None)
+    return results
+
+
+def generate_summaries_batch(articles):
+    """
+    RequestBatcher handler: summarizes several (article_id, title, abstract) tuples in one
+    API request. Returns one summary dict (or None) per article.
+    """
+    article_ids = [article_id for article_id, _, _ in articles]
+    batch_config = genai.GenerationConfig(**dict(
+        GENERATION_SETTINGS,
+        max_output_tokens=min(BATCH_MAX_OUTPUT_TOKENS, GENERATION_SETTINGS["max_output_tokens"] * len(articles)),
+    ))
+    logger.info(f"Sending batch request for {len(articles)} articles: {', '.join(article_ids)}")
+    json_string = safe_api_call(build_batch_prompt(articles), generation_config=batch_config)
+    if not json_string or json_string.startswith("ERROR:"):
+        logger.error(f"Failed to get valid batch response from API. Response: {json_string}")
+        return [None] * len(articles)
+
+    results = parse_batch_response(json_string, article_ids)
+    invalid = [article_id for article_id, result in zip(article_ids, results) if result is None]
+    if invalid:
+        logger.warning(f"Batch response missing or invalid for {len(invalid)}/{len(articles)} articles: {', '.join(invalid)}")
+    return results
+
 
 def extract_fallback_article_id(url_or_link):
     """
@@ -316,7 +536,7 @@ def extract_fallback_article_id(url_or_link):
         return fallback_id
 
     # Try to extract PubMed ID (PMID) specifically (from link mostly)
-    match_pubmed = re.search(r'pubmed/(\d+)', url_or_link, re.IGNORECASE)
+    match_pubmed = re.search(r'pubmed(?:\.ncbi\.nlm\.nih\.gov)?/(\d+)', url_or_link, re.IGNORECASE)
     if match_pubmed:
         logger.debug(f"Extracted fallback PMID: {match_pubmed.group(1)} from {url_or_link}")
         return match_pubmed.group(1)
@@ -357,14 +577,11 @@ def extract_fallback_article_id(url_or_link):
     return f"url_{url_hash}"
 
 
-# --- MODIFIED: process_article now takes date_specific_output_dir ---
-def process_article(article_data, date_specific_output_dir):
+def resolve_article_id(article_data):
     """
-    Processes a single article: gets title, generates summary/translation,
-    formats content, includes categories, and saves as an individual JSON file
-    within the provided date-specific directory.
-    Filename is based on numeric ID from 'url' if possible, otherwise falls back.
-    Returns True on success, False on failure/skip.
+    Returns (article_id, id source description) of an article: the numeric ID at the end
+    of its 'url' if possible, otherwise an ID derived from its PubMed link (see
+    extract_fallback_article_id). The ID is also the summary's file name.
     """
     article_url = article_data.get("url")
     pubmed_link = article_data.get("link")
@@ -391,6 +608,25 @@ def process_article(article_data, date_specific_output_dir):
             article_id = f"missing_id_{hashlib.md5(str(time.time()).encode()).hexdigest()[:10]}"
             id_source_log = "Time-based hash (no URL/link)"
             logger.warning("Both 'link' and 'url' missing in input data. Generating time-based ID.")
+    return article_id, id_source_log
+
+
+# --- MODIFIED: process_article now takes date_specific_output_dir ---
+def process_article(article_data, date_specific_output_dir, index=None, article_id=None, id_source_log=None):
+    """
+    Processes a single article: gets title, generates summary/translation,
+    formats content, includes categories, and saves it in the summary bundle of the
+    provided date-specific directory (or as an individual JSON file without a bundle).
+    The ID (and filename) is based on numeric ID from 'url' if possible, otherwise falls back.
+    Articles the (optional) article index already marks as exported are skipped.
+    article_id (and id_source_log) may be given when already resolved (see resolve_article_id).
+    Returns True on success, False on failure/skip.
+    """
+    article_url = article_data.get("url")
+    pubmed_link = article_data.get("link")
+
+    if article_id is None:
+        article_id, id_source_log = resolve_article_id(article_data)
 
     logger.info(f"--- Processing Article ID: {article_id} (Source: {id_source_log}) ---")
 
@@ -399,11 +635,24 @@ def process_article(article_data, date_specific_output_dir):
     # --- MODIFIED: Use the passed-in date_specific_output_dir ---
     output_path = os.path.join(date_specific_output_dir, output_filename)
 
-    # Check for existing file
+    # Check for an existing summary (in-memory ID index of the bundle, else the file)
+    if summary_bundle is not None and article_id in summary_bundle:
+        logger.info(f"Article ID {article_id} is already in the summary bundle {summary_bundle.path}. Skipping.")
+        return False
     if os.path.exists(output_path):
         logger.info(f"Output file {output_path} already exists. Skipping article ID {article_id}.")
         return False
 
+    if index is not None and index.is_exported(url=article_url, link=pubmed_link):
+        logger.info(f"Article ID {article_id} is already exported according to the article index. Skipping.")
+        return False
+
+    if known_articles is not None and known_articles.is_known(article_data):
+        logger.info(f"Article ID {article_id} is already in the Supabase articles table. Skipping (no summary needed).")
+        if index is not None:
+            index.mark_exported(url=article_url, link=pubmed_link)
+        return False
+
     # --- Get Required Input Data ---
     original_title = article_data.get("title")
     original_abstract = article_data.get("abstract")
@@ -426,7 +675,7 @@ def process_article(article_data, date_specific_output_dir):
     logger.info(f"  Generating structured summary and translating title...")
 
     # --- Generate Summary and Translated Title ---
-    summary_components = generate_summary_json_with_translation(original_title, original_abstract)
+    summary_components = generate_summary_json_with_translation(original_title, original_abstract, article_id=article_id)
 
     if not summary_components:
         logger.error(f"Article {article_id}: Failed to generate structured summary/translation. Skipping.")
@@ -443,8 +692,7 @@ def process_article(article_data, date_specific_output_dir):
     impact_clinique = summary_components.get('impact_clinique', 'Non précisé dans l\'abstract')
 
     # --- Format Dates ---
-    published_at_iso = format_publication_date_iso(pub_date_raw)
-    pub_date_str_for_ref = format_publication_date_for_ref(pub_date_raw)
+    published_at_iso, pub_date_str_for_ref = normalize_publication_date(pub_date_raw)
 
     logger.info(f"  Translated Title: '{translated_title[:100]}...'")
     logger.info(f"  Publication date (ISO for DB): {published_at_iso}")
@@ -483,11 +731,19 @@ def process_article(article_data, date_specific_output_dir):
 
 
         # --- Save the Output JSON ---
-        # --- MODIFIED: Ensure directory exists (robustness, though should be created in main) ---
-        os.makedirs(date_specific_output_dir, exist_ok=True)
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(output_data, f, ensure_ascii=False, indent=2)
-        logger.info(f"  Summary saved: {output_path}")
+        if summary_bundle is not None:
+            if not summary_bundle.add(article_id, output_data):
+                logger.info(f"Article ID {article_id} was added to the summary bundle meanwhile. Skipping.")
+                return False
+            logger.info(f"  Summary saved: {summary_bundle.path}#{article_id}")
+        else:
+            # --- MODIFIED: Ensure directory exists (robustness, though should be created in main) ---
+            os.makedirs(date_specific_output_dir, exist_ok=True)
+            with open(output_path, "w", encoding="utf-8") as f:
+                json.dump(output_data, f, ensure_ascii=False, indent=2)
+            logger.info(f"  Summary saved: {output_path}")
+        if index is not None:
+            index.mark_summarized(article_url)
         return True
 
     except KeyError as e:
@@ -501,13 +757,148 @@ def process_article(article_data, date_specific_output_dir):
         return False
 
 
+# --- Concurrency ---
+
+class OrderedLogHandler(logging.Handler):
+    """
+    Replaces the root handlers while articles are processed concurrently. Records logged
+    by a thread that is collecting (see collect) are held back; replay() later sends them
+    to the original handlers, so each article's log lines come out together and in input
+    order. Other records go straight through.
+    """
+
+    def __init__(self, targets):
+        super().__init__()
+        self.targets = list(targets)
+        self._local = threading.local()
+
+    def emit(self, record):
+        records = getattr(self._local, "records", None)
+        if records is not None:
+            records.append(record)
+        else:
+            self._dispatch(record)
+
+    def _dispatch(self, record):
+        for target in self.targets:
+            if record.levelno >= target.level:
+                target.handle(record)
+
+    @contextlib.contextmanager
+    def collect(self, records):
+        """Context in which this thread's records are appended to `records` instead of emitted."""
+        self._local.records = records
+        try:
+            yield
+        finally:
+            self._local.records = None
+
+    def replay(self, records):
+        for record in records:
+            self._dispatch(record)
+
+    @classmethod
+    def install(cls):
+        root = logging.getLogger()
+        handler = cls(root.handlers)
+        for target in handler.targets:
+            root.removeHandler(target)
+        root.addHandler(handler)
+        return handler
+
+    def uninstall(self):
+        root = logging.getLogger()
+        root.removeHandler(self)
+        for target in self.targets:
+            root.addHandler(target)
+
+
+def summarize_articles(articles, date_specific_output_dir, index=None, concurrency=DEFAULT_CONCURRENCY, on_result=None):
+    """
+    Summarizes the articles (a list or a stream) with `concurrency` worker threads.
+    Results, log lines and on_result(position, article_data, success) calls follow the input
+    order. Each summary ID is claimed in input order, so when two entries share an ID the
+    first one always wins, as in a sequential run. At most 2 * concurrency articles are
+    read ahead of the oldest unfinished one.
+    """
+    log_handler = OrderedLogHandler.install()
+    claimed_ids = set()
+    pending = deque() # (position, article_data, records, future), input order
+    max_pending = 2 * concurrency
+
+    def run(article_data, records, article_id, id_source_log):
+        with log_handler.collect(records):
+            try:
+                return process_article(article_data, date_specific_output_dir, index=index,
+                                       article_id=article_id, id_source_log=id_source_log)
+            except Exception as e:
+                logger.error(f"CRITICAL UNEXPECTED ERROR for article (URL: {article_data.get('url', 'URL_MISSING')}, "
+                             f"Link: {article_data.get('link', 'LINK_MISSING')}): {e}", exc_info=True)
+                return False
+
+    def finish_oldest():
+        position, article_data, records, future = pending.popleft()
+        success = future.result()
+        log_handler.replay(records)
+        if on_result:
+            on_result(position, article_data, success)
+
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="summary") as executor:
+            for position, article_data in enumerate(articles):
+                records = []
+                with log_handler.collect(records):
+                    article_id, id_source_log = resolve_article_id(article_data)
+                    duplicate = article_id in claimed_ids
+                    if duplicate:
+                        logger.info(f"Article ID {article_id} already appears earlier in the input. Skipping.")
+                claimed_ids.add(article_id)
+                if duplicate:
+                    future = Future()
+                    future.set_result(False)
+                else:
+                    future = executor.submit(run, article_data, records, article_id, id_source_log)
+                pending.append((position, article_data, records, future))
+                # Emit finished articles at the head of the queue; block only when too far ahead
+                while pending and (len(pending) > max_pending or pending[0][3].done()):
+                    finish_oldest()
+            while pending:
+                finish_oldest()
+    finally:
+        log_handler.uninstall()
+
+
 # --- Main Execution ---
 def main():
     parser = argparse.ArgumentParser(
         description="Generates individual JSON summaries (incl. title translation and categories) for articles from a source JSON file using Google AI."
     )
     parser.add_argument(
-        "json_file", help="Path to the source JSON file containing article data (must include 'title', 'abstract', optionally 'categories', 'url', 'link')."
+        "json_file", help="Path to the source JSON or JSONL file containing article data (must include 'title', 'abstract', optionally 'categories', 'url', 'link')."
+    )
+    parser.add_argument(
+        "--follow",
+        action="store_true",
+        help="Tail a JSONL file while the scraper is still writing it (stops when the scraper closes it)",
+    )
+    parser.add_argument(
+        "--follow-timeout",
+        type=float,
+        default=FOLLOW_IDLE_TIMEOUT_SECONDS,
+        help=f"With --follow, stop after this many seconds without new articles (default: {FOLLOW_IDLE_TIMEOUT_SECONDS})",
+    )
+    resume = parser.add_mutually_exclusive_group()
+    resume.add_argument(
+        "--start-index",
+        type=int,
+        default=0,
+        help="Resume an interrupted run: skip the first N records of the input (see the 'Resume with' log lines)",
+    )
+    resume.add_argument(
+        "--start-offset",
+        type=int,
+        default=0,
+        help="Resume an interrupted run on a JSONL input: start reading at this byte offset",
     )
     parser.add_argument(
         "--output-dir",
@@ -515,7 +906,115 @@ def main():
         # --- MODIFIED: Updated help text ---
         help=f"Base directory to save date-specific summary folders (default: {OUTPUT_DIR})",
     )
+    parser.add_argument(
+        "--summary-format",
+        choices=SUMMARY_FORMATS,
+        default="bundle",
+        help="'bundle' appends all summaries to <output dir>/YYYYMMDD/summaries.jsonl; 'files' writes one <id>.json per article (default: bundle)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"Concurrent Gemini requests at start; the limit then adapts to throttling (default: {DEFAULT_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=None,
+        help=f"Upper bound of the adaptive concurrency limit (default: {MAX_CONCURRENCY_FACTOR} x --concurrency)",
+    )
+    parser.add_argument(
+        "--rpm",
+        type=float,
+        default=GEMINI_RPM,
+        help=f"Gemini requests-per-minute quota shared by all workers (default: GEMINI_RPM from .env, else {DEFAULT_REQUESTS_PER_MINUTE})",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help=f"Articles summarized per Gemini request; entries missing from a batch answer are retried one by one (default: {DEFAULT_BATCH_SIZE})",
+    )
+    parser.add_argument(
+        "--cache",
+        default=DEFAULT_SUMMARY_CACHE_PATH,
+        help=f"SQLite cache of validated Gemini responses (default: {DEFAULT_SUMMARY_CACHE_PATH})",
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=float,
+        default=DEFAULT_MAX_CACHE_MB,
+        help=f"Size limit of the response cache; least recently used responses are evicted beyond it (default: {DEFAULT_MAX_CACHE_MB})",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always call the API, and do not store responses",
+    )
+    parser.add_argument(
+        "--models",
+        default=DEFAULT_SUMMARY_MODELS,
+        help=f"Comma-separated Gemini models tried for each article, cheapest first; an answer that is not valid JSON, lacks keys or is truncated goes to the next one (default: {DEFAULT_SUMMARY_MODELS})",
+    )
+    parser.add_argument(
+        "--prompt-prefix",
+        choices=(DEFAULT_PREFIX_MODE,) + PREFIX_MODES,
+        default=DEFAULT_PREFIX_MODE,
+        help="How the static summary instructions reach Gemini: a cached context, the system instruction, or inline in every prompt; auto tries them in that order (default: auto)",
+    )
+    parser.add_argument(
+        "--index",
+        default=DEFAULT_INDEX_PATH,
+        help=f"SQLite index of already scraped/summarized/exported articles (default: {DEFAULT_INDEX_PATH})",
+    )
+    parser.add_argument(
+        "--no-index",
+        action="store_true",
+        help="Do not read or update the article index",
+    )
+    parser.add_argument(
+        "--no-db-check",
+        action="store_true",
+        help="Do not look up the input links in Supabase before summarizing (otherwise done when SUPABASE_URL/SUPABASE_KEY are set)",
+    )
+    parser.add_argument(
+        "--db-check-chunk-size",
+        type=int,
+        default=DEFAULT_LINK_CHECK_CHUNK_SIZE,
+        help=f"Input articles checked per Supabase query (default: {DEFAULT_LINK_CHECK_CHUNK_SIZE})",
+    )
+    parser.add_argument(
+        "--db-check-max-wait",
+        type=float,
+        default=DEFAULT_LINK_CHECK_MAX_WAIT_SECONDS,
+        help=f"With --follow, seconds a partial chunk waits for more scraped articles before it is checked anyway (default: {DEFAULT_LINK_CHECK_MAX_WAIT_SECONDS})",
+    )
+    parser.add_argument(
+        "--pmid-cache",
+        default=DEFAULT_PMID_CACHE_PATH,
+        help=f"DOI -> PMID cache used to also match the other form of PubMed links (default: {DEFAULT_PMID_CACHE_PATH})",
+    )
     args = parser.parse_args()
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    max_concurrency = args.max_concurrency or args.concurrency * MAX_CONCURRENCY_FACTOR
+    if max_concurrency < args.concurrency:
+        parser.error("--max-concurrency cannot be lower than --concurrency")
+    if args.rpm <= 0:
+        parser.error("--rpm must be positive")
+    if args.db_check_max_wait < 0:
+        parser.error("--db-check-max-wait cannot be negative")
+    if args.batch_size < 1:
+        parser.error("--batch-size must be at least 1")
+    model_names = parse_model_tiers(args.models)
+    if not model_names:
+        parser.error("--models needs at least one model name")
+    if args.start_index < 0 or args.start_offset < 0:
+        parser.error("--start-index and --start-offset cannot be negative")
+    if args.start_offset and not args.json_file.endswith(".jsonl"):
+        parser.error("--start-offset requires a .jsonl input file (use --start-index for a JSON array)")
+    rate_limiter.set_rate(args.rpm)
 
     # --- MODIFIED: Create date-specific output directory ---
     today_date_str = date.today().strftime(TIMESTAMP_FORMAT)
@@ -528,53 +1027,120 @@ def main():
         logger.error(f"Could not create output directory {date_specific_output_dir}: {e}")
         return
 
-    articles = load_articles_from_json(args.json_file)
-    if not articles:
+    if args.follow and not args.json_file.endswith(".jsonl"):
+        logger.error("--follow requires a .jsonl input file.")
         return
 
-    total_articles = len(articles)
-    logger.info(f"Starting processing for {total_articles} articles...")
+    articles = load_articles_from_json(args.json_file, follow=args.follow, idle_timeout=args.follow_timeout,
+                                       start_index=args.start_index, start_offset=args.start_offset)
+    if articles is None:
+        return
+
+    # The source is streamed: its length is only known once it has been read
+    logger.info("Starting streamed processing of articles...")
     logger.info(f"Input JSON: {args.json_file}")
     # --- MODIFIED: Log the specific output directory ---
     logger.info(f"Output JSON files will be saved to: {date_specific_output_dir}")
 
+    index = None if args.no_index else ArticleIndex(args.index)
+    global summary_cache, summary_batcher, summary_bundle, api_limiter, known_articles, summary_models, tier_stats
+    api_limiter = AimdLimiter(args.concurrency, maximum=max_concurrency)
+    if args.summary_format == "bundle":
+        summary_bundle = SummaryBundle(bundle_path(date_specific_output_dir))
+        logger.info(f"Summaries are appended to {summary_bundle.path} ({len(summary_bundle)} already there)")
+    summary_models = [PrefixedModel(model_name, SUMMARY_INSTRUCTIONS, generation_config=generation_config,
+                                    mode=args.prompt_prefix, name=f"Summary prompt ({model_name})")
+                      for model_name in model_names]
+    tier_stats = TierStats(model_names)
+    logger.info(f"Summary models, cheapest first: {' -> '.join(model_names)}")
+    if not args.no_cache:
+        summary_cache = SummaryCache(args.cache, max_bytes=int(args.cache_max_mb * 1024 * 1024))
+    # Enough workers for the highest concurrency limit; in batch mode each request carries up to batch_size articles
+    workers = max_concurrency
+    if args.batch_size > 1:
+        summary_batcher = RequestBatcher(generate_summaries_batch, args.batch_size, max_wait=DEFAULT_MAX_WAIT_SECONDS, name="Gemini batch")
+        workers = max_concurrency * args.batch_size
+
     processed_count = 0
     success_count = 0
     skipped_count = 0
+    resume_hint = None
     start_time = time.time()
+    logger.info(f"Summarizing with {args.concurrency} concurrent requests (adaptive, up to {max_concurrency}) of {args.batch_size} article(s), at most {args.rpm:g} Gemini requests per minute.")
 
-    for i, article_data in enumerate(articles):
-        logger.debug(f"Attempting article {i+1}/{total_articles}")
+    def record_result(position, article_data, success):
+        nonlocal processed_count, success_count, skipped_count, resume_hint
         processed_count += 1
-
-        try:
-            # --- MODIFIED: Pass the date_specific_output_dir ---
-            success = process_article(article_data, date_specific_output_dir)
-            if success:
-                success_count += 1
-            else:
-                skipped_count += 1
-        except Exception as e:
-            article_url_log = article_data.get("url", "URL_MISSING")
-            article_link_log = article_data.get("link", "LINK_MISSING")
-            logger.error(f"CRITICAL UNEXPECTED ERROR in main loop for article entry {i+1} (URL: {article_url_log}, Link: {article_link_log}): {e}", exc_info=True)
+        if success:
+            success_count += 1
+        else:
             skipped_count += 1
-        finally:
-            if processed_count % 10 == 0 or processed_count == total_articles:
-                elapsed_time = time.time() - start_time
-                logger.info(f"Progress: {processed_count}/{total_articles} articles attempted ({success_count} successful, {skipped_count} skipped/failed) in {elapsed_time:.2f} seconds.")
-            # time.sleep(0.5) # Optional delay
-
+        # Results come in input order: everything up to this record is done
+        next_index, next_offset = articles.resume_point(position)
+        resume_hint = f"--start-offset {next_offset}" if next_offset is not None else f"--start-index {next_index}"
+        if processed_count % 10 == 0:
+            elapsed_time = time.time() - start_time
+            logger.info(f"Progress: {processed_count} articles attempted ({success_count} successful, {skipped_count} skipped/failed) in {elapsed_time:.2f} seconds. Resume with {resume_hint}")
+
+    records = articles
+    resolver = None
+    if args.no_db_check:
+        pass
+    elif not SUPABASE_URL or not SUPABASE_KEY:
+        logger.warning("SUPABASE_URL/SUPABASE_KEY not set: articles already in the database will be summarized too (the exporter skips them).")
+    else:
+        from supabase import create_client
+
+        resolver = PmidResolver(args.pmid_cache, offline=True)
+        # While following the scraper, a partial chunk is checked after a short wait rather than held until it is full
+        max_wait = args.db_check_max_wait if args.follow else None
+        known_articles = KnownArticleFilter(create_client(SUPABASE_URL, SUPABASE_KEY), resolver=resolver,
+                                            chunk_size=args.db_check_chunk_size, max_wait=max_wait)
+        records = known_articles.iter_checked(articles)
+        logger.info(f"Input links are checked against Supabase before summarizing (up to {args.db_check_chunk_size} per query"
+                    + (f", or after {max_wait:g}s)." if max_wait is not None else ")."))
+
+    # --- MODIFIED: Pass the date_specific_output_dir ---
+    summarize_articles(records, date_specific_output_dir, index=index, concurrency=workers,
+                       on_result=record_result)
+    if resolver is not None:
+        resolver.close()
+
+    if index is not None:
+        index.close()
+    if summary_cache is not None:
+        logger.info(f"Summary cache: {summary_cache.hits} hits, {summary_cache.misses} misses")
+        summary_cache.close()
+    if summary_bundle is not None:
+        summary_bundle.close()
+    for summary_model in summary_models:
+        summary_model.close()
 
     end_time = time.time()
     logger.info(f"--- Processing Finished ---")
-    logger.info(f"Total articles in source file: {total_articles}")
+    logger.info(f"Total articles read from source file: {articles.records_read}")
     logger.info(f"Total articles attempted: {processed_count}")
     logger.info(f"Successfully processed and saved: {success_count}")
+    if resume_hint:
+        logger.info(f"Resume point after the last record: {resume_hint}")
     logger.info(f"Skipped (already exist, errors, missing data): {skipped_count}")
     logger.info(f"Total time: {end_time - start_time:.2f} seconds")
+    logger.info(f"Gemini requests: {rate_limiter.acquired} ({rate_limiter.waited_seconds:.1f}s of worker time spent waiting for the rate limit)")
+    if known_articles is not None:
+        logger.info(f"Already in Supabase, not summarized: {known_articles.known_count} of {known_articles.checked} links checked "
+                    f"({known_articles.queries} queries, {known_articles.failed} links unchecked after errors)")
+    logger.info(f"Throttled requests: {api_limiter.throttled} ({api_limiter.decreases} concurrency cuts); final concurrency limit: {api_limiter.limit}")
+    for summary_model in summary_models:
+        logger.info(summary_model.usage_summary())
+    for line in tier_stats.summary_lines():
+        logger.info(f"Model tier {line}")
+    if summary_batcher is not None:
+        logger.info(f"Batch requests: {summary_batcher.batches_sent} for {summary_batcher.items_sent} articles (other requests are retries and articles asked again on their own)")
     # --- MODIFIED: Log the specific output directory ---
-    logger.info(f"Individual JSON summaries saved in: {date_specific_output_dir}")
+    if summary_bundle is not None:
+        logger.info(f"Summaries saved in: {summary_bundle.path} ({len(summary_bundle)} in total)")
+    else:
+        logger.info(f"Individual JSON summaries saved in: {date_specific_output_dir}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,172 @@
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Iterator, Any, Optional, Tuple
+
+# --- Configuration ---
+# Created next to the JSONL file once the writer is closed: tells readers following
+# the file that no more records will be appended.
+DONE_MARKER_SUFFIX = ".done"
+FSYNC_EVERY_RECORDS = 10
+FSYNC_INTERVAL_SECONDS = 5.0
+FOLLOW_POLL_INTERVAL_SECONDS = 0.5
+FOLLOW_IDLE_TIMEOUT_SECONDS = 900
+# A file left by an earlier run is renamed to <path>.<timestamp> instead of being truncated
+ROTATED_SUFFIX_FORMAT = "%Y%m%d_%H%M%S"
+
+logger = logging.getLogger(__name__)
+
+
+def done_marker_path(path: str) -> str:
+    return path + DONE_MARKER_SUFFIX
+
+
+def rotate_existing_file(path: str) -> Optional[str]:
+    """Renames a non-empty file at path to <path>.<timestamp> (never overwriting). Returns the new name."""
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return None
+    rotated = f"{path}.{time.strftime(ROTATED_SUFFIX_FORMAT)}"
+    suffix = 1
+    while os.path.exists(rotated):
+        rotated = f"{path}.{time.strftime(ROTATED_SUFFIX_FORMAT)}_{suffix}"
+        suffix += 1
+    os.rename(path, rotated)
+    return rotated
+
+
+class JsonlWriter:
+    """
+    Crash-safe, append-only JSONL writer.
+    Every record is flushed to the OS as soon as it is written (so readers following the
+    file see it immediately); fsync is batched every FSYNC_EVERY_RECORDS records or
+    FSYNC_INTERVAL_SECONDS. Thread-safe. Closing the writer creates the done marker.
+    A file left at path by an earlier run (e.g. a second run the same day) is kept as
+    <path>.<timestamp> rather than truncated.
+    """
+
+    def __init__(self, path: str, fsync_every: int = FSYNC_EVERY_RECORDS,
+                 fsync_interval: float = FSYNC_INTERVAL_SECONDS):
+        self.path = path
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.records_written = 0
+        self._pending_sync = 0
+        self._last_sync = time.monotonic()
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # A new run starts a new file: keep the previous run's records, drop its done marker
+        rotated = rotate_existing_file(path)
+        if rotated:
+            logger.warning(f"{path} already exists (earlier run). Kept it as {rotated}.")
+        if os.path.exists(done_marker_path(path)):
+            os.remove(done_marker_path(path))
+        self._file = open(path, 'w', encoding='utf-8')
+        logger.info(f"Streaming records to {path}")
+
+    def write(self, record: Dict[str, Any]):
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            self.records_written += 1
+            self._pending_sync += 1
+            if (self._pending_sync >= self.fsync_every
+                    or time.monotonic() - self._last_sync >= self.fsync_interval):
+                self._sync()
+
+    def _sync(self):
+        os.fsync(self._file.fileno())
+        self._pending_sync = 0
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.flush()
+            self._sync()
+            self._file.close()
+        with open(done_marker_path(self.path), 'w', encoding='utf-8') as marker:
+            marker.write(f"{self.records_written}\n")
+        logger.info(f"Closed {self.path} ({self.records_written} records).")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def iter_jsonl_records(path: str, follow: bool = False,
+                       idle_timeout: float = FOLLOW_IDLE_TIMEOUT_SECONDS) -> Iterator[Dict[str, Any]]:
+    """Yields the JSON objects of a JSONL file, one per line (see iter_jsonl_entries)."""
+    for _, record in iter_jsonl_entries(path, follow=follow, idle_timeout=idle_timeout):
+        yield record
+
+
+def iter_jsonl_entries(path: str, follow: bool = False, idle_timeout: float = FOLLOW_IDLE_TIMEOUT_SECONDS,
+                       start_offset: int = 0) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Yields (byte offset just after the line, JSON object) for each line of a JSONL file,
+    starting at start_offset (which must be the start of a line, e.g. an offset yielded
+    earlier). Only the current line is held in memory.
+    With follow=True the file is tailed while it is being written: the iterator waits
+    for the file to appear and for new lines, and stops once the writer's done marker
+    exists and everything was read (or after idle_timeout seconds without new data).
+    Incomplete trailing lines are only parsed once their newline arrives; malformed
+    lines are logged and skipped.
+    """
+    last_activity = time.monotonic()
+    while not os.path.exists(path):
+        if not follow:
+            raise FileNotFoundError(path)
+        if os.path.exists(done_marker_path(path)) or time.monotonic() - last_activity > idle_timeout:
+            logger.warning(f"{path} was never created. Nothing to read.")
+            return
+        time.sleep(FOLLOW_POLL_INTERVAL_SECONDS)
+
+    line_number = 0
+    done_seen = False
+    # Binary mode: offsets are byte positions, usable with seek() on a later run
+    with open(path, 'rb') as f:
+        f.seek(start_offset)
+        offset = start_offset
+        pending = b""
+        while True:
+            line = f.readline()
+            if line:
+                pending += line
+                if not pending.endswith(b"\n") and follow:
+                    continue # Partial line: wait for the writer to finish it
+                line_number += 1
+                line_offset = offset
+                offset += len(pending)
+                text, pending = pending.strip(), b""
+                last_activity = time.monotonic()
+                if not text:
+                    continue
+                try:
+                    record = json.loads(text.decode('utf-8'))
+                except (UnicodeDecodeError, json.JSONDecodeError) as e:
+                    logger.warning(f"Skipping malformed line {line_number} (at byte {line_offset}) in {path}: {e}")
+                    continue
+                if isinstance(record, dict):
+                    yield offset, record
+                else:
+                    logger.warning(f"Skipping line {line_number} (at byte {line_offset}) in {path}: not a JSON object.")
+                continue
+
+            if not follow or done_seen:
+                return
+            if os.path.exists(done_marker_path(path)):
+                done_seen = True # Read whatever was written before the marker, then stop
+                continue
+            if time.monotonic() - last_activity > idle_timeout:
+                logger.warning(f"No new data in {path} for {idle_timeout} seconds and no done marker. Stopping.")
+                return
+            time.sleep(FOLLOW_POLL_INTERVAL_SECONDS)
@@ -0,0 +1,140 @@
+import logging
+import queue
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+
+from pubmed_resolver import PmidResolver
+
+# --- Configuration ---
+# Input records checked per Supabase query. Each link may add its other PubMed form, and the
+# values go in the query string, so the chunk stays well below URL length limits.
+DEFAULT_LINK_CHECK_CHUNK_SIZE = 50
+# When the input is a live stream (generator in --follow mode), a partial chunk is checked this long
+# after its first record arrived, instead of waiting for a full chunk that may be minutes away
+DEFAULT_LINK_CHECK_MAX_WAIT_SECONDS = 2.0
+
+logger = logging.getLogger(__name__)
+
+
+def article_link(article_data: Dict[str, Any]) -> Optional[str]:
+    """The link the summary (and the Supabase row) will carry: the PubMed link, else the article URL."""
+    return article_data.get("link") or article_data.get("url")
+
+
+def fetch_existing_links(supabase, links: List[str]) -> Set[str]:
+    """The links among `links` that are already in the 'articles' table (one query). Raises on errors."""
+    if not links:
+        return set()
+    response = supabase.table('articles').select('link').in_('link', links).execute()
+    return {row['link'] for row in (response.data or [])}
+
+
+class KnownArticleFilter:
+    """
+    Finds, before any summary is generated, which input articles are already in the Supabase
+    'articles' table, so the generator does not pay for summaries the exporter would throw
+    away. iter_checked() passes a record stream through unchanged, checking each chunk of
+    records with a single query; is_known() then answers from memory. With max_wait, a partial
+    chunk is also checked max_wait seconds after its first record arrived (for streams that
+    pause, such as a followed JSONL file), so records are never held back longer than that.
+    With a PMID resolver, both forms of a PubMed link (canonical /<pmid>/ and legacy
+    '?term=<doi>') are matched, as in export_to_db.check_link_exists.
+    A failed query is logged and its articles are treated as new (the exporter checks again).
+    """
+
+    def __init__(self, supabase, resolver: Optional[PmidResolver] = None,
+                 chunk_size: int = DEFAULT_LINK_CHECK_CHUNK_SIZE, max_wait: Optional[float] = None):
+        self.supabase = supabase
+        self.resolver = resolver
+        self.chunk_size = max(1, chunk_size)
+        self.max_wait = max_wait
+        self._known: Set[str] = set()
+        self.queries = 0
+        self.checked = 0
+        self.failed = 0
+
+    def iter_checked(self, records: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        if self.max_wait is not None:
+            yield from self._iter_checked_timed(records)
+            return
+        chunk = []
+        for record in records:
+            chunk.append(record)
+            if len(chunk) >= self.chunk_size:
+                self._check(chunk)
+                yield from chunk
+                chunk = []
+        if chunk:
+            self._check(chunk)
+            yield from chunk
+
+    def _iter_checked_timed(self, records: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """iter_checked() with the max_wait deadline: a reader thread pulls the (possibly blocking) source."""
+        pending: "queue.Queue" = queue.Queue(maxsize=self.chunk_size * 2)
+        end = object()
+
+        def read():
+            try:
+                for record in records:
+                    pending.put((record, None))
+            except Exception as e: # Re-raised on the consuming side
+                pending.put((end, e))
+                return
+            pending.put((end, None))
+
+        threading.Thread(target=read, name="known-links-reader", daemon=True).start()
+        chunk = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                record, error = pending.get(timeout=timeout)
+            except queue.Empty:
+                record, error = None, None # Deadline reached: check the partial chunk
+            if record is end:
+                if chunk:
+                    self._check(chunk)
+                    yield from chunk
+                if error is not None:
+                    raise error
+                return
+            if record is not None:
+                chunk.append(record)
+                if deadline is None:
+                    deadline = time.monotonic() + self.max_wait
+            if chunk and (len(chunk) >= self.chunk_size or time.monotonic() >= deadline):
+                self._check(chunk)
+                yield from chunk
+                chunk = []
+                deadline = None
+
+    def _check(self, records: List[Dict[str, Any]]):
+        variants_by_link = {}
+        for record in records:
+            link = article_link(record)
+            if link and link not in variants_by_link:
+                variants_by_link[link] = self.resolver.link_variants(link) if self.resolver is not None else [link]
+        if not variants_by_link:
+            return
+        all_variants = list(dict.fromkeys(v for variants in variants_by_link.values() for v in variants))
+        self.queries += 1
+        self.checked += len(variants_by_link)
+        try:
+            existing = fetch_existing_links(self.supabase, all_variants)
+        except Exception as e:
+            self.failed += len(variants_by_link)
+            logger.error(f"Could not check {len(variants_by_link)} links against Supabase: {e}. They will be summarized.")
+            return
+        for link, variants in variants_by_link.items():
+            if existing.intersection(variants):
+                self._known.add(link)
+
+    def is_known(self, article_data: Dict[str, Any]) -> bool:
+        """True if the article's link (or its other PubMed form) is already in Supabase."""
+        link = article_link(article_data)
+        return bool(link) and link in self._known
+
+    @property
+    def known_count(self) -> int:
+        return len(self._known)
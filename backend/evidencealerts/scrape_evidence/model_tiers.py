@@ -0,0 +1,52 @@
+import threading
+from collections import Counter
+from typing import Dict, List
+
+# --- Configuration ---
+ACCEPTED = "accepted"
+# Why an answer of a tier is not accepted; every reason but the last tier's sends the article to the next tier
+ESCALATION_REASONS = ("api_error", "truncated", "invalid_json", "missing_keys")
+
+
+def parse_model_tiers(value: str) -> List[str]:
+    """'model-a,model-b' -> ['model-a', 'model-b'] (cheapest first), without blanks or repeats."""
+    return list(dict.fromkeys(name.strip() for name in value.split(",") if name.strip()))
+
+
+class TierStats:
+    """
+    Outcome counts of the cheap-first model tiers: for each model, how many articles it was
+    asked, how many of its answers were accepted (its hit rate), why the others were not,
+    and the time spent in its calls. Safe to share between threads.
+    """
+
+    def __init__(self, names: List[str]):
+        self.names = list(names)
+        self._lock = threading.Lock()
+        self._outcomes: Dict[str, Counter] = {name: Counter() for name in self.names}
+        self._seconds: Dict[str, float] = {name: 0.0 for name in self.names}
+
+    def record(self, name: str, outcome: str, seconds: float = 0.0):
+        with self._lock:
+            self._outcomes.setdefault(name, Counter())[outcome] += 1
+            self._seconds[name] = self._seconds.get(name, 0.0) + seconds
+
+    def attempts(self, name: str) -> int:
+        return sum(self._outcomes.get(name, Counter()).values())
+
+    def accepted(self, name: str) -> int:
+        return self._outcomes.get(name, Counter())[ACCEPTED]
+
+    def summary_lines(self) -> List[str]:
+        lines = []
+        with self._lock:
+            for name, outcomes in self._outcomes.items():
+                attempts = sum(outcomes.values())
+                if not attempts:
+                    lines.append(f"{name}: not used")
+                    continue
+                rejected = ", ".join(f"{reason} {outcomes[reason]}" for reason in ESCALATION_REASONS if outcomes[reason])
+                lines.append(f"{name}: {outcomes[ACCEPTED]}/{attempts} accepted ({outcomes[ACCEPTED] / attempts:.0%})"
+                             + (f", not accepted: {rejected}" if rejected else "")
+                             + f", {self._seconds[name] / attempts:.2f}s per call")
+        return lines
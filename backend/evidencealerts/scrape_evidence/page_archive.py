@@ -0,0 +1,160 @@
+import contextlib
+import gzip
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterator, List, NamedTuple, Optional
+
+from article_index import extract_alerted_article_id
+
+# --- Configuration ---
+# Kept between runs, outside the data/links/summaries directories that the pipeline deletes.
+DEFAULT_ARCHIVE_DIR = "page_archive"
+ARCHIVE_INDEX_FILENAME = "index.sqlite3"
+ARCHIVE_BLOBS_DIRNAME = "blobs"
+PAGE_KINDS = ("article", "pubmed")
+GZIP_COMPRESS_LEVEL = 6
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    article_id  TEXT,
+    kind        TEXT,
+    url         TEXT,
+    article_url TEXT,
+    sha256      TEXT,
+    size        INTEGER,
+    fetched_at  REAL,
+    PRIMARY KEY (article_id, kind)
+);
+CREATE INDEX IF NOT EXISTS idx_pages_fetched_at ON pages (fetched_at);
+"""
+
+logger = logging.getLogger(__name__)
+
+
+class ArchivedPage(NamedTuple):
+    url: str
+    article_url: str
+    html: str
+    fetched_at: float
+
+
+def archive_key(article_url: str) -> str:
+    """The AlertedArticle ID of an article URL (the URL itself when it has none)."""
+    return extract_alerted_article_id(article_url) or article_url
+
+
+class PageArchive:
+    """
+    Archive of the raw HTML the scraper saw, for re-extraction without network access.
+    Pages are stored as gzipped, content-addressed blobs (blobs/<sha256[:2]>/<sha256>.html.gz,
+    so identical pages are stored once) and indexed by AlertedArticle ID and page kind
+    ('article' for the EvidenceAlerts page, 'pubmed' for the PubMed page) in a SQLite file.
+    Re-scraping an article replaces its index entries. Safe to share between threads.
+    """
+
+    def __init__(self, directory: str = DEFAULT_ARCHIVE_DIR):
+        self.directory = directory
+        self.blobs_dir = os.path.join(directory, ARCHIVE_BLOBS_DIRNAME)
+        os.makedirs(self.blobs_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._conn = sqlite3.connect(os.path.join(directory, ARCHIVE_INDEX_FILENAME), check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+        logger.info(f"Opened page archive: {directory}")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    # --- Writing ---
+
+    def _blob_path(self, sha256: str) -> str:
+        return os.path.join(self.blobs_dir, sha256[:2], f"{sha256}.html.gz")
+
+    def _write_blob(self, data: bytes) -> str:
+        sha256 = hashlib.sha256(data).hexdigest()
+        path = self._blob_path(sha256)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(gzip.compress(data, compresslevel=GZIP_COMPRESS_LEVEL))
+            os.replace(temp_path, path)
+        return sha256
+
+    @contextlib.contextmanager
+    def article(self, article_url: str) -> Iterator[None]:
+        """Pages stored on this thread inside the block (see store_current) belong to article_url."""
+        self._local.article_url = article_url
+        try:
+            yield
+        finally:
+            self._local.article_url = None
+
+    def store_current(self, kind: str, html: str, url: Optional[str] = None) -> Optional[str]:
+        """Stores a page of the article opened with article() on this thread (no-op outside one)."""
+        article_url = getattr(self._local, "article_url", None)
+        if not article_url:
+            return None
+        return self.store(article_url, kind, html, url=url)
+
+    def store(self, article_url: str, kind: str, html: str, url: Optional[str] = None) -> str:
+        """Stores one page of an article and returns its blob hash."""
+        if kind not in PAGE_KINDS:
+            raise ValueError(f"Unknown page kind: {kind}")
+        data = html.encode('utf-8')
+        sha256 = self._write_blob(data)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages (article_id, kind, url, article_url, sha256, size, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (archive_key(article_url), kind, url or article_url, article_url, sha256, len(data), time.time()),
+            )
+            self._conn.commit()
+        return sha256
+
+    # --- Reading ---
+
+    def load(self, article_id: str, kind: str) -> Optional[ArchivedPage]:
+        """Returns the archived page of an article, or None if it was never stored (or its blob is gone)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, article_url, sha256, fetched_at FROM pages WHERE article_id = ? AND kind = ?",
+                (article_id, kind),
+            ).fetchone()
+        if row is None:
+            return None
+        url, article_url, sha256, fetched_at = row
+        try:
+            with gzip.open(self._blob_path(sha256), 'rb') as f:
+                html = f.read().decode('utf-8')
+        except (OSError, EOFError) as blob_err:
+            logger.warning(f"Archived {kind} page of article {article_id} is unreadable: {blob_err}")
+            return None
+        return ArchivedPage(url=url, article_url=article_url, html=html, fetched_at=fetched_at)
+
+    def article_ids(self, since: Optional[float] = None) -> List[str]:
+        """IDs of the archived articles (with an EvidenceAlerts page), oldest first, optionally fetched since a timestamp."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT article_id FROM pages WHERE kind = 'article' AND fetched_at >= ? ORDER BY fetched_at",
+                (since or 0,),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            pages, raw_bytes = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM pages").fetchone()
+            blobs = self._conn.execute("SELECT COUNT(DISTINCT sha256) FROM pages").fetchone()[0]
+        return {"pages": pages, "blobs": blobs, "raw_bytes": raw_bytes}
@@ -0,0 +1,129 @@
+import datetime
+import logging
+import threading
+import time
+from typing import Any, Optional
+
+import google.generativeai as genai
+
+# --- Configuration ---
+# How a static prompt prefix reaches the model, in the order 'auto' tries them:
+# - 'cached': a Gemini CachedContent created once, that later calls reference (explicit context
+#   caching; the API refuses contents below a minimum token count, and some models)
+# - 'system': the model's system instruction, sent by the SDK with each call but kept out of the
+#   per-call prompt (and a stable prefix, which the API can cache implicitly)
+# - 'inline': the prefix prepended to every prompt, as before (old SDK, or both above unavailable)
+PREFIX_MODES = ("cached", "system", "inline")
+DEFAULT_PREFIX_MODE = "auto"
+PREFIX_CACHE_TTL_SECONDS = 3600
+PREFIX_CACHE_REFRESH_MARGIN_SECONDS = 300 # The TTL is extended when less than this is left
+
+logger = logging.getLogger(__name__)
+
+
+class PrefixedModel:
+    """
+    A Gemini model for prompts that all start with the same static text (instructions, a
+    classification taxonomy...): the prefix is given once, and generate_content() only takes
+    the per-call part. mode is one of PREFIX_MODES, or 'auto' for the first that works; a mode
+    that cannot be set up falls back to the next one, so the calls always go through.
+    The cached content is kept alive while the object is used; close() deletes it.
+    Counts the calls and the prompt tokens reported by the API (cached_tokens: those served
+    from the cache).
+    """
+
+    def __init__(self, model_name: str, prefix: str, generation_config: Optional[Any] = None,
+                 mode: str = DEFAULT_PREFIX_MODE, ttl_seconds: float = PREFIX_CACHE_TTL_SECONDS,
+                 name: str = "prompt"):
+        if mode != DEFAULT_PREFIX_MODE and mode not in PREFIX_MODES:
+            raise ValueError(f"Unknown prefix mode '{mode}' (expected {DEFAULT_PREFIX_MODE} or one of {PREFIX_MODES})")
+        self.model_name = model_name
+        self.prefix = prefix
+        self.generation_config = generation_config
+        self.ttl_seconds = ttl_seconds
+        self.name = name
+        self.mode = None
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+        self._model = None
+        self._cache = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+        self._setup(PREFIX_MODES[0] if mode == DEFAULT_PREFIX_MODE else mode)
+
+    def _setup(self, first_mode: str):
+        for mode in PREFIX_MODES[PREFIX_MODES.index(first_mode):]:
+            try:
+                if mode == "cached":
+                    self._create_cache()
+                elif mode == "system":
+                    self._model = genai.GenerativeModel(self.model_name, generation_config=self.generation_config,
+                                                        system_instruction=self.prefix)
+                else:
+                    self._model = genai.GenerativeModel(self.model_name, generation_config=self.generation_config)
+            except Exception as e:
+                logger.info(f"{self.name}: prefix mode '{mode}' unavailable ({type(e).__name__}: {e}).")
+                continue
+            self.mode = mode
+            logger.info(f"{self.name}: static prompt prefix ({len(self.prefix)} chars) sent in '{mode}' mode.")
+            return
+        raise RuntimeError(f"{self.name}: could not initialize model '{self.model_name}'")
+
+    def _create_cache(self):
+        caching = genai.caching # AttributeError on SDK versions without context caching
+        model_name = self.model_name if self.model_name.startswith("models/") else f"models/{self.model_name}"
+        self._cache = caching.CachedContent.create(
+            model=model_name,
+            display_name=self.name,
+            system_instruction=self.prefix,
+            ttl=datetime.timedelta(seconds=self.ttl_seconds),
+        )
+        self._expires_at = time.monotonic() + self.ttl_seconds
+        self._model = genai.GenerativeModel.from_cached_content(cached_content=self._cache,
+                                                                generation_config=self.generation_config)
+
+    def _keep_cache_alive(self):
+        with self._lock:
+            if self.mode != "cached" or self._expires_at - time.monotonic() > PREFIX_CACHE_REFRESH_MARGIN_SECONDS:
+                return
+            try:
+                self._cache.update(ttl=datetime.timedelta(seconds=self.ttl_seconds))
+                self._expires_at = time.monotonic() + self.ttl_seconds
+            except Exception as e:
+                logger.warning(f"{self.name}: could not extend the cached prefix ({e}). Falling back to the system instruction.")
+                self._cache = None
+                self._setup("system")
+
+    def generate_content(self, prompt: str, **kwargs):
+        """Sends the per-call part of the prompt; same keyword arguments and response as GenerativeModel."""
+        self._keep_cache_alive()
+        contents = self.prefix + prompt if self.mode == "inline" else prompt
+        response = self._model.generate_content(contents, **kwargs)
+        usage = getattr(response, "usage_metadata", None)
+        with self._lock:
+            self.calls += 1
+            self.prompt_tokens += getattr(usage, "prompt_token_count", 0) or 0
+            self.cached_tokens += getattr(usage, "cached_content_token_count", 0) or 0
+        return response
+
+    def usage_summary(self) -> str:
+        return (f"{self.name}: {self.calls} calls in '{self.mode}' mode, {self.prompt_tokens} prompt tokens "
+                f"({self.cached_tokens} served from the cache)")
+
+    def close(self):
+        """Deletes the cached content, if any (it is otherwise billed until its TTL expires)."""
+        with self._lock:
+            if self._cache is None:
+                return
+            try:
+                self._cache.delete()
+            except Exception as e:
+                logger.warning(f"{self.name}: could not delete the cached prefix ({e}). It expires with its TTL.")
+            self._cache = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,144 @@
+import functools
+import logging
+import re
+from datetime import datetime, timezone
+from typing import Any, NamedTuple, Optional
+
+from dateutil.parser import parse as dateutil_parse
+
+# --- Configuration ---
+UNKNOWN_REF_DATE = "Inconnue"
+DATE_CACHE_SIZE = 4096 # Distinct date strings remembered (a daily run has a few dozen)
+ISO_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
+# Fast paths for the shapes the scraper produces; anything else goes through dateutil
+MDY_DATE_RE = re.compile(r'(\d{1,2})/(\d{1,2})/(\d{4})') # EvidenceAlerts / citation_date: 03/05/2024
+ISO_DATE_RE = re.compile(r'(\d{4})-(\d{2})-(\d{2})(?:[T ](\d{2}):(\d{2})(?::(\d{2}))?Z?)?') # 2024-03-05[T10:20[:30][Z]]
+PUBMED_DATE_RE = re.compile(r'(\d{4}) ([A-Za-z]+) (\d{1,2})') # PubMed: 2024 Mar 5
+MONTHS = {name: number for number, names in enumerate([
+    ("jan", "january"), ("feb", "february"), ("mar", "march"), ("apr", "april"), ("may",), ("jun", "june"),
+    ("jul", "july"), ("aug", "august"), ("sep", "sept", "september"), ("oct", "october"), ("nov", "november"),
+    ("dec", "december"),
+], start=1) for name in names}
+
+logger = logging.getLogger(__name__)
+
+
+class PublicationDate(NamedTuple):
+    iso: Optional[str] # 'YYYY-MM-DDTHH:MM:SSZ' for the database, None if the date cannot be parsed
+    ref: str # 'YYYY-MM-DD' for the reference line, 'Inconnue' if the date cannot be parsed
+
+
+def normalize_publication_date(date_str: Any) -> PublicationDate:
+    """
+    Both representations of a raw publication date from a single parse. The usual shapes
+    (MM/DD/YYYY, ISO, PubMed's 'YYYY Mon DD') are parsed by precompiled regexes; other
+    inputs go through format_publication_date_iso / format_publication_date_for_ref, so the
+    results are the same as theirs. Results are memoized per date string.
+    """
+    if not date_str:
+        return PublicationDate(None, UNKNOWN_REF_DATE)
+    if not isinstance(date_str, str):
+        return _parse_slow(date_str)
+    return _normalize_cached(date_str)
+
+
+@functools.lru_cache(maxsize=DATE_CACHE_SIZE)
+def _normalize_cached(date_str: str) -> PublicationDate:
+    iso = _parse_fast(date_str)
+    if iso is not None:
+        return PublicationDate(iso, iso[:10])
+    return _parse_slow(date_str)
+
+
+def _parse_fast(date_str: str) -> Optional[str]:
+    """ISO string of a date in one of the known shapes, or None to use the slow path."""
+    try:
+        match = MDY_DATE_RE.fullmatch(date_str)
+        if match:
+            month, day, year = map(int, match.groups())
+            return datetime(year, month, day).strftime(ISO_FORMAT)
+        match = ISO_DATE_RE.fullmatch(date_str)
+        if match:
+            year, month, day, hour, minute, second = (int(group or 0) for group in match.groups())
+            return datetime(year, month, day, hour, minute, second).strftime(ISO_FORMAT)
+        match = PUBMED_DATE_RE.fullmatch(date_str)
+        if match and match.group(2).lower() in MONTHS:
+            return datetime(int(match.group(1)), MONTHS[match.group(2).lower()], int(match.group(3))).strftime(ISO_FORMAT)
+    except ValueError:
+        pass # Out-of-range day/month: let the slow path decide (and log)
+    return None
+
+
+def _parse_slow(date_str: Any) -> PublicationDate:
+    iso = format_publication_date_iso(date_str)
+    return PublicationDate(iso, iso[:10] if iso else format_publication_date_for_ref(date_str))
+
+
+# --- Reference implementation (slow path) ---
+
+def format_publication_date_iso(date_str):
+    """Attempts to parse date and format as ISO 8601 (YYYY-MM-DDTHH:MM:SZ). Returns None if invalid."""
+    if not date_str:
+        return None
+    try:
+        # Handle potential MM/DD/YYYY format specifically before general parsing
+        if re.match(r'\d{1,2}/\d{1,2}/\d{4}', date_str):
+             dt = datetime.strptime(date_str, '%m/%d/%Y')
+        else:
+            dt = dateutil_parse(date_str)
+
+        # Ensure UTC timezone if none is present
+        if dt.tzinfo is None:
+             dt = dt.replace(tzinfo=timezone.utc)
+
+        # Format to ISO 8601 with timezone offset Z for UTC
+        return dt.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+    except (ValueError, TypeError, OverflowError) as e:
+        logger.warning(f"Could not parse date '{date_str}' to ISO 8601: {e}. Trying YYYY-MM-DD extraction.")
+        # Regex to find YYYY-MM-DD pattern
+        match = re.search(r"(\d{4}-\d{2}-\d{2})", str(date_str))
+        if match:
+             try:
+                 # Convert extracted date to datetime and format as ISO with T00:00:00Z
+                 dt_date_only = datetime.strptime(match.group(0), "%Y-%m-%d")
+                 dt_utc = dt_date_only.replace(tzinfo=timezone.utc)
+                 return dt_utc.strftime('%Y-%m-%dT00:00:00Z') # Use explicit format for consistency
+             except Exception as inner_e:
+                 logger.warning(f"Could not create ISO string from extracted date {match.group(0)}: {inner_e}")
+                 return None # Fail if extraction doesn't lead to valid ISO
+        logger.error(f"Completely unable to parse date: '{date_str}' for ISO format. Returning None.")
+        return None
+    except Exception as e:
+         logger.error(f"Unexpected error parsing date '{date_str}' for ISO: {e}. Returning None.")
+         return None
+
+
+def format_publication_date_for_ref(date_str):
+    """Attempts to parse date into 'YYYY-MM-DD' or returns 'Inconnue'. For reference line."""
+    if not date_str:
+        return "Inconnue"
+    try:
+        # Use the ISO formatter first, then extract the date part
+        iso_date = format_publication_date_iso(date_str)
+        if iso_date:
+            return iso_date[:10] # Extract YYYY-MM-DD part
+        else:
+             # Fallback: try MM/DD/YYYY specifically
+             if re.match(r'\d{1,2}/\d{1,2}/\d{4}', date_str):
+                 dt = datetime.strptime(date_str, '%m/%d/%Y')
+                 return dt.strftime("%Y-%m-%d")
+             # Fallback: try general parsing if ISO failed
+             dt = dateutil_parse(date_str)
+             return dt.strftime("%Y-%m-%d")
+    except (ValueError, TypeError, OverflowError, AttributeError) as e: # Added AttributeError
+        logger.warning(f"Could not parse date '{date_str}' for reference line: {e}. Trying regex.")
+        match = re.search(r"(\d{4}-\d{2}-\d{2})", str(date_str))
+        if match:
+            return match.group(0)
+        logger.warning(f"Could not format date '{date_str}' for reference. Returning 'Inconnue'.")
+        return "Inconnue"
+    except Exception as e:
+        logger.warning(f"Unexpected error parsing date '{date_str}' for reference: {e}. Returning 'Inconnue'.")
+        return "Inconnue"
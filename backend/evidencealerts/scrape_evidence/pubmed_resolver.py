@@ -0,0 +1,295 @@
+import argparse
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Any
+
+import requests
+
+from article_index import DOI_PATTERN, extract_doi
+
+# --- Configuration ---
+# Lives next to article_index.sqlite3, outside the directories the pipeline deletes.
+DEFAULT_PMID_CACHE_PATH = "pmid_cache.sqlite3"
+PUBMED_BASE_URL = "https://pubmed.ncbi.nlm.nih.gov"
+ESEARCH_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi"
+# Read when a resolver is created (after the caller's load_dotenv()), not at import
+NCBI_API_KEY_ENV = "NCBI_API_KEY"
+# NCBI E-utilities allow 3 requests/second without an API key, 10 with one
+ESEARCH_MIN_INTERVAL_SECONDS = 0.34
+ESEARCH_MIN_INTERVAL_WITH_KEY_SECONDS = 0.11
+ESEARCH_TIMEOUT = 15 # seconds
+# DOIs PubMed does not know yet (indexing lag) are looked up again after this delay
+NEGATIVE_CACHE_TTL_SECONDS = 7 * 24 * 3600
+BULK_PAGE_SIZE = 500
+
+PMID_LINK_PATTERN = re.compile(r'pubmed\.ncbi\.nlm\.nih\.gov/(\d+)/?(?:[?#].*)?$', re.IGNORECASE)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS doi_pmid (
+    doi         TEXT PRIMARY KEY,
+    display_doi TEXT,
+    pmid        TEXT,
+    resolved_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_doi_pmid_pmid ON doi_pmid (pmid);
+"""
+
+logger = logging.getLogger(__name__)
+
+
+def canonical_pubmed_link(pmid: str) -> str:
+    """The canonical PubMed article URL: https://pubmed.ncbi.nlm.nih.gov/<pmid>/"""
+    return f"{PUBMED_BASE_URL}/{pmid}/"
+
+
+def legacy_pubmed_link(doi: str) -> str:
+    """The PubMed search URL the scraper used to store: https://pubmed.ncbi.nlm.nih.gov/?term=<doi>"""
+    return f"{PUBMED_BASE_URL}/?term={doi}"
+
+
+def display_doi(value: Optional[str]) -> Optional[str]:
+    """Returns the DOI contained in a DOI, doi.org URL or '?term=' link, keeping its case."""
+    if not value:
+        return None
+    match = DOI_PATTERN.search(value)
+    return match.group(1) if match else None
+
+
+def extract_pmid(link: Optional[str]) -> Optional[str]:
+    """Returns the PMID of a canonical PubMed article URL (None for search URLs and other links)."""
+    if not link:
+        return None
+    match = PMID_LINK_PATTERN.search(link.strip())
+    return match.group(1) if match else None
+
+
+class PmidResolver:
+    """
+    Resolves DOIs to PubMed IDs, with an on-disk SQLite cache (DOI -> PMID, including
+    'not in PubMed' answers for NEGATIVE_CACHE_TTL_SECONDS).
+    Unknown DOIs are looked up with NCBI's esearch, throttled to the E-utilities rate limit;
+    with offline=True only the cache is used. api_key defaults to the NCBI_API_KEY environment
+    variable. Safe to share between threads.
+    """
+
+    def __init__(self, path: str = DEFAULT_PMID_CACHE_PATH, offline: bool = False, api_key: Optional[str] = None):
+        self.path = path
+        self.offline = offline
+        self.api_key = api_key or os.getenv(NCBI_API_KEY_ENV)
+        self.min_interval = ESEARCH_MIN_INTERVAL_WITH_KEY_SECONDS if self.api_key else ESEARCH_MIN_INTERVAL_SECONDS
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._throttle_lock = threading.Lock()
+        self._last_request = 0.0
+        self._session = requests.Session()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+        logger.info(f"Opened PMID cache: {path} (esearch {'with' if self.api_key else 'without'} an NCBI API key)")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+        self._session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    # --- Cache ---
+
+    def remember(self, doi: str, pmid: Optional[str]):
+        """Stores a DOI -> PMID answer (pmid=None records that PubMed has no such DOI)."""
+        key = extract_doi(doi)
+        if not key:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO doi_pmid (doi, display_doi, pmid, resolved_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(doi) DO UPDATE SET display_doi = excluded.display_doi, pmid = excluded.pmid, "
+                "resolved_at = excluded.resolved_at",
+                (key, display_doi(doi), pmid, time.time()),
+            )
+            self._conn.commit()
+
+    def cached(self, doi: str) -> (bool, Optional[str]):
+        """Returns (hit, pmid) from the cache. Expired 'not found' answers are misses."""
+        key = extract_doi(doi)
+        if not key:
+            return False, None
+        with self._lock:
+            row = self._conn.execute("SELECT pmid, resolved_at FROM doi_pmid WHERE doi = ?", (key,)).fetchone()
+        if row is None:
+            return False, None
+        pmid, resolved_at = row
+        if pmid is None and time.time() - (resolved_at or 0) > NEGATIVE_CACHE_TTL_SECONDS:
+            return False, None
+        return True, pmid
+
+    def doi_for_pmid(self, pmid: str) -> Optional[str]:
+        """Returns the DOI (as first seen) cached for a PMID."""
+        with self._lock:
+            row = self._conn.execute("SELECT display_doi FROM doi_pmid WHERE pmid = ?", (pmid,)).fetchone()
+        return row[0] if row else None
+
+    # --- Resolution ---
+
+    def resolve(self, doi: Optional[str]) -> Optional[str]:
+        """Returns the PMID of a DOI (cache first, then esearch unless offline), or None."""
+        doi = display_doi(doi)
+        if not doi:
+            return None
+        hit, pmid = self.cached(doi)
+        if hit or self.offline:
+            return pmid
+        found, pmid = self._esearch(doi)
+        if found:
+            self.remember(doi, pmid)
+        return pmid
+
+    def _esearch(self, doi: str) -> (bool, Optional[str]):
+        """
+        Looks the DOI up in PubMed. Returns (answered, pmid): answered is False on network
+        or API errors, which must not be cached.
+        """
+        params = {"db": "pubmed", "term": f"{extract_doi(doi)}[doi]", "retmode": "json"}
+        if self.api_key:
+            params["api_key"] = self.api_key
+        with self._throttle_lock:
+            delay = self.min_interval - (time.monotonic() - self._last_request)
+            if delay > 0:
+                time.sleep(delay)
+            self._last_request = time.monotonic()
+        try:
+            response = self._session.get(ESEARCH_URL, params=params, timeout=ESEARCH_TIMEOUT)
+            response.raise_for_status()
+            id_list = response.json().get("esearchresult", {}).get("idlist", [])
+        except (requests.exceptions.RequestException, ValueError) as search_err:
+            logger.warning(f"PMID lookup failed for DOI {doi}: {search_err}")
+            return False, None
+        if len(id_list) == 1:
+            logger.info(f"Resolved DOI {doi} to PMID {id_list[0]}.")
+            return True, id_list[0]
+        if id_list:
+            logger.warning(f"DOI {doi} matches {len(id_list)} PubMed records. Keeping the search link.")
+        else:
+            logger.info(f"DOI {doi} is not in PubMed (yet).")
+        return True, None
+
+    # --- Links ---
+
+    def pubmed_link(self, doi: Optional[str], pmid: Optional[str] = None) -> Optional[str]:
+        """
+        Canonical /<pmid>/ link of an article. A PMID read from the PubMed page is cached
+        for the DOI; without one, the DOI is resolved. Falls back to the ?term=<doi> link.
+        """
+        doi = display_doi(doi) or doi
+        if pmid and doi:
+            self.remember(doi, pmid)
+        pmid = pmid or self.resolve(doi)
+        if pmid:
+            return canonical_pubmed_link(pmid)
+        return legacy_pubmed_link(doi) if doi else None
+
+    def link_variants(self, link: Optional[str]) -> List[str]:
+        """
+        The link plus the other form (canonical or ?term= search URL) of the same article
+        known from the cache, e.g. to look for rows stored before links were canonical.
+        Never hits the network.
+        """
+        if not link:
+            return []
+        variants = [link]
+        pmid = extract_pmid(link)
+        if pmid:
+            doi = self.doi_for_pmid(pmid)
+            if doi:
+                variants.append(legacy_pubmed_link(doi))
+                if doi.lower() != doi:
+                    variants.append(legacy_pubmed_link(doi.lower()))
+        else:
+            doi = extract_doi(link)
+            hit, cached_pmid = self.cached(doi) if doi else (False, None)
+            if cached_pmid:
+                variants.append(canonical_pubmed_link(cached_pmid))
+        return list(dict.fromkeys(variants))
+
+
+# --- Bulk Resolution of Existing Supabase Links ---
+
+def bulk_resolve_supabase_links(supabase, resolver: PmidResolver, dry_run: bool = False,
+                                limit: Optional[int] = None) -> Dict[str, int]:
+    """
+    Rewrites the '?term=<doi>' links of the Supabase 'articles' table to canonical
+    /<pmid>/ links. Rows whose canonical link already belongs to another row are left alone.
+    """
+    counts = {"checked": 0, "updated": 0, "unresolved": 0, "duplicates": 0, "errors": 0}
+    last_id = 0
+    while limit is None or counts["checked"] < limit:
+        page_size = BULK_PAGE_SIZE if limit is None else min(BULK_PAGE_SIZE, limit - counts["checked"])
+        response = (supabase.table('articles').select('id, link').like('link', '%?term=%')
+                    .gt('id', last_id).order('id').limit(page_size).execute())
+        rows: List[Dict[str, Any]] = response.data or []
+        if not rows:
+            break
+        for row in rows:
+            last_id = row['id']
+            counts["checked"] += 1
+            pmid = resolver.resolve(display_doi(row['link']))
+            if not pmid:
+                counts["unresolved"] += 1
+                continue
+            canonical_link = canonical_pubmed_link(pmid)
+            try:
+                existing = supabase.table('articles').select('id').eq('link', canonical_link).limit(1).execute()
+                if existing.data:
+                    logger.warning(f"Article {row['id']}: {canonical_link} already used by article {existing.data[0]['id']}. Skipping.")
+                    counts["duplicates"] += 1
+                    continue
+                if dry_run:
+                    logger.info(f"[dry run] Article {row['id']}: {row['link']} -> {canonical_link}")
+                else:
+                    supabase.table('articles').update({'link': canonical_link}).eq('id', row['id']).execute()
+                    logger.info(f"Article {row['id']}: {row['link']} -> {canonical_link}")
+                counts["updated"] += 1
+            except Exception as update_err:
+                logger.error(f"Could not update article {row['id']}: {update_err}")
+                counts["errors"] += 1
+    return counts
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Resolves DOIs to canonical PubMed /<pmid>/ links (with an on-disk cache).")
+    parser.add_argument("dois", nargs="*", help="DOIs to resolve and print")
+    parser.add_argument("--cache", default=DEFAULT_PMID_CACHE_PATH, help=f"SQLite DOI->PMID cache (default: {DEFAULT_PMID_CACHE_PATH})")
+    parser.add_argument("--supabase", action="store_true", help="Rewrite the '?term=<doi>' links of the Supabase articles table to canonical links")
+    parser.add_argument("--dry-run", action="store_true", help="With --supabase: only log the changes")
+    parser.add_argument("--limit", type=int, default=None, help="With --supabase: check at most this many articles")
+    args = parser.parse_args()
+
+    from dotenv import load_dotenv
+    load_dotenv() # NCBI_API_KEY, and the Supabase credentials of --supabase
+    with PmidResolver(args.cache) as resolver:
+        for doi in args.dois:
+            print(f"{doi}\t{resolver.pubmed_link(doi)}")
+
+        if args.supabase:
+            from supabase import create_client
+
+            supabase_url = os.getenv("SUPABASE_URL")
+            supabase_key = os.getenv("SUPABASE_KEY")
+            if not supabase_url or not supabase_key:
+                logger.error("Error: SUPABASE_URL and SUPABASE_KEY must be set in the .env file.")
+                exit(1)
+            counts = bulk_resolve_supabase_links(create_client(supabase_url, supabase_key), resolver,
+                                                 dry_run=args.dry_run, limit=args.limit)
+            logger.info(f"Bulk resolution done: {counts}")
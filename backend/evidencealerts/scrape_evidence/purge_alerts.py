@@ -0,0 +1,217 @@
+import argparse
+import logging
+import sys
+from typing import List, Optional, Tuple
+from urllib.parse import urljoin
+
+import requests
+from bs4 import BeautifulSoup
+from selenium.webdriver.chrome.webdriver import WebDriver
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+# Module import (not from-imports): the URLs are read at call time, so they can be pointed elsewhere (benchmark mock site)
+import scrape_evidencealerts as scraper
+from article_index import ArticleIndex, DEFAULT_INDEX_PATH, extract_alerted_article_id
+
+# --- Configuration ---
+PURGE_MODES = ("http", "browser")
+PURGE_MODE = "http"
+DELETE_BUTTON_TEXT = "Delete the selected items"
+DELETE_BUTTON_XPATH = ("//*[(self::input or self::button) and "
+                       f"(@value='{DELETE_BUTTON_TEXT}' or normalize-space(.)='{DELETE_BUTTON_TEXT}')]")
+# The checkbox of one alerted article row (rows are <tr id="Article<id>">)
+ALERT_CHECKBOX_SELECTOR = "tr#Article{article_id} input[type='checkbox']"
+CONFIRM_DIALOG_TIMEOUT = 3 # seconds
+
+logger = logging.getLogger(__name__)
+
+
+def select_exported_alerts(index: ArticleIndex, listing_html: str) -> Tuple[List[str], int]:
+    """
+    Returns the AlertedArticle IDs of the listing whose article the index marks as exported
+    (inserted into Supabase, or found there already), and the number of listed alerts.
+    Alerts the index does not know, or that were not exported yet, are never selected.
+    """
+    article_links = scraper.parse_article_links_html(listing_html)
+    exported_ids = []
+    for link in article_links:
+        article_id = extract_alerted_article_id(link)
+        if article_id and index.is_exported(url=link):
+            exported_ids.append(article_id)
+    return exported_ids, len(article_links)
+
+
+def remaining_alerts(listing_html: str, article_ids: List[str]) -> List[str]:
+    """IDs among article_ids that are still listed."""
+    listed = {extract_alerted_article_id(link) for link in scraper.parse_article_links_html(listing_html)}
+    return [article_id for article_id in article_ids if article_id in listed]
+
+
+def find_delete_button(soup: BeautifulSoup):
+    """The listing's delete button (<input> or <button> labelled DELETE_BUTTON_TEXT), or None."""
+    for candidate in soup.find_all(['input', 'button']):
+        if DELETE_BUTTON_TEXT in (candidate.get('value') or candidate.get_text(" ", strip=True)):
+            return candidate
+    return None
+
+
+def missing_purge_controls(listing_html: str, article_ids: List[str]) -> List[str]:
+    """
+    Checks the listing against DELETE_BUTTON_TEXT and ALERT_CHECKBOX_SELECTOR before anything
+    is deleted. Returns what is missing (the delete button, its form, the named checkbox of each
+    alert), or an empty list if the page matches. A non-empty list means the page changed and
+    the selectors have to be updated: nothing may be submitted.
+    """
+    soup = BeautifulSoup(listing_html, scraper.HTML_PARSER)
+    missing = []
+    delete_button = find_delete_button(soup)
+    if delete_button is None:
+        missing.append(f"'{DELETE_BUTTON_TEXT}' button")
+    elif delete_button.find_parent('form') is None:
+        missing.append(f"form of the '{DELETE_BUTTON_TEXT}' button")
+    for article_id in article_ids:
+        checkbox = soup.select_one(ALERT_CHECKBOX_SELECTOR.format(article_id=article_id))
+        if checkbox is None or not checkbox.get('name'):
+            missing.append(f"checkbox of alert {article_id} ({ALERT_CHECKBOX_SELECTOR.format(article_id=article_id)})")
+    return missing
+
+
+# --- HTTP Purge ---
+
+def build_delete_form(listing_html: str, listing_url: str, article_ids: List[str]) -> Optional[Tuple[str, List[Tuple[str, str]]]]:
+    """
+    Builds the submission of the listing form with only the given alerts ticked: hidden
+    fields (anti-forgery token), the row checkboxes and the delete button.
+    Returns (action URL, form fields), or None if the delete button is not on the page.
+    """
+    soup = BeautifulSoup(listing_html, scraper.HTML_PARSER)
+    delete_button = find_delete_button(soup)
+    form = delete_button.find_parent('form') if delete_button else None
+    if form is None:
+        logger.error(f"'{DELETE_BUTTON_TEXT}' form not found on the alerted articles page.")
+        return None
+
+    form_data = [
+        (field['name'], field.get('value', ''))
+        for field in form.find_all('input', type='hidden') if field.get('name')
+    ]
+    for article_id in article_ids:
+        checkbox = soup.select_one(ALERT_CHECKBOX_SELECTOR.format(article_id=article_id))
+        if checkbox is None or not checkbox.get('name'):
+            logger.warning(f"No checkbox for alert {article_id}. It will not be deleted.")
+            continue
+        form_data.append((checkbox['name'], checkbox.get('value', 'on')))
+    if delete_button.get('name'):
+        form_data.append((delete_button['name'], delete_button.get('value', '')))
+    return urljoin(listing_url, form.get('action') or listing_url), form_data
+
+
+def purge_alerts_http(session: requests.Session, listing_html: str, article_ids: List[str]) -> int:
+    """Deletes the given alerts by posting the listing form. Returns how many are gone from the listing."""
+    delete_form = build_delete_form(listing_html, scraper.ALERTED_ARTICLES_URL, article_ids)
+    if delete_form is None:
+        return 0
+    action_url, form_data = delete_form
+    try:
+        # Not retried by the session adapter (POST): a failed delete is simply tried again next run
+        session.post(action_url, data=form_data, timeout=scraper.HTTP_TIMEOUT).raise_for_status()
+        response = session.get(scraper.ALERTED_ARTICLES_URL, timeout=scraper.HTTP_TIMEOUT)
+        response.raise_for_status()
+    except requests.exceptions.RequestException as req_err:
+        logger.error(f"Deleting alerts over HTTP failed: {req_err}")
+        return 0
+    if not scraper.is_logged_in_listing(response.text):
+        logger.error("The alerted articles page could not be reloaded after the delete.")
+        return 0
+    return len(article_ids) - len(remaining_alerts(response.text, article_ids))
+
+
+# --- Browser Purge ---
+
+def purge_alerts_browser(driver: WebDriver, wait: WebDriverWait, article_ids: List[str]) -> int:
+    """Ticks the given alerts on the listing page and clicks the delete button. Returns how many are gone."""
+    driver.get(scraper.ALERTED_ARTICLES_URL)
+    wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, scraper.ALERTED_ARTICLES_TABLE_SELECTOR)), field="alerted_table")
+
+    ticked = 0
+    for article_id in article_ids:
+        checkboxes = driver.find_elements(By.CSS_SELECTOR, ALERT_CHECKBOX_SELECTOR.format(article_id=article_id))
+        if not checkboxes:
+            logger.warning(f"No checkbox for alert {article_id}. It will not be deleted.")
+            continue
+        if not checkboxes[0].is_selected():
+            driver.execute_script("arguments[0].click();", checkboxes[0])
+        ticked += 1
+    if not ticked:
+        return 0
+
+    delete_button = driver.find_element(By.XPATH, DELETE_BUTTON_XPATH)
+    delete_button.click()
+    try:
+        WebDriverWait(driver, CONFIRM_DIALOG_TIMEOUT).until(EC.alert_is_present())
+        driver.switch_to.alert.accept()
+    except TimeoutException:
+        pass # No confirmation dialog
+    wait.until(EC.staleness_of(delete_button), field="alerted_table")
+    wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, scraper.ALERTED_ARTICLES_TABLE_SELECTOR)), field="alerted_table")
+    return len(article_ids) - len(remaining_alerts(driver.page_source, article_ids))
+
+
+# --- Main Execution ---
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Deletes the EvidenceAlerts alerts whose articles were exported to Supabase (per the article index)."
+    )
+    parser.add_argument("--mode", choices=PURGE_MODES, default=PURGE_MODE,
+                        help=f"'http' posts the listing form with the scraper's saved session; 'browser' ticks the rows in Chrome (default: {PURGE_MODE})")
+    parser.add_argument("--index", default=DEFAULT_INDEX_PATH, help=f"SQLite article index (default: {DEFAULT_INDEX_PATH})")
+    parser.add_argument("--cookie-jar", default=scraper.COOKIE_JAR_FILE, help=f"Saved login cookies, shared with the scraper's http mode (default: {scraper.COOKIE_JAR_FILE})")
+    parser.add_argument("--driver-profile", choices=scraper.DRIVER_PROFILES, default=scraper.DRIVER_PROFILE, help="Chrome profile of the browser mode and of the login fallback")
+    parser.add_argument("--dry-run", action="store_true", help="Only log which alerts would be deleted")
+    args = parser.parse_args()
+
+    driver = None
+    with ArticleIndex(args.index) as index:
+        try:
+            if args.mode == "http":
+                listing_html = scraper.open_http_session(args.cookie_jar, driver_profile=args.driver_profile)
+            else:
+                driver, wait = scraper.setup_driver(args.driver_profile)
+                listing_html = driver.page_source if scraper.perform_login(driver, wait) else None
+            if listing_html is None:
+                logger.critical("Login failed. No alert was deleted.")
+                return
+
+            article_ids, listed = select_exported_alerts(index, listing_html)
+            logger.info(f"{listed} alerts listed, {len(article_ids)} of them exported to Supabase.")
+            if not article_ids:
+                return
+            missing = missing_purge_controls(listing_html, article_ids)
+            if missing:
+                logger.critical(f"The alerted articles page does not match the purge selectors. Missing: {'; '.join(missing)}. "
+                                "No alert was deleted.")
+                sys.exit(1) # The finally below still closes the browser
+            if args.dry_run:
+                logger.info(f"[dry run] Would delete alerts: {', '.join(article_ids)}")
+                return
+
+            if args.mode == "http":
+                deleted = purge_alerts_http(scraper.get_http_session(), listing_html, article_ids)
+            else:
+                deleted = purge_alerts_browser(driver, wait, article_ids)
+            logger.info(f"Deleted {deleted} of {len(article_ids)} exported alerts.")
+            if deleted < len(article_ids):
+                logger.warning("Some exported alerts are still listed. They will be skipped by the scraper and retried next run.")
+        except WebDriverException as wde:
+            logger.error(f"WebDriver error while deleting alerts: {wde}")
+        finally:
+            if driver:
+                driver.quit()
+
+
+if __name__ == "__main__":
+    main()
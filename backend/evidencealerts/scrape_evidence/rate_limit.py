@@ -0,0 +1,130 @@
+import contextlib
+import threading
+import time
+from typing import Iterator, Optional
+
+# --- Configuration ---
+DEFAULT_BURST = 1 # Requests that may start back to back after an idle period
+DEFAULT_DECREASE_FACTOR = 0.5 # AIMD: the concurrency limit is halved when the API throttles us
+DEFAULT_DECREASE_INTERVAL_SECONDS = 1.0 # Throttling errors closer together than this count as one signal
+
+
+class TokenBucket:
+    """
+    Thread-safe token-bucket rate limiter: rate_per_minute tokens are added evenly over
+    each minute, up to `burst` saved tokens. acquire() reserves a token and sleeps until
+    it is available, so concurrent callers are served in arrival order and never exceed
+    the rate (plus the initial burst).
+    """
+
+    def __init__(self, rate_per_minute: float, burst: int = DEFAULT_BURST):
+        if rate_per_minute <= 0:
+            raise ValueError("rate_per_minute must be positive")
+        self.burst = max(1, burst)
+        self._rate = rate_per_minute / 60.0
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.waited_seconds = 0.0
+        self.acquired = 0
+
+    @property
+    def rate_per_minute(self) -> float:
+        return self._rate * 60.0
+
+    def set_rate(self, rate_per_minute: float):
+        """Changes the rate; tokens already saved are kept."""
+        if rate_per_minute <= 0:
+            raise ValueError("rate_per_minute must be positive")
+        with self._lock:
+            self._refill()
+            self._rate = rate_per_minute / 60.0
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(float(self.burst), self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    def acquire(self) -> float:
+        """Takes one token, waiting for it if needed. Returns the seconds waited."""
+        with self._lock:
+            self._refill()
+            # The balance may go negative: each caller reserves the next free slot
+            self._tokens -= 1
+            delay = -self._tokens / self._rate if self._tokens < 0 else 0.0
+            self.acquired += 1
+            self.waited_seconds += delay
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+
+class AimdLimiter:
+    """
+    Adaptive limit on concurrent calls (additive increase, multiplicative decrease), shared
+    by all workers. Each success raises the limit by `increase / limit` (so about `increase`
+    per window of `limit` calls), up to `maximum`; on_throttle() multiplies it by
+    `decrease_factor`, down to `minimum`, at most once per `decrease_interval` seconds (one
+    burst of throttling errors is one signal), and can pause every caller until the delay
+    the server asked for has passed.
+    """
+
+    def __init__(self, initial: float, maximum: float, minimum: float = 1, increase: float = 1.0,
+                 decrease_factor: float = DEFAULT_DECREASE_FACTOR, decrease_interval: float = DEFAULT_DECREASE_INTERVAL_SECONDS):
+        if not 1 <= minimum <= initial <= maximum:
+            raise ValueError("Expected 1 <= minimum <= initial <= maximum")
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.decrease_interval = decrease_interval
+        self._limit = float(initial)
+        self._in_flight = 0
+        self._paused_until = 0.0
+        self._last_decrease = float("-inf")
+        self._cond = threading.Condition()
+        self.throttled = 0
+        self.decreases = 0
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @contextlib.contextmanager
+    def slot(self) -> Iterator[None]:
+        """Waits until a call may start (under the limit, not paused), and holds its slot for the block."""
+        with self._cond:
+            while True:
+                pause = self._paused_until - time.monotonic()
+                if pause > 0:
+                    self._cond.wait(pause)
+                elif self._in_flight >= int(self._limit):
+                    self._cond.wait()
+                else:
+                    break
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._in_flight -= 1
+                self._cond.notify_all()
+
+    def on_success(self):
+        with self._cond:
+            previous = int(self._limit)
+            self._limit = min(self.maximum, self._limit + self.increase / self._limit)
+            if int(self._limit) > previous:
+                self._cond.notify_all()
+
+    def on_throttle(self, retry_after: Optional[float] = None):
+        """Records a throttling error (HTTP 429 / quota exhausted), with the server's retry delay if any."""
+        with self._cond:
+            self.throttled += 1
+            now = time.monotonic()
+            if now - self._last_decrease >= self.decrease_interval:
+                self._limit = max(self.minimum, self._limit * self.decrease_factor)
+                self._last_decrease = now
+                self.decreases += 1
+            if retry_after:
+                self._paused_until = max(self._paused_until, now + retry_after)
@@ -0,0 +1,81 @@
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional, Sequence
+
+# --- Configuration ---
+DEFAULT_MAX_WAIT_SECONDS = 2.0 # How long a partial batch waits for more items before it is sent anyway
+
+logger = logging.getLogger(__name__)
+
+
+class RequestBatcher:
+    """
+    Groups items submitted by concurrent threads into batches of up to batch_size, sent to
+    handler(items) -> results (one result per item, in order). A batch is sent as soon as it
+    is full, or max_wait seconds after its first item arrived. Batches run on their own
+    thread; submit() returns a Future of the item's result. If the handler raises, every
+    item of the batch gets the exception.
+    """
+
+    def __init__(self, handler: Callable[[List[Any]], Sequence[Any]], batch_size: int,
+                 max_wait: float = DEFAULT_MAX_WAIT_SECONDS, name: str = "batch"):
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.handler = handler
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self.name = name
+        self.batches_sent = 0
+        self.items_sent = 0
+        self._lock = threading.Lock()
+        self._items = [] # (item, future)
+        self._timer: Optional[threading.Timer] = None
+
+    def submit(self, item: Any) -> Future:
+        future = Future()
+        with self._lock:
+            self._items.append((item, future))
+            if len(self._items) >= self.batch_size:
+                batch = self._take()
+            else:
+                batch = None
+                if self._timer is None:
+                    self._timer = threading.Timer(self.max_wait, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+        if batch:
+            threading.Thread(target=self._run, args=(batch,), name=f"{self.name}-{self.batches_sent}", daemon=True).start()
+        return future
+
+    def flush(self):
+        """Sends the pending partial batch now (on the calling thread)."""
+        with self._lock:
+            batch = self._take()
+        if batch:
+            self._run(batch)
+
+    def _take(self):
+        """Detaches the pending items (lock held)."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._items = self._items, []
+        if batch:
+            self.batches_sent += 1
+            self.items_sent += len(batch)
+        return batch
+
+    def _run(self, batch):
+        items = [item for item, _ in batch]
+        try:
+            results = list(self.handler(items))
+            if len(results) != len(items):
+                raise ValueError(f"{self.name} handler returned {len(results)} results for {len(items)} items")
+        except Exception as e:
+            logger.error(f"{self.name} of {len(items)} items failed: {e}")
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
@@ -0,0 +1,204 @@
+import contextlib
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+# --- Configuration ---
+# Outside the data/links/summaries directories that the pipeline deletes
+DEFAULT_METRICS_DIR = "metrics"
+ARTICLE_LATENCY_QUANTILES = (0.5, 0.95)
+
+logger = logging.getLogger(__name__)
+
+
+def quantile(values: List[float], fraction: float) -> Optional[float]:
+    """Nearest-rank quantile of a list of values (None for an empty list)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, min(len(ordered), int(round(fraction * len(ordered) + 0.5))))
+    return ordered[rank - 1]
+
+
+def write_atomically(path: str, text: str):
+    """Writes a file through a temporary file + rename, so readers never see a partial file."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(temp_path, path)
+
+
+class RunMetrics:
+    """
+    Thread-safe timing spans and event counters for one run, aggregated per run and
+    per article. Spans and events recorded while an article is open (see article())
+    on the same thread are also attached to that article.
+    Exported as a JSON file and as a Prometheus textfile-collector file.
+    """
+
+    def __init__(self, prefix: str):
+        self.prefix = prefix
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.phases: Dict[str, Dict[str, float]] = {}
+        self.events: Dict[str, int] = {}
+        self.articles: List[Dict[str, Any]] = []
+
+    # --- Recording ---
+
+    def _current_article(self) -> Optional[Dict[str, Any]]:
+        return getattr(self._local, "article", None)
+
+    def add_span(self, phase: str, seconds: float):
+        with self._lock:
+            stats = self.phases.setdefault(phase, {"calls": 0, "seconds": 0.0, "max_seconds": 0.0})
+            stats["calls"] += 1
+            stats["seconds"] += seconds
+            stats["max_seconds"] = max(stats["max_seconds"], seconds)
+        article = self._current_article()
+        if article is not None:
+            article["phases"][phase] = round(article["phases"].get(phase, 0.0) + seconds, 4)
+
+    def count(self, event: str, amount: int = 1):
+        """Counts an event, e.g. 'fallback.pubmed_browser' or 'timeout.pubmed_doi'."""
+        with self._lock:
+            self.events[event] = self.events.get(event, 0) + amount
+        article = self._current_article()
+        if article is not None:
+            article["events"][event] = article["events"].get(event, 0) + amount
+
+    @contextlib.contextmanager
+    def span(self, phase: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_span(phase, time.perf_counter() - start)
+
+    def timed(self, phase: str) -> Callable:
+        """Decorator recording every call of the function as a span."""
+        def decorator(function: Callable) -> Callable:
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                with self.span(phase):
+                    return function(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    @contextlib.contextmanager
+    def article(self, url: str) -> Iterator[Dict[str, Any]]:
+        """
+        Opens the per-article record of this thread. The caller sets record['status'];
+        it stays 'failed' if the block raises.
+        """
+        record: Dict[str, Any] = {"url": url, "status": "failed", "phases": {}, "events": {}}
+        self._local.article = record
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record["seconds"] = round(time.perf_counter() - start, 4)
+            self._local.article = None
+            with self._lock:
+                self.articles.append(record)
+
+    # --- Export ---
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            articles = list(self.articles)
+            phases = {name: dict(stats) for name, stats in self.phases.items()}
+            events = dict(self.events)
+        durations = [article["seconds"] for article in articles]
+        statuses: Dict[str, int] = {}
+        for article in articles:
+            statuses[article["status"]] = statuses.get(article["status"], 0) + 1
+        run_seconds = time.perf_counter() - self._start
+        return {
+            "started_at": self.started_at,
+            "run_seconds": round(run_seconds, 3),
+            "articles": statuses,
+            "articles_per_minute": round(60 * statuses.get("scraped", 0) / run_seconds, 2) if run_seconds > 0 else None,
+            "article_seconds": {
+                "sum": round(sum(durations), 3),
+                "count": len(durations),
+                **{f"p{int(fraction * 100)}": quantile(durations, fraction) for fraction in ARTICLE_LATENCY_QUANTILES},
+            },
+            "phases": {
+                name: {"calls": stats["calls"], "seconds": round(stats["seconds"], 3),
+                       "max_seconds": round(stats["max_seconds"], 3)}
+                for name, stats in sorted(phases.items())
+            },
+            "events": dict(sorted(events.items())),
+        }
+
+    def write_json(self, path: str, extra: Optional[Dict[str, Any]] = None):
+        """Writes the run summary plus every per-article record."""
+        with self._lock:
+            articles = list(self.articles)
+        payload = {"run": self.summary(), "per_article": articles}
+        if extra:
+            payload.update(extra)
+        write_atomically(path, json.dumps(payload, ensure_ascii=False, indent=2))
+        logger.info(f"Run metrics written to {path}")
+
+    def write_prometheus(self, path: str):
+        """Writes the run aggregates in the Prometheus text exposition format (textfile collector)."""
+        summary = self.summary()
+        p = self.prefix
+        lines = [
+            f"# HELP {p}_last_run_timestamp_seconds Start time of the last run.",
+            f"# TYPE {p}_last_run_timestamp_seconds gauge",
+            f"{p}_last_run_timestamp_seconds {summary['started_at']:.0f}",
+            f"# HELP {p}_run_duration_seconds Wall-clock duration of the last run.",
+            f"# TYPE {p}_run_duration_seconds gauge",
+            f"{p}_run_duration_seconds {summary['run_seconds']}",
+            f"# HELP {p}_articles Articles of the last run, by outcome.",
+            f"# TYPE {p}_articles gauge",
+        ]
+        lines += [f'{p}_articles{{status="{status}"}} {count}' for status, count in sorted(summary["articles"].items())]
+        lines += [
+            f"# HELP {p}_article_seconds Per-article wall-clock time in the last run.",
+            f"# TYPE {p}_article_seconds summary",
+        ]
+        for fraction in ARTICLE_LATENCY_QUANTILES:
+            value = summary["article_seconds"][f"p{int(fraction * 100)}"]
+            lines.append(f'{p}_article_seconds{{quantile="{fraction}"}} {value if value is not None else "NaN"}')
+        lines += [
+            f"{p}_article_seconds_sum {summary['article_seconds']['sum']}",
+            f"{p}_article_seconds_count {summary['article_seconds']['count']}",
+            f"# HELP {p}_phase_seconds Time spent in each scraping phase in the last run.",
+            f"# TYPE {p}_phase_seconds gauge",
+        ]
+        lines += [f'{p}_phase_seconds{{phase="{name}"}} {stats["seconds"]}' for name, stats in summary["phases"].items()]
+        lines += [
+            f"# HELP {p}_phase_calls Calls of each scraping phase in the last run.",
+            f"# TYPE {p}_phase_calls gauge",
+        ]
+        lines += [f'{p}_phase_calls{{phase="{name}"}} {stats["calls"]}' for name, stats in summary["phases"].items()]
+        lines += [
+            f"# HELP {p}_events Timeouts, fallbacks and missing fields in the last run.",
+            f"# TYPE {p}_events gauge",
+        ]
+        lines += [f'{p}_events{{event="{name}"}} {count}' for name, count in summary["events"].items()]
+        write_atomically(path, "\n".join(lines) + "\n")
+        logger.info(f"Prometheus metrics written to {path}")
+
+    def log_summary(self):
+        summary = self.summary()
+        logger.info(f"Run metrics: {summary['articles']} in {summary['run_seconds']}s "
+                    f"({summary['articles_per_minute']} articles/min, p50 {summary['article_seconds']['p50']}s, "
+                    f"p95 {summary['article_seconds']['p95']}s)")
+        for name, stats in sorted(summary["phases"].items(), key=lambda item: item[1]["seconds"], reverse=True):
+            logger.info(f"  {name}: {stats['calls']} calls, {stats['seconds']}s")
+        if summary["events"]:
+            logger.info(f"  events: {summary['events']}")
@@ -1,20 +1,41 @@
+import argparse
+import contextlib
 import datetime
 import json
 import re
 import os
 import logging
+import queue
+import socket
+import sqlite3
+import tempfile
+import threading
 import time
-from typing import List, Dict, Optional, Any, Set
-
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Any, Set, Callable
+from urllib.parse import urljoin, urlparse
+
+import requests
+from bs4 import BeautifulSoup
+from bs4.builder import builder_registry
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from selenium import webdriver
 from selenium.webdriver.chrome.webdriver import WebDriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import (
-    NoSuchElementException, TimeoutException, WebDriverException, ElementClickInterceptedException
+    NoSuchElementException, TimeoutException, WebDriverException, ElementClickInterceptedException,
+    JavascriptException
 )
-from selenium.webdriver.remote.webelement import WebElement
+
+from article_index import ArticleIndex, DEFAULT_INDEX_PATH
+from jsonl_stream import JsonlWriter
+from page_archive import PageArchive, DEFAULT_ARCHIVE_DIR
+from pubmed_resolver import (PmidResolver, DEFAULT_PMID_CACHE_PATH, canonical_pubmed_link, extract_pmid,
+                             legacy_pubmed_link)
+from run_metrics import RunMetrics, DEFAULT_METRICS_DIR
 
 # --- Configuration ---
 LOGIN_URL = "https://www.evidencealerts.com/Account/Login?ReturnUrl=%2FArticles%2FAlerted"
@@ -28,9 +49,74 @@ OUTPUT_DIR_DATA = 'data'
 OUTPUT_DIR_SUMMARIES = 'summaries'
 # --- MODIFIED: Changed timestamp format ---
 TIMESTAMP_FORMAT = '%Y%m%d' # Changed format to YYYYMMDD
+# --from-archive writes here (in the dated data directory) instead of data.json, so it never mixes with a scrape
+ARCHIVE_DATA_FILENAME = "data_from_archive.json"
 
 # --- Selenium Configuration ---
 WEBDRIVER_WAIT_TIMEOUT = 45 # seconds
+# Bounded wait of the single-call DOM snapshots: a missing field costs at most this, not WEBDRIVER_WAIT_TIMEOUT
+DOM_SNAPSHOT_TIMEOUT = 5 # seconds
+
+# --- Wait Policy ---
+# WEBDRIVER_WAIT_TIMEOUT is only used for page-ready anchors (login form, alerted table, ArticleRecord).
+# Window switches get a medium budget; optional fields (DOI, journal, date, abstract, ratings...)
+# a short one. Every wait is also capped by what is left of the per-article deadline.
+NAVIGATION_WAIT_TIMEOUT = 15 # seconds
+OPTIONAL_FIELD_WAIT_TIMEOUT = 3 # seconds
+ARTICLE_DEADLINE = 120 # seconds, for everything done on one article
+PAGE_WAIT_FIELDS = {"login_form", "alerted_table", "article_record"}
+NAVIGATION_WAIT_FIELDS = {"pubmed_link", "pubmed_window", "return_window"}
+
+# --- Chrome Profile Configuration ---
+# 'light' (default): headless, 'eager' page loads (DOMContentLoaded, no waiting for subresources),
+# no images/media/fonts and only the hosts the scraper needs, with a persistent user-data-dir per
+# driver slot (HTTP cache and cookies survive across runs). 'legacy' is the plain webdriver.Chrome().
+DRIVER_PROFILES = ("light", "legacy")
+DRIVER_PROFILE = "light"
+CHROME_PROFILE_DIR = ".chrome_profiles" # One sub-directory per driver slot (main, worker-1, ...)
+CHROME_SINGLETON_FILES = ("SingletonLock", "SingletonSocket", "SingletonCookie")
+CHROME_WINDOW_SIZE = "1366,900"
+# Every other host resolves to nothing in the 'light' profile (analytics, ads, social widgets, CDNs...)
+ALLOWED_HOSTS = ("evidencealerts.com", "*.evidencealerts.com", "*.nih.gov", "doi.org", "localhost", "127.0.0.1")
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.mp3", "*.ogg", "*.wav",
+]
+
+# --- Parallel Scraping Configuration ---
+DEFAULT_WORKERS = 1 # Number of WebDriver instances processing articles in parallel
+WORKER_MAX_ATTEMPTS_PER_LINK = 2 # A link whose driver crashed is retried once (re-queued in the pool)
+
+# --- Driver Supervision ---
+# When a driver dies, it is torn down, relaunched and logged in again, then the loop resumes.
+# Each driver (the sequential one, or each pool worker) may be restarted at most DRIVER_MAX_RESTARTS
+# times, waiting DRIVER_RESTART_BACKOFF_BASE * 2^n seconds (capped) before the n-th restart.
+DRIVER_MAX_RESTARTS = 3
+DRIVER_RESTART_BACKOFF_BASE = 5 # seconds
+DRIVER_RESTART_BACKOFF_MAX = 60 # seconds
+# Only these keys are accepted by driver.add_cookie()
+SESSION_COOKIE_KEYS = ("name", "value", "path", "domain", "secure", "httpOnly", "expiry")
+
+# --- Scraping Mode Configuration ---
+# 'browser' drives Chrome for every page. 'http' only needs a login (form POST, or Selenium as a
+# fallback); the cookie jar is saved to disk and reused across runs, and the listing and article
+# pages are then fetched over HTTP and parsed with BeautifulSoup.
+SCRAPE_MODES = ("browser", "http")
+SCRAPE_MODE = "browser"
+DEFAULT_HTTP_WORKERS = 8 # Concurrent article fetches in 'http' mode
+COOKIE_JAR_FILE = ".evidencealerts_cookies.json"
+ALERTED_ARTICLES_URL = f"{BASE_URL}/Articles/Alerted"
+
+# --- HTTP Configuration (PubMed metadata fetch) ---
+# 'http' fetches the PubMed page through a pooled requests session and only falls back
+# to the browser (click + new window) when that fails. 'browser' keeps the old behaviour.
+PUBMED_FETCH_MODES = ("http", "browser")
+PUBMED_FETCH_MODE = "http"
+HTTP_TIMEOUT = 20 # seconds
+HTTP_POOL_SIZE = 10
+HTTP_MAX_RETRIES = 2
+HTTP_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
 
 # --- Selectors (Centralized for maintainability) ---
 # Login Page
@@ -44,11 +130,16 @@ ARTICLE_LINK_SELECTOR = "table.table-striped tr[id^='Article'] a[href^='/Article
 # Article Detail Page (EvidenceAlerts)
 ARTICLE_RECORD_DIV_ID = "ArticleRecord"
 PUBMED_LINK_XPATH = "//a[contains(@class, 'article-record-button') and contains(., 'View on PubMed')]"
+PUBMED_LINK_TEXT = "View on PubMed"
+PUBMED_LINK_CSS_SELECTOR = "a.article-record-button"
+ABSTRACT_HEADING_CSS_SELECTOR = f"div#{ARTICLE_RECORD_DIV_ID} div.panel-heading"
 ABSTRACT_PANEL_XPATH = "//div[@id='ArticleRecord']//div[contains(@class,'panel-heading') and contains(.,'Abstract')]/following-sibling::div[contains(@class,'panel-body')]"
 RATINGS_TABLE_ID = "SearchRatings"
 CATEGORY_ROW_XPATH = ".//tr[td[1] and not(contains(td[2]/text(), 'Coming Soon...')) and not(contains(td[3]/text(), 'Coming Soon...'))]"
 CATEGORY_ROW_FALLBACK_TAG = "tr"
 CATEGORY_CELL_TAG = "td"
+# Page sources are parsed with lxml when it is installed (much faster on the big listing page), else the stdlib parser
+HTML_PARSER = "lxml" if builder_registry.lookup("lxml") else "html.parser"
 # PubMed Page
 PUBMED_DOI_LINK_SELECTOR = "span.identifier.doi a.id-link"
 PUBMED_DOI_META_SELECTOR = 'meta[name="citation_doi"]'
@@ -57,6 +148,71 @@ PUBMED_JOURNAL_BUTTON_SELECTOR = "#full-view-journal-trigger"
 PUBMED_DATE_META_SELECTOR = 'meta[name="citation_date"]'
 PUBMED_TITLE_META_SELECTOR = 'meta[name="citation_title"]' # Added
 PUBMED_TITLE_H1_SELECTOR = "h1.heading-title"              # Added
+# Meta tags read in a single pass over the PubMed HTML (HTTP mode)
+PUBMED_CITATION_META_NAMES = ("citation_title", "citation_doi", "citation_journal_title", "citation_date", "citation_pmid")
+
+# --- DOM Snapshot Scripts ---
+# Each script runs in a single execute_async_script call: it polls until the document is
+# parsed and the page's anchor element exists (or the timeout in arguments[0] ms expires),
+# then returns every value we need as one JSON object. arguments[1] holds the selectors.
+DOM_SNAPSHOT_HELPERS_JS = """
+const done = arguments[arguments.length - 1];
+const deadline = Date.now() + arguments[0];
+const sel = arguments[1];
+const first = (selector) => selector ? document.querySelector(selector) : null;
+const meta = (name) => { const el = document.querySelector('meta[name="' + name + '"]'); return el ? (el.getAttribute('content') || '').trim() : null; };
+const text = (el) => el ? (el.innerText || el.textContent || '').trim() : null;
+const byXPath = (xpath) => document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+"""
+PUBMED_SNAPSHOT_JS = DOM_SNAPSHOT_HELPERS_JS + """
+(function poll() {
+  const ready = document.readyState !== 'loading' && (meta('citation_title') !== null || first(sel.title_h1));
+  if (!ready && Date.now() < deadline) { setTimeout(poll, 50); return; }
+  done({
+    ready: !!ready,
+    meta_title: meta('citation_title'),
+    h1_title: text(first(sel.title_h1)),
+    doi_link: text(first(sel.doi_link)),
+    meta_doi: meta('citation_doi'),
+    meta_journal: meta('citation_journal_title'),
+    journal_button: text(first(sel.journal_button)),
+    meta_date: meta('citation_date'),
+    meta_pmid: meta('citation_pmid'),
+  });
+})();
+"""
+ARTICLE_SNAPSHOT_JS = DOM_SNAPSHOT_HELPERS_JS + """
+(function poll() {
+  const ready = document.readyState !== 'loading' && document.getElementById(sel.record_id);
+  if (!ready && Date.now() < deadline) { setTimeout(poll, 50); return; }
+  const pubmedLink = byXPath(sel.pubmed_link_xpath);
+  const ratingsTable = document.getElementById(sel.ratings_id);
+  const ratingRows = [];
+  if (ratingsTable) {
+    for (const row of ratingsTable.querySelectorAll('tr')) {
+      const cells = Array.from(row.children).filter((cell) => cell.tagName === 'TD').map(text);
+      if (cells.length) ratingRows.push(cells);
+    }
+  }
+  done({
+    ready: !!ready,
+    pubmed_href: pubmedLink ? pubmedLink.href : null,
+    abstract: text(byXPath(sel.abstract_xpath)),
+    rating_rows: ratingRows,
+  });
+})();
+"""
+PUBMED_SNAPSHOT_SELECTORS = {
+    "title_h1": PUBMED_TITLE_H1_SELECTOR,
+    "doi_link": PUBMED_DOI_LINK_SELECTOR,
+    "journal_button": PUBMED_JOURNAL_BUTTON_SELECTOR,
+}
+ARTICLE_SNAPSHOT_SELECTORS = {
+    "record_id": ARTICLE_RECORD_DIV_ID,
+    "pubmed_link_xpath": PUBMED_LINK_XPATH,
+    "abstract_xpath": ABSTRACT_PANEL_XPATH,
+    "ratings_id": RATINGS_TABLE_ID,
+}
 
 # --- Category Mapping ---
 CATEGORY_MAP: Dict[str, str] = {
@@ -138,10 +294,119 @@ CATEGORY_MAP: Dict[str, str] = {
 
 # --- Logging Setup ---
 logging.basicConfig(level=logging.INFO,
-                    format='%(asctime)s - %(levelname)s - %(message)s',
+                    format='%(asctime)s - %(levelname)s - [%(threadName)s] - %(message)s',
                     datefmt='%Y-%m-%d %H:%M:%S')
 logger = logging.getLogger(__name__)
 
+# --- Wait Policy ---
+
+class ArticleDeadlineExceeded(TimeoutException):
+    """Raised instead of waiting once the per-article deadline is spent."""
+
+class WaitPolicy:
+    """Timeout budgets per kind of wait, plus the overall per-article deadline."""
+
+    def __init__(self, page_timeout: float = WEBDRIVER_WAIT_TIMEOUT, navigation_timeout: float = NAVIGATION_WAIT_TIMEOUT,
+                 field_timeout: float = OPTIONAL_FIELD_WAIT_TIMEOUT, snapshot_timeout: float = DOM_SNAPSHOT_TIMEOUT,
+                 article_deadline: float = ARTICLE_DEADLINE):
+        self.page_timeout = page_timeout
+        self.navigation_timeout = navigation_timeout
+        self.field_timeout = field_timeout
+        self.snapshot_timeout = snapshot_timeout
+        self.article_deadline = article_deadline
+
+    def budget_for(self, field: str) -> float:
+        if field == "page" or field in PAGE_WAIT_FIELDS:
+            return self.page_timeout
+        if field in NAVIGATION_WAIT_FIELDS:
+            return self.navigation_timeout
+        if field == "snapshot":
+            return self.snapshot_timeout
+        return self.field_timeout
+
+class WaitStats:
+    """Thread-safe counters of the time each run lost to timeouts, per waited-for field."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.timeouts: Dict[str, int] = {}
+        self.seconds_lost: Dict[str, float] = {}
+        self.articles_over_deadline = 0
+
+    def record_timeout(self, field: str, seconds: float):
+        with self._lock:
+            self.timeouts[field] = self.timeouts.get(field, 0) + 1
+            self.seconds_lost[field] = self.seconds_lost.get(field, 0.0) + seconds
+        RUN_METRICS.count(f"timeout.{field}")
+
+    def record_deadline_exceeded(self):
+        with self._lock:
+            self.articles_over_deadline += 1
+        RUN_METRICS.count("deadline_exceeded")
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "timeouts": dict(self.timeouts),
+                "seconds_lost": {field: round(seconds, 3) for field, seconds in self.seconds_lost.items()},
+                "articles_over_deadline": self.articles_over_deadline,
+            }
+
+    def log_summary(self):
+        with self._lock:
+            total_lost = sum(self.seconds_lost.values())
+            logger.info(f"Wait policy: {sum(self.timeouts.values())} timeouts, {total_lost:.1f}s lost waiting, "
+                        f"{self.articles_over_deadline} articles hit the per-article deadline.")
+            for field in sorted(self.seconds_lost, key=self.seconds_lost.get, reverse=True):
+                logger.info(f"  {field}: {self.timeouts[field]} timeouts, {self.seconds_lost[field]:.1f}s lost")
+
+WAIT_POLICY = WaitPolicy()
+WAIT_STATS = WaitStats()
+# Timing spans (login, links, PubMed, abstract, categories...) and timeout/fallback/missing-field counters
+RUN_METRICS = RunMetrics("evidencealerts_scrape")
+
+class BudgetedWait(WebDriverWait):
+    """
+    WebDriverWait whose until() takes the name of what it waits for: the timeout comes
+    from WAIT_POLICY (capped by the remaining per-article deadline) and timeouts are
+    counted in WAIT_STATS.
+    """
+
+    def __init__(self, driver: WebDriver, policy: WaitPolicy = WAIT_POLICY, stats: WaitStats = WAIT_STATS):
+        super().__init__(driver, policy.page_timeout)
+        self.driver = driver
+        self.policy = policy
+        self.stats = stats
+        self.deadline: Optional[float] = None
+
+    def start_article(self):
+        self.deadline = time.monotonic() + self.policy.article_deadline
+
+    def end_article(self):
+        self.deadline = None
+
+    def deadline_exceeded(self) -> bool:
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def budget(self, field: str) -> float:
+        """Timeout for this field, capped by the per-article deadline (raises once it is spent)."""
+        timeout = self.policy.budget_for(field)
+        if self.deadline is not None:
+            remaining = self.deadline - time.monotonic()
+            if remaining <= 0:
+                raise ArticleDeadlineExceeded(f"Per-article deadline spent before waiting for '{field}'")
+            timeout = min(timeout, remaining)
+        return timeout
+
+    def until(self, method, message: str = "", field: str = "page"):
+        timeout = self.budget(field)
+        start = time.monotonic()
+        try:
+            return WebDriverWait(self.driver, timeout).until(method, message)
+        except TimeoutException:
+            self.stats.record_timeout(field, time.monotonic() - start)
+            raise
+
 # --- Helper Functions ---
 
 # --- MODIFIED: Create date-specific subdirectories ---
@@ -170,21 +435,96 @@ def get_output_filenames() -> (str, str):
     logger.info(f"Data filename set to: {data_filename}")
     return links_filename, data_filename
 
-def setup_driver() -> (WebDriver, WebDriverWait):
-    """Initializes and returns the WebDriver and WebDriverWait."""
-    logger.info("Initializing Chrome WebDriver...")
-    driver = webdriver.Chrome()
-    wait = WebDriverWait(driver, WEBDRIVER_WAIT_TIMEOUT)
+def chrome_profile_in_use(user_data_dir: str) -> bool:
+    """
+    Whether a live Chrome holds user_data_dir. Chrome's SingletonLock is a symlink to
+    '<hostname>-<pid>': the lock is stale only if that host is this one and the PID is gone.
+    A lock of another host, or one that cannot be read, counts as in use.
+    """
+    lock_path = os.path.join(user_data_dir, "SingletonLock")
+    if not os.path.lexists(lock_path):
+        return False
+    try:
+        host, _, pid = os.readlink(lock_path).rpartition("-")
+        pid = int(pid)
+    except (OSError, ValueError):
+        return True
+    if host != socket.gethostname():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True # Alive, owned by another user
+    return True
+
+def build_light_chrome_options(profile_name: str) -> webdriver.ChromeOptions:
+    """
+    Chrome options of the 'light' profile, using a persistent user-data-dir for this driver slot.
+    If a running Chrome still holds that directory, a fresh temporary one is used instead.
+    """
+    user_data_dir = os.path.abspath(os.path.join(CHROME_PROFILE_DIR, profile_name))
+    os.makedirs(user_data_dir, exist_ok=True)
+    if chrome_profile_in_use(user_data_dir):
+        user_data_dir = tempfile.mkdtemp(prefix=f"evidencealerts-chrome-{profile_name}-")
+        logger.warning(f"Chrome profile '{profile_name}' is in use by another Chrome. Using a fresh profile in {user_data_dir}.")
+    else:
+        # Locks left behind by a crashed Chrome would prevent it from reusing the directory
+        for lock_name in CHROME_SINGLETON_FILES:
+            lock_path = os.path.join(user_data_dir, lock_name)
+            if os.path.lexists(lock_path):
+                os.remove(lock_path)
+
+    options = webdriver.ChromeOptions()
+    options.page_load_strategy = "eager"
+    options.add_argument("--headless=new")
+    options.add_argument(f"--window-size={CHROME_WINDOW_SIZE}")
+    options.add_argument(f"--user-data-dir={user_data_dir}")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-extensions")
+    options.add_argument("--disable-background-networking")
+    options.add_argument("--no-first-run")
+    options.add_argument("--mute-audio")
+    excluded_hosts = ", ".join(f"EXCLUDE {host}" for host in ALLOWED_HOSTS)
+    options.add_argument(f"--host-resolver-rules=MAP * ~NOTFOUND, {excluded_hosts}")
+    options.add_experimental_option("prefs", {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.default_content_setting_values.notifications": 2,
+    })
+    return options
+
+def setup_driver(driver_profile: str = DRIVER_PROFILE, profile_name: Optional[str] = None) -> (WebDriver, BudgetedWait):
+    """
+    Initializes and returns the WebDriver and its (wait-policy aware) WebDriverWait.
+    With the 'light' profile, profile_name selects the persistent user-data-dir (defaults to the
+    thread name, so concurrent drivers never share a directory).
+    """
+    logger.info(f"Initializing Chrome WebDriver ({driver_profile} profile)...")
+    if driver_profile == "legacy":
+        driver = webdriver.Chrome()
+    else:
+        profile_name = profile_name or threading.current_thread().name.lower()
+        driver = webdriver.Chrome(options=build_light_chrome_options(profile_name))
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+        except WebDriverException as cdp_err:
+            logger.warning(f"Could not block media requests through CDP: {cdp_err}")
+    driver.set_script_timeout(WAIT_POLICY.snapshot_timeout + 5)
+    wait = BudgetedWait(driver)
     logger.info("WebDriver initialized.")
     return driver, wait
 
+@RUN_METRICS.timed("login")
 def perform_login(driver: WebDriver, wait: WebDriverWait) -> bool:
     """Logs into the EvidenceAlerts website."""
     logger.info(f"Navigating to login page: {LOGIN_URL}")
     try:
         driver.get(LOGIN_URL)
         logger.info("Waiting for login form...")
-        login_form = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, LOGIN_FORM_SELECTOR)))
+        login_form = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, LOGIN_FORM_SELECTOR)), field="login_form")
         logger.info("Login form found.")
 
         email_field = login_form.find_element(By.ID, EMAIL_FIELD_ID)
@@ -199,7 +539,7 @@ def perform_login(driver: WebDriver, wait: WebDriverWait) -> bool:
         login_button.click()
 
         logger.info("Login submitted. Waiting for alerted articles table...")
-        wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, ALERTED_ARTICLES_TABLE_SELECTOR)))
+        wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, ALERTED_ARTICLES_TABLE_SELECTOR)), field="alerted_table")
         logger.info("Login successful and alerted articles page loaded!")
         return True
     except TimeoutException:
@@ -215,36 +555,23 @@ def perform_login(driver: WebDriver, wait: WebDriverWait) -> bool:
         logger.error(f"An unexpected error occurred during login: {e}")
         return False
 
+@RUN_METRICS.timed("extract_article_links")
 def extract_article_links(driver: WebDriver) -> List[str]:
-    """Finds and extracts unique article links from the alerted articles page."""
+    """
+    Finds and extracts unique article links from the alerted articles page.
+    The page source is fetched once and parsed locally instead of reading every href over WebDriver.
+    """
     logger.info("Finding article links...")
-    article_links = []
-    processed_links = set()
     try:
-        article_link_elements = driver.find_elements(By.CSS_SELECTOR, ARTICLE_LINK_SELECTOR)
-        if not article_link_elements:
-            logger.warning("No article link elements found using the selector.")
-            return []
-
-        logger.info(f"Found {len(article_link_elements)} potential article link elements.")
-        for link_element in article_link_elements:
-            try:
-                relative_link = link_element.get_attribute('href')
-                if relative_link and relative_link not in processed_links:
-                    full_link = BASE_URL + relative_link if not relative_link.startswith('http') else relative_link
-                    article_links.append(full_link)
-                    processed_links.add(relative_link)
-            except Exception as link_err:
-                logger.warning(f"  Error extracting href from an element: {link_err}")
-
-        logger.info(f"Successfully extracted {len(article_links)} unique article links.")
-        return article_links
-    except NoSuchElementException:
-        logger.warning("Could not find article link elements on the page.")
-        return []
+        article_links = parse_article_links_html(driver.page_source)
     except Exception as e:
         logger.error(f"An error occurred during link extraction: {e}")
         return []
+    if not article_links:
+        logger.warning("No article link elements found using the selector.")
+        return []
+    logger.info(f"Successfully extracted {len(article_links)} unique article links.")
+    return article_links
 
 # No change needed here, it accepts the full filename path
 def save_links_to_file(links: List[str], filename: str):
@@ -263,9 +590,68 @@ def save_links_to_file(links: List[str], filename: str):
     except IOError as io_err:
         logger.error(f"Error saving links to file {filename}: {io_err}")
 
+def take_dom_snapshot(driver: WebDriver, script: str, selectors: Dict[str, str],
+                      timeout: float = DOM_SNAPSHOT_TIMEOUT) -> Optional[Dict[str, Any]]:
+    """
+    Runs a DOM snapshot script in one WebDriver round trip.
+    Returns its result, or None if the script itself failed (the caller then falls back
+    to per-element waits). A page that never became ready still returns the partial snapshot.
+    """
+    try:
+        snapshot = driver.execute_async_script(script, int(timeout * 1000), selectors)
+    except TimeoutException:
+        logger.warning("      DOM snapshot script timed out.")
+        return None
+    except JavascriptException as script_err:
+        logger.warning(f"      DOM snapshot script failed: {script_err}")
+        return None
+    if not isinstance(snapshot, dict):
+        logger.warning(f"      Unexpected DOM snapshot result: {snapshot!r}")
+        return None
+    if not snapshot.get("ready"):
+        logger.warning(f"      Page was not ready after {timeout:.1f}s; using partial DOM snapshot.")
+        RUN_METRICS.count("snapshot_not_ready")
+        WAIT_STATS.record_timeout("snapshot", timeout)
+    return snapshot
+
 def extract_data_from_pubmed(driver: WebDriver, wait: WebDriverWait) -> Dict[str, Optional[str]]:
     """
-    Extracts DOI, Journal Name, Publication Date, and Title from the PubMed page.
+    Extracts DOI, Journal Name, Publication Date, and Title from the PubMed page with a
+    single DOM snapshot (meta tags, H1, DOI link and journal button at once).
+    Falls back to per-field waits if the snapshot script fails.
+    Assumes the driver is currently focused on the PubMed window/tab.
+    """
+    logger.info("    Attempting to extract data from PubMed page (DOM snapshot)...")
+    try:
+        timeout = wait.budget("snapshot")
+    except ArticleDeadlineExceeded as deadline_err:
+        logger.warning(f"      {deadline_err}")
+        return {"doi": None, "journal": None, "published_at": None, "title": None}
+    snapshot = take_dom_snapshot(driver, PUBMED_SNAPSHOT_JS, PUBMED_SNAPSHOT_SELECTORS, timeout=timeout)
+    archive_browser_page(driver, "pubmed")
+    if snapshot is None:
+        RUN_METRICS.count("fallback.pubmed_field_waits")
+        return extract_data_from_pubmed_waits(driver, wait)
+
+    pubmed_data = {
+        "doi": snapshot.get("doi_link") or snapshot.get("meta_doi") or None,
+        "journal": snapshot.get("meta_journal") or snapshot.get("journal_button") or None,
+        "published_at": snapshot.get("meta_date") or None,
+        "title": snapshot.get("meta_title") or snapshot.get("h1_title") or None,
+    }
+    for field, value in pubmed_data.items():
+        if value:
+            logger.info(f"      {field} extracted from PubMed page: {value[:50]}")
+        else:
+            logger.warning(f"      {field} not found on PubMed page.")
+    # Not required: lets the canonical /<pmid>/ link be built without a DOI lookup
+    pubmed_data["pmid"] = snapshot.get("meta_pmid") or extract_pmid(driver.current_url)
+    return pubmed_data
+
+def extract_data_from_pubmed_waits(driver: WebDriver, wait: WebDriverWait) -> Dict[str, Optional[str]]:
+    """
+    Extracts DOI, Journal Name, Publication Date, and Title from the PubMed page,
+    waiting for each field separately (fallback when the DOM snapshot is unavailable).
     Assumes the driver is currently focused on the PubMed window/tab.
     """
     pubmed_data = {"doi": None, "journal": None, "published_at": None, "title": None}
@@ -273,7 +659,7 @@ def extract_data_from_pubmed(driver: WebDriver, wait: WebDriverWait) -> Dict[str
 
     # ---- Extract Title ----
     try:
-        title_meta = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, PUBMED_TITLE_META_SELECTOR)))
+        title_meta = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, PUBMED_TITLE_META_SELECTOR)), field="pubmed_title")
         title_content = title_meta.get_attribute('content').strip()
         if title_content:
             pubmed_data["title"] = title_content
@@ -284,8 +670,8 @@ def extract_data_from_pubmed(driver: WebDriver, wait: WebDriverWait) -> Dict[str
     except (NoSuchElementException, TimeoutException):
         logger.info("      Title meta tag not found or empty. Trying H1 tag (fallback)...")
         try:
-            title_h1 = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, PUBMED_TITLE_H1_SELECTOR)))
-            wait.until(lambda d: title_h1.text.strip() != "") # Wait for text to be non-empty
+            title_h1 = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, PUBMED_TITLE_H1_SELECTOR)), field="pubmed_title")
+            wait.until(lambda d: title_h1.text.strip() != "", field="pubmed_title") # Wait for text to be non-empty
             pubmed_data["title"] = title_h1.text.strip()
             if pubmed_data["title"]:
                 logger.info(f"      Title extracted from PubMed H1 tag (fallback): {pubmed_data['title'][:50]}...") # Log truncated title
@@ -301,14 +687,14 @@ def extract_data_from_pubmed(driver: WebDriver, wait: WebDriverWait) -> Dict[str
 
     # ---- Extract DOI ----
     try:
-        doi_element = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, PUBMED_DOI_LINK_SELECTOR)))
-        wait.until(lambda d: doi_element.text.strip() != "") # Wait for text to be non-empty
+        doi_element = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, PUBMED_DOI_LINK_SELECTOR)), field="pubmed_doi")
+        wait.until(lambda d: doi_element.text.strip() != "", field="pubmed_doi") # Wait for text to be non-empty
         pubmed_data["doi"] = doi_element.text.strip()
         logger.info(f"      DOI extracted from PubMed link: {pubmed_data['doi']}")
     except (NoSuchElementException, TimeoutException):
         logger.info("      DOI link element not found or timed out. Trying DOI meta tag...")
         try:
-            meta_doi = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, PUBMED_DOI_META_SELECTOR)))
+            meta_doi = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, PUBMED_DOI_META_SELECTOR)), field="pubmed_doi")
             pubmed_data["doi"] = meta_doi.get_attribute('content').strip()
             if pubmed_data["doi"]:
                 logger.info(f"      DOI extracted from PubMed meta tag (fallback): {pubmed_data['doi']}")
@@ -323,14 +709,14 @@ def extract_data_from_pubmed(driver: WebDriver, wait: WebDriverWait) -> Dict[str
 
     # ---- Extract Journal Name ----
     try:
-        journal_meta = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, PUBMED_JOURNAL_META_SELECTOR)))
+        journal_meta = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, PUBMED_JOURNAL_META_SELECTOR)), field="pubmed_journal")
         pubmed_data["journal"] = journal_meta.get_attribute('content').strip()
         if pubmed_data["journal"]:
             logger.info(f"      Journal extracted from PubMed meta tag: {pubmed_data['journal']}")
         else:
             logger.warning("      Journal meta tag found but content is empty. Trying button...")
             try:
-                journal_button = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, PUBMED_JOURNAL_BUTTON_SELECTOR)))
+                journal_button = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, PUBMED_JOURNAL_BUTTON_SELECTOR)), field="pubmed_journal")
                 pubmed_data["journal"] = journal_button.text.strip()
                 logger.info(f"      Journal extracted from PubMed button (fallback): {pubmed_data['journal']}")
             except (NoSuchElementException, TimeoutException):
@@ -338,7 +724,7 @@ def extract_data_from_pubmed(driver: WebDriver, wait: WebDriverWait) -> Dict[str
     except (NoSuchElementException, TimeoutException):
         logger.info("      Journal meta tag not found on PubMed page. Trying button...")
         try:
-            journal_button = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, PUBMED_JOURNAL_BUTTON_SELECTOR)))
+            journal_button = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, PUBMED_JOURNAL_BUTTON_SELECTOR)), field="pubmed_journal")
             pubmed_data["journal"] = journal_button.text.strip()
             logger.info(f"      Journal extracted from PubMed button (fallback): {pubmed_data['journal']}")
         except (NoSuchElementException, TimeoutException):
@@ -348,7 +734,7 @@ def extract_data_from_pubmed(driver: WebDriver, wait: WebDriverWait) -> Dict[str
 
     # ---- Extract Publication Date ----
     try:
-        published_at_meta = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, PUBMED_DATE_META_SELECTOR)))
+        published_at_meta = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, PUBMED_DATE_META_SELECTOR)), field="pubmed_date")
         pubmed_data["published_at"] = published_at_meta.get_attribute('content').strip()
         if pubmed_data["published_at"]:
             logger.info(f"      Published At date extracted from PubMed meta tag: {pubmed_data['published_at']}")
@@ -361,7 +747,130 @@ def extract_data_from_pubmed(driver: WebDriver, wait: WebDriverWait) -> Dict[str
 
     return pubmed_data
 
-def process_pubmed_interaction(driver: WebDriver, wait: WebDriverWait) -> Dict[str, Optional[str]]:
+# --- HTTP PubMed Fetch ---
+_http_session: Optional[requests.Session] = None
+
+def get_http_session() -> requests.Session:
+    """Returns the shared, connection-pooled requests session (created on first use)."""
+    global _http_session
+    if _http_session is None:
+        session = requests.Session()
+        retry = Retry(total=HTTP_MAX_RETRIES, backoff_factor=0.5,
+                      status_forcelist=(429, 500, 502, 503, 504), allowed_methods=("GET",))
+        adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE, max_retries=retry)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update({"User-Agent": HTTP_USER_AGENT})
+        _http_session = session
+    return _http_session
+
+def parse_pubmed_html(html: str) -> Dict[str, Optional[str]]:
+    """
+    Extracts Title, DOI, Journal Name, Publication Date and PMID from PubMed HTML.
+    The citation_* meta tags are collected in a single pass; the H1 title, DOI link
+    and journal button are only looked up when the corresponding meta tag is missing.
+    """
+    pubmed_data = {"doi": None, "journal": None, "published_at": None, "title": None, "pmid": None}
+    soup = BeautifulSoup(html, HTML_PARSER)
+
+    meta_values: Dict[str, str] = {}
+    for meta_tag in soup.find_all('meta'):
+        name = meta_tag.get('name')
+        content = (meta_tag.get('content') or '').strip()
+        if name in PUBMED_CITATION_META_NAMES and content and name not in meta_values:
+            meta_values[name] = content
+
+    pubmed_data["title"] = meta_values.get("citation_title")
+    pubmed_data["doi"] = meta_values.get("citation_doi")
+    pubmed_data["journal"] = meta_values.get("citation_journal_title")
+    pubmed_data["published_at"] = meta_values.get("citation_date")
+    pubmed_data["pmid"] = meta_values.get("citation_pmid")
+
+    if not pubmed_data["title"]:
+        title_h1 = soup.select_one(PUBMED_TITLE_H1_SELECTOR)
+        if title_h1 and title_h1.get_text(strip=True):
+            pubmed_data["title"] = title_h1.get_text(" ", strip=True)
+    if not pubmed_data["doi"]:
+        doi_link = soup.select_one(PUBMED_DOI_LINK_SELECTOR)
+        if doi_link and doi_link.get_text(strip=True):
+            pubmed_data["doi"] = doi_link.get_text(strip=True)
+    if not pubmed_data["journal"]:
+        journal_button = soup.select_one(PUBMED_JOURNAL_BUTTON_SELECTOR)
+        if journal_button and journal_button.get_text(strip=True):
+            pubmed_data["journal"] = journal_button.get_text(strip=True)
+
+    return pubmed_data
+
+def fetch_pubmed_data_http(pubmed_url: str, cookies: Optional[Dict[str, str]] = None,
+                           timeout: float = HTTP_TIMEOUT) -> Optional[Dict[str, Optional[str]]]:
+    """
+    Fetches the PubMed page over the pooled HTTP session and parses its metadata.
+    Returns None when the fetch fails or the page does not look like a PubMed article
+    (e.g. a login or search results page), so the caller can fall back to the browser.
+    """
+    logger.info(f"    Fetching PubMed page over HTTP: {pubmed_url}")
+    try:
+        response = get_http_session().get(pubmed_url, cookies=cookies, timeout=timeout)
+        response.raise_for_status()
+    except requests.exceptions.RequestException as req_err:
+        logger.warning(f"    HTTP fetch of PubMed page failed: {req_err}")
+        return None
+    archive_page("pubmed", response.text, url=response.url)
+
+    try:
+        pubmed_data = parse_pubmed_html(response.text)
+    except Exception as parse_err:
+        logger.warning(f"    Could not parse PubMed HTML from {response.url}: {parse_err}")
+        return None
+
+    if not pubmed_data["title"] and not pubmed_data["doi"]:
+        logger.warning(f"    No title or DOI found in HTTP response from {response.url}. Not a PubMed article page?")
+        return None
+    pubmed_data["pmid"] = pubmed_data["pmid"] or extract_pmid(response.url)
+
+    logger.info(f"    PubMed data extracted over HTTP (title: {(pubmed_data['title'] or '')[:50]}..., DOI: {pubmed_data['doi']})")
+    return pubmed_data
+
+@RUN_METRICS.timed("pubmed")
+def process_pubmed_interaction(driver: WebDriver, wait: WebDriverWait, fetch_mode: str = PUBMED_FETCH_MODE,
+                               pubmed_href: Optional[str] = None) -> Dict[str, Optional[str]]:
+    """
+    Retrieves the PubMed metadata linked from the current EvidenceAlerts article page.
+    In 'http' mode the link's href (taken from the page snapshot when given) is fetched
+    directly over HTTP; the browser flow (clicking the PubMed link, switching windows,
+    extracting data, and returning to the original window) is only used when that fails
+    or in 'browser' mode.
+    Returns a dictionary with 'doi', 'journal', 'published_at', 'title' or None values.
+    """
+    if fetch_mode == "http":
+        if not pubmed_href:
+            try:
+                pubmed_link_element = wait.until(EC.presence_of_element_located((By.XPATH, PUBMED_LINK_XPATH)), field="pubmed_link")
+                pubmed_href = pubmed_link_element.get_attribute('href')
+            except (NoSuchElementException, TimeoutException) as e:
+                logger.warning(f"    'View on PubMed' link not found: {e}")
+                return {"doi": None, "journal": None, "published_at": None, "title": None}
+
+        if pubmed_href:
+            pubmed_url = urljoin(BASE_URL, pubmed_href)
+            cookies = None
+            if urlparse(pubmed_url).netloc.endswith("evidencealerts.com"):
+                # The link goes through an EvidenceAlerts redirect: it needs the logged-in session.
+                cookies = {cookie['name']: cookie['value'] for cookie in driver.get_cookies()}
+            try:
+                timeout = min(HTTP_TIMEOUT, wait.budget("pubmed_http"))
+            except ArticleDeadlineExceeded as deadline_err:
+                logger.warning(f"    {deadline_err}")
+                return {"doi": None, "journal": None, "published_at": None, "title": None}
+            pubmed_data = fetch_pubmed_data_http(pubmed_url, cookies=cookies, timeout=timeout)
+            if pubmed_data:
+                return pubmed_data
+        logger.info("    Falling back to browser for PubMed data.")
+        RUN_METRICS.count("fallback.pubmed_browser")
+
+    return process_pubmed_interaction_browser(driver, wait)
+
+def process_pubmed_interaction_browser(driver: WebDriver, wait: WebDriverWait) -> Dict[str, Optional[str]]:
     """
     Handles clicking the PubMed link, switching windows, extracting data,
     and returning to the original window.
@@ -372,7 +881,7 @@ def process_pubmed_interaction(driver: WebDriver, wait: WebDriverWait) -> Dict[s
     pubmed_data = {"doi": None, "journal": None, "published_at": None, "title": None}
 
     try:
-        pubmed_link_element = wait.until(EC.element_to_be_clickable((By.XPATH, PUBMED_LINK_XPATH)))
+        pubmed_link_element = wait.until(EC.element_to_be_clickable((By.XPATH, PUBMED_LINK_XPATH)), field="pubmed_link")
         logger.info("    Found PubMed link element.")
         try:
             driver.execute_script("arguments[0].scrollIntoView(true);", pubmed_link_element)
@@ -384,7 +893,7 @@ def process_pubmed_interaction(driver: WebDriver, wait: WebDriverWait) -> Dict[s
 
         logger.info("    Clicked PubMed link.")
 
-        wait.until(EC.number_of_windows_to_be(initial_window_count + 1))
+        wait.until(EC.number_of_windows_to_be(initial_window_count + 1), field="pubmed_window")
         logger.info(f"    Window count increased to {len(driver.window_handles)}.")
 
         new_window = None
@@ -403,8 +912,8 @@ def process_pubmed_interaction(driver: WebDriver, wait: WebDriverWait) -> Dict[s
                 driver.close()
                 driver.switch_to.window(original_window)
                 logger.info("    Switched back to EvidenceAlerts window.")
-                wait.until(EC.number_of_windows_to_be(initial_window_count))
-                wait.until(EC.url_contains("evidencealerts.com"))
+                wait.until(EC.number_of_windows_to_be(initial_window_count), field="return_window")
+                wait.until(EC.url_contains("evidencealerts.com"), field="return_window")
                 logger.info(f"    Successfully returned to: {driver.current_url}")
         else:
             logger.warning("    Could not identify the new PubMed window handle.")
@@ -441,11 +950,12 @@ def process_pubmed_interaction(driver: WebDriver, wait: WebDriverWait) -> Dict[s
 
     return pubmed_data
 
+@RUN_METRICS.timed("abstract")
 def extract_abstract(driver: WebDriver, wait: WebDriverWait) -> Optional[str]:
     """Extracts the abstract text from the EvidenceAlerts article page."""
     logger.info("    Extracting abstract from EvidenceAlerts page...")
     try:
-         abstract_element = wait.until(EC.presence_of_element_located((By.XPATH, ABSTRACT_PANEL_XPATH)))
+         abstract_element = wait.until(EC.presence_of_element_located((By.XPATH, ABSTRACT_PANEL_XPATH)), field="abstract")
          abstract = abstract_element.text.strip()
          logger.info(f"      Abstract extracted (length: {len(abstract)}).")
          return abstract
@@ -456,122 +966,185 @@ def extract_abstract(driver: WebDriver, wait: WebDriverWait) -> Optional[str]:
          logger.error(f"      Error extracting abstract: {abstract_err}")
          return None
 
+@RUN_METRICS.timed("categories")
 def extract_categories(driver: WebDriver, wait: WebDriverWait) -> List[str]:
     """
     Extracts the rated categories from the EvidenceAlerts article page
     and translates them to French using CATEGORY_MAP.
+    Once the ratings table is present, the page source is parsed in one go
+    (one WebDriver round trip instead of one per row and cell).
     """
     logger.info("    Extracting and translating categories...")
-    translated_categories: Set[str] = set()
-
     try:
-        ratings_table = wait.until(EC.presence_of_element_located((By.ID, RATINGS_TABLE_ID)))
-
-        def process_row(row_element: WebElement):
-            try:
-                category_name_en = row_element.find_element(By.XPATH, "./td[1]").text.strip()
-                if category_name_en:
-                    category_name_fr = CATEGORY_MAP.get(category_name_en)
-                    if category_name_fr:
-                        translated_categories.add(category_name_fr)
-                        logger.debug(f"      Mapped '{category_name_en}' to '{category_name_fr}'")
-                    else:
-                        logger.warning(f"      Category '{category_name_en}' found on page but not in CATEGORY_MAP. Skipping.")
-            except NoSuchElementException:
-                logger.debug("      Skipping row - could not find category cell (td[1]).")
-            except Exception as cat_row_err:
-                logger.warning(f"      Error processing a category row: {cat_row_err}")
-
-        try:
-            category_rows = ratings_table.find_elements(By.XPATH, CATEGORY_ROW_XPATH)
-            if category_rows:
-                logger.info(f"      Found {len(category_rows)} potential category rows using primary XPath.")
-                for row in category_rows:
-                    process_row(row)
-            else:
-                logger.info("      Primary category XPath found no rows. Using fallback method on all rows.")
-                all_rows = ratings_table.find_elements(By.TAG_NAME, CATEGORY_ROW_FALLBACK_TAG)
-                if all_rows:
-                    data_rows_to_check = all_rows[1:] if all_rows[0].find_elements(By.TAG_NAME, "th") else all_rows
-                    logger.info(f"      Checking {len(data_rows_to_check)} rows in fallback.")
-                    for row in data_rows_to_check:
-                        try:
-                            cols = row.find_elements(By.TAG_NAME, CATEGORY_CELL_TAG)
-                            if len(cols) >= 3:
-                                rating_text_1 = cols[1].text.strip()
-                                rating_text_2 = cols[2].text.strip()
-                                has_rating = "Coming Soon..." not in rating_text_1 and "Coming Soon..." not in rating_text_2
-                                if has_rating:
-                                     process_row(row)
-                                else:
-                                     logger.debug("      Skipping fallback row - 'Coming Soon...' detected.")
-                            else:
-                                logger.debug("      Skipping fallback row - not enough columns.")
-                        except Exception as fallback_row_err:
-                             logger.warning(f"      Error checking a fallback category row: {fallback_row_err}")
-
-        except NoSuchElementException:
-             logger.warning("      Could not find category rows using primary XPath.")
-
-
-        if translated_categories:
-            logger.info(f"      Final French categories found: {', '.join(sorted(list(translated_categories)))}")
-        else:
-            logger.info("      No valid mappable categories found for this article.")
-
+        wait.until(EC.presence_of_element_located((By.ID, RATINGS_TABLE_ID)), field="ratings_table")
+        soup = BeautifulSoup(driver.page_source, HTML_PARSER)
+        rating_rows = parse_rating_rows_html(soup)
+        logger.info(f"      Found {len(rating_rows)} rows in the ratings table.")
+        translated_categories = translate_category_rows(rating_rows)
     except (NoSuchElementException, TimeoutException):
         logger.warning("    Could not find/timeout waiting for the ratings table (ID='SearchRatings').")
+        return []
+    except WebDriverException:
+        raise
     except Exception as cat_err:
         logger.error(f"    An unexpected error occurred extracting/translating categories: {cat_err}")
+        return []
 
-    return sorted(list(translated_categories))
+    if translated_categories:
+        logger.info(f"      Final French categories found: {', '.join(translated_categories)}")
+    else:
+        logger.info("      No valid mappable categories found for this article.")
+    return translated_categories
+
+# --- Raw Page Archive ---
+# Opened in main() with --archive-pages; pages are stored under the article opened on the current thread
+_page_archive: Optional[PageArchive] = None
+
+def open_page_archive(directory: str = DEFAULT_ARCHIVE_DIR) -> PageArchive:
+    global _page_archive
+    _page_archive = PageArchive(directory)
+    return _page_archive
+
+def close_page_archive():
+    global _page_archive
+    if _page_archive is not None:
+        _page_archive.close()
+        _page_archive = None
+
+def archiving_article(article_url: str):
+    """Context in which archived pages are attached to article_url (does nothing without an archive)."""
+    return _page_archive.article(article_url) if _page_archive is not None else contextlib.nullcontext()
+
+def archive_page(kind: str, html: Optional[str], url: Optional[str] = None):
+    """Stores a raw page of the current article. Archiving problems never fail the scrape."""
+    if _page_archive is None or not html:
+        return
+    try:
+        _page_archive.store_current(kind, html, url=url)
+    except (OSError, sqlite3.Error) as archive_err:
+        logger.warning(f"    Could not archive the {kind} page: {archive_err}")
 
-def process_single_article(driver: WebDriver, wait: WebDriverWait, article_url: str) -> Optional[Dict[str, Any]]:
-    """Navigates to an article URL and extracts all relevant data."""
-    logger.info(f"Processing article: {article_url}")
-    current_article_data = {
+def archive_browser_page(driver: WebDriver, kind: str):
+    """Archives the rendered DOM of the current window (page_source is only fetched when archiving)."""
+    if _page_archive is None:
+        return
+    try:
+        archive_page(kind, driver.page_source, url=driver.current_url)
+    except WebDriverException as source_err:
+        logger.warning(f"    Could not read the {kind} page source for the archive: {source_err}")
+
+# --- PubMed Links ---
+# Opened in main(); without it (--no-pmid-resolve) only a PMID read from the PubMed page gives a canonical link
+_pmid_resolver: Optional[PmidResolver] = None
+
+def open_pmid_resolver(path: str = DEFAULT_PMID_CACHE_PATH, offline: bool = False) -> PmidResolver:
+    """Opens the DOI -> PMID cache used to build canonical PubMed links (offline: cache only, no esearch)."""
+    global _pmid_resolver
+    _pmid_resolver = PmidResolver(path, offline=offline)
+    return _pmid_resolver
+
+def close_pmid_resolver():
+    global _pmid_resolver
+    if _pmid_resolver is not None:
+        _pmid_resolver.close()
+        _pmid_resolver = None
+
+def build_pubmed_link(doi: Optional[str], pmid: Optional[str] = None) -> Optional[str]:
+    """
+    Canonical https://pubmed.ncbi.nlm.nih.gov/<pmid>/ link of an article (PMID from the
+    PubMed page, else resolved from the DOI and cached), or the '?term=<doi>' search link.
+    """
+    if _pmid_resolver is not None and (doi or pmid):
+        return _pmid_resolver.pubmed_link(doi, pmid=pmid)
+    if pmid:
+        return canonical_pubmed_link(pmid)
+    return legacy_pubmed_link(doi) if doi else None
+
+def build_article_record(article_url: str, pubmed_info: Dict[str, Optional[str]],
+                         abstract: Optional[str], categories: List[str]) -> Dict[str, Any]:
+    """Assembles the output record for one article (same key order in every scraping mode)."""
+    doi = pubmed_info.get("doi")
+    if doi and 'doi.org' in doi:
+        match = re.search(r'(10\.\d{4,9}/[-._;()/:A-Z0-9]+)', doi, re.IGNORECASE)
+        if match:
+            doi = match.group(1)
+        else:
+            logger.warning(f"    Could not reliably extract DOI from full link: {doi}. Using as is for PubMed link.")
+    link = build_pubmed_link(doi, pmid=pubmed_info.get("pmid"))
+
+    record = {
         "url": article_url,
-        "title": None,
-        "link": None,
-        "abstract": None,
-        "journal": None,
-        "published_at": None,
-        "categories": []
+        "title": pubmed_info.get("title"),
+        "link": link,
+        "doi": doi,
+        "journal": pubmed_info.get("journal"),
+        "published_at": pubmed_info.get("published_at"),
+        "abstract": abstract,
+        "categories": categories
     }
+    # A jump in these counters usually means a page layout changed
+    for field, value in record.items():
+        if not value:
+            RUN_METRICS.count(f"missing.{field}")
+    return record
+
+def process_single_article(driver: WebDriver, wait: WebDriverWait, article_url: str,
+                           pubmed_fetch_mode: str = PUBMED_FETCH_MODE) -> Optional[Dict[str, Any]]:
+    """Navigates to an article URL and extracts all relevant data (recorded in the run metrics)."""
+    with RUN_METRICS.article(article_url) as article_metrics, archiving_article(article_url):
+        article_data = scrape_article_page(driver, wait, article_url, pubmed_fetch_mode)
+        article_metrics["status"] = "scraped" if article_data else "skipped"
+        return article_data
+
+def scrape_article_page(driver: WebDriver, wait: WebDriverWait, article_url: str,
+                        pubmed_fetch_mode: str = PUBMED_FETCH_MODE) -> Optional[Dict[str, Any]]:
+    logger.info(f"Processing article: {article_url}")
 
+    # Every wait below is capped by the per-article deadline; once it is spent they fail immediately
+    wait.start_article()
     try:
-        driver.get(article_url)
-        wait.until(EC.presence_of_element_located((By.ID, ARTICLE_RECORD_DIV_ID)))
+        with RUN_METRICS.span("article_page"):
+            driver.get(article_url)
+            wait.until(EC.presence_of_element_located((By.ID, ARTICLE_RECORD_DIV_ID)), field="article_record")
         logger.info("  EvidenceAlerts article page loaded.")
 
-        pubmed_info = process_pubmed_interaction(driver, wait)
-        current_article_data["title"] = pubmed_info.get("title")
-        if pubmed_info.get("doi"):
-            doi = pubmed_info['doi']
-            if 'doi.org' in doi:
-                match = re.search(r'(10\.\d{4,9}/[-._;()/:A-Z0-9]+)', doi, re.IGNORECASE)
-                if match:
-                    doi = match.group(1)
-                else:
-                    logger.warning(f"    Could not reliably extract DOI from full link: {doi}. Using as is for PubMed link.")
-            current_article_data["link"] = f"https://pubmed.ncbi.nlm.nih.gov/?term={doi}"
-        current_article_data["journal"] = pubmed_info.get("journal")
-        current_article_data["published_at"] = pubmed_info.get("published_at")
-
-        current_article_data["abstract"] = extract_abstract(driver, wait)
-        current_article_data["categories"] = extract_categories(driver, wait)
-
-        ordered_data = {
-            "url": current_article_data["url"],
-            "title": current_article_data["title"],
-            "link": current_article_data["link"],
-            "journal": current_article_data["journal"],
-            "published_at": current_article_data["published_at"],
-            "abstract": current_article_data["abstract"],
-            "categories": current_article_data["categories"]
-        }
-        return ordered_data
+        # One round trip for the link, abstract and ratings rows; per-element waits only if the script fails
+        with RUN_METRICS.span("article_snapshot"):
+            snapshot = take_dom_snapshot(driver, ARTICLE_SNAPSHOT_JS, ARTICLE_SNAPSHOT_SELECTORS,
+                                         timeout=wait.budget("snapshot"))
+        archive_browser_page(driver, "article")
 
+        if snapshot is not None and not snapshot.get("pubmed_href"):
+            logger.warning("    'View on PubMed' link not found in page snapshot.")
+            pubmed_info = {"doi": None, "journal": None, "published_at": None, "title": None}
+        else:
+            pubmed_info = process_pubmed_interaction(driver, wait, fetch_mode=pubmed_fetch_mode,
+                                                     pubmed_href=snapshot.get("pubmed_href") if snapshot else None)
+
+        if snapshot is not None:
+            # The page itself was read by the snapshot (article_snapshot phase); only the extraction is timed here
+            with RUN_METRICS.span("abstract"):
+                abstract = snapshot.get("abstract") or None
+            logger.info(f"    Abstract from page snapshot (length: {len(abstract or '')}).")
+            with RUN_METRICS.span("categories"):
+                categories = translate_category_rows(snapshot.get("rating_rows") or [])
+            logger.info(f"    Categories from page snapshot: {categories}")
+        else:
+            RUN_METRICS.count("fallback.article_field_waits")
+            abstract = extract_abstract(driver, wait)
+            categories = extract_categories(driver, wait)
+
+        if wait.deadline_exceeded():
+            # Optional fields were skipped: don't keep (and index) an incomplete record, the next run retries it
+            WAIT_STATS.record_deadline_exceeded()
+            logger.error(f"Per-article deadline ({WAIT_POLICY.article_deadline}s) exceeded on {article_url}. Skipping article.")
+            return None
+        return build_article_record(article_url, pubmed_info, abstract, categories)
+
+    except ArticleDeadlineExceeded:
+        WAIT_STATS.record_deadline_exceeded()
+        logger.error(f"Per-article deadline ({WAIT_POLICY.article_deadline}s) exceeded on {article_url}. Skipping article.")
+        return None
     except TimeoutException:
         logger.error(f"Timeout waiting for core EvidenceAlerts page elements on {article_url}. Skipping article.")
         return None
@@ -581,6 +1154,568 @@ def process_single_article(driver: WebDriver, wait: WebDriverWait, article_url:
     except Exception as page_err:
         logger.error(f"Failed to process page {article_url}: {page_err}")
         return None
+    finally:
+        wait.end_article()
+
+# --- HTML Parsing (shared by the HTTP mode and the browser page_source) ---
+
+def parse_article_links_html(html: str) -> List[str]:
+    """Extracts unique, absolute article links from the alerted articles page HTML."""
+    soup = BeautifulSoup(html, HTML_PARSER)
+    article_links = []
+    processed_links = set()
+    for link_element in soup.select(ARTICLE_LINK_SELECTOR):
+        relative_link = link_element.get('href')
+        if relative_link and relative_link not in processed_links:
+            article_links.append(urljoin(BASE_URL, relative_link))
+            processed_links.add(relative_link)
+    return article_links
+
+def parse_abstract_html(soup: BeautifulSoup) -> Optional[str]:
+    """Returns the text of the 'Abstract' panel body of an EvidenceAlerts article page."""
+    for heading in soup.select(ABSTRACT_HEADING_CSS_SELECTOR):
+        if 'Abstract' not in heading.get_text():
+            continue
+        for sibling in heading.find_next_siblings('div'):
+            if 'panel-body' in (sibling.get('class') or []):
+                return sibling.get_text("\n", strip=True)
+    return None
+
+def parse_pubmed_href_html(soup: BeautifulSoup) -> Optional[str]:
+    """Returns the absolute URL behind the 'View on PubMed' button, if present."""
+    for link_element in soup.select(PUBMED_LINK_CSS_SELECTOR):
+        if PUBMED_LINK_TEXT in link_element.get_text() and link_element.get('href'):
+            return urljoin(BASE_URL, link_element['href'])
+    return None
+
+def parse_rating_rows_html(soup: BeautifulSoup) -> List[List[str]]:
+    """Returns the cell texts of every data row of the ratings table (header rows are skipped)."""
+    ratings_table = soup.find(id=RATINGS_TABLE_ID)
+    if ratings_table is None:
+        return []
+    rows = []
+    for row in ratings_table.find_all(CATEGORY_ROW_FALLBACK_TAG):
+        cells = [cell.get_text(" ", strip=True) for cell in row.find_all(CATEGORY_CELL_TAG, recursive=False)]
+        if cells:
+            rows.append(cells)
+    return rows
+
+def translate_category_rows(rows: List[List[str]]) -> List[str]:
+    """
+    Applies the same filtering as CATEGORY_ROW_XPATH (skip rows whose ratings are
+    'Coming Soon...') to ratings rows and translates the categories with CATEGORY_MAP.
+    """
+    translated_categories: Set[str] = set()
+    for cells in rows:
+        if any("Coming Soon..." in cell for cell in cells[1:3]):
+            logger.debug("      Skipping row - 'Coming Soon...' detected.")
+            continue
+        category_name_en = cells[0].strip()
+        if not category_name_en:
+            continue
+        category_name_fr = CATEGORY_MAP.get(category_name_en)
+        if category_name_fr:
+            translated_categories.add(category_name_fr)
+            logger.debug(f"      Mapped '{category_name_en}' to '{category_name_fr}'")
+        else:
+            logger.warning(f"      Category '{category_name_en}' found on page but not in CATEGORY_MAP. Skipping.")
+    return sorted(translated_categories)
+
+# --- Browserless Mode (HTTP session) ---
+
+def is_logged_in_listing(html: str) -> bool:
+    """True if the HTML is the alerted articles page (and not the login form)."""
+    soup = BeautifulSoup(html, HTML_PARSER)
+    return soup.select_one(ALERTED_ARTICLES_TABLE_SELECTOR) is not None and soup.select_one(LOGIN_FORM_SELECTOR) is None
+
+def save_cookie_jar(session: requests.Session, filename: str = COOKIE_JAR_FILE):
+    """Saves the session cookies to disk (readable by the current user only)."""
+    cookies = [
+        {
+            "name": cookie.name,
+            "value": cookie.value,
+            "domain": cookie.domain,
+            "path": cookie.path,
+            "secure": cookie.secure,
+            "expiry": cookie.expires,
+        }
+        for cookie in session.cookies
+    ]
+    try:
+        fd = os.open(filename, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(cookies, f, indent=2)
+        logger.info(f"Saved {len(cookies)} session cookies to {filename}.")
+    except OSError as io_err:
+        logger.error(f"Could not save cookie jar {filename}: {io_err}")
+
+def load_cookie_jar(session: requests.Session, filename: str = COOKIE_JAR_FILE) -> bool:
+    """Loads non-expired cookies from disk into the session. Returns False if there is nothing usable."""
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            cookies = json.load(f)
+    except FileNotFoundError:
+        logger.info(f"No cookie jar found at {filename}.")
+        return False
+    except (OSError, json.JSONDecodeError) as load_err:
+        logger.warning(f"Could not read cookie jar {filename}: {load_err}")
+        return False
+
+    now = time.time()
+    loaded = 0
+    for cookie in cookies:
+        if cookie.get("expiry") and cookie["expiry"] < now:
+            continue
+        session.cookies.set(cookie["name"], cookie["value"], domain=cookie.get("domain", ""),
+                            path=cookie.get("path", "/"), secure=cookie.get("secure", False),
+                            expires=cookie.get("expiry"))
+        loaded += 1
+    logger.info(f"Loaded {loaded}/{len(cookies)} non-expired cookies from {filename}.")
+    return loaded > 0
+
+def perform_http_login(session: requests.Session) -> Optional[str]:
+    """
+    Logs in by posting the login form (including its hidden anti-forgery fields).
+    Returns the alerted articles page HTML on success, None otherwise.
+    """
+    logger.info(f"Logging in over HTTP: {LOGIN_URL}")
+    try:
+        login_page = session.get(LOGIN_URL, timeout=HTTP_TIMEOUT)
+        login_page.raise_for_status()
+        login_form = BeautifulSoup(login_page.text, HTML_PARSER).select_one(LOGIN_FORM_SELECTOR)
+        if login_form is None:
+            logger.warning("Login form not found in login page HTML.")
+            return None
+
+        form_data = {
+            field.get('name'): field.get('value', '')
+            for field in login_form.find_all('input')
+            if field.get('name') and field.get('type') not in ('submit', 'checkbox')
+        }
+        form_data[EMAIL_FIELD_ID] = EMAIL
+        form_data[PASSWORD_FIELD_ID] = PASSWORD
+        action_url = urljoin(login_page.url, login_form.get('action') or LOGIN_URL)
+
+        response = session.post(action_url, data=form_data, timeout=HTTP_TIMEOUT)
+        response.raise_for_status()
+        if is_logged_in_listing(response.text):
+            logger.info("HTTP login successful.")
+            return response.text
+        logger.warning("HTTP login did not land on the alerted articles page.")
+        return None
+    except requests.exceptions.RequestException as req_err:
+        logger.warning(f"HTTP login failed: {req_err}")
+        return None
+
+def perform_browser_login_for_cookies(session: requests.Session, driver_profile: str = DRIVER_PROFILE) -> bool:
+    """Logs in with Selenium and copies the resulting cookies into the requests session."""
+    driver = None
+    try:
+        driver, wait = setup_driver(driver_profile)
+        if not perform_login(driver, wait):
+            return False
+        for cookie in driver.get_cookies():
+            session.cookies.set(cookie['name'], cookie['value'], domain=cookie.get('domain', ''),
+                                path=cookie.get('path', '/'), secure=cookie.get('secure', False),
+                                expires=cookie.get('expiry'))
+        return True
+    finally:
+        if driver:
+            try:
+                driver.quit()
+            except Exception as quit_err:
+                logger.error(f"Error closing login browser: {quit_err}")
+
+@RUN_METRICS.timed("login")
+def open_http_session(cookie_jar: str = COOKIE_JAR_FILE, driver_profile: str = DRIVER_PROFILE) -> Optional[str]:
+    """
+    Makes the shared HTTP session logged in: reuses the cookie jar when it is still
+    valid, otherwise logs in (form POST first, then Selenium) and saves a fresh jar.
+    Returns the alerted articles page HTML, or None if every login method failed.
+    """
+    session = get_http_session()
+
+    if load_cookie_jar(session, cookie_jar):
+        try:
+            response = session.get(ALERTED_ARTICLES_URL, timeout=HTTP_TIMEOUT)
+            response.raise_for_status()
+            if is_logged_in_listing(response.text):
+                logger.info("Reusing saved session cookies.")
+                return response.text
+        except requests.exceptions.RequestException as req_err:
+            logger.warning(f"Could not fetch alerted articles page with saved cookies: {req_err}")
+        logger.info("Saved session cookies have expired. Logging in again.")
+        session.cookies.clear()
+
+    listing_html = perform_http_login(session)
+    if listing_html is None:
+        logger.info("Falling back to Selenium login.")
+        session.cookies.clear()
+        if not perform_browser_login_for_cookies(session, driver_profile):
+            return None
+        try:
+            response = session.get(ALERTED_ARTICLES_URL, timeout=HTTP_TIMEOUT)
+            response.raise_for_status()
+        except requests.exceptions.RequestException as req_err:
+            logger.error(f"Could not fetch alerted articles page after Selenium login: {req_err}")
+            return None
+        if not is_logged_in_listing(response.text):
+            logger.error("Selenium login cookies were not accepted over HTTP.")
+            return None
+        listing_html = response.text
+
+    save_cookie_jar(session, cookie_jar)
+    return listing_html
+
+def process_single_article_http(article_url: str) -> Optional[Dict[str, Any]]:
+    """Fetches an article page over the logged-in HTTP session and extracts all relevant data (recorded in the run metrics)."""
+    with RUN_METRICS.article(article_url) as article_metrics, archiving_article(article_url):
+        article_data = scrape_article_page_http(article_url)
+        article_metrics["status"] = "scraped" if article_data else "skipped"
+        return article_data
+
+def scrape_article_page_http(article_url: str) -> Optional[Dict[str, Any]]:
+    logger.info(f"Processing article over HTTP: {article_url}")
+    deadline = time.monotonic() + WAIT_POLICY.article_deadline
+    try:
+        with RUN_METRICS.span("article_page"):
+            response = get_http_session().get(article_url, timeout=HTTP_TIMEOUT)
+            response.raise_for_status()
+    except requests.exceptions.RequestException as req_err:
+        logger.error(f"Failed to fetch {article_url}: {req_err}")
+        return None
+    archive_page("article", response.text, url=response.url)
+
+    soup = BeautifulSoup(response.text, HTML_PARSER)
+    if soup.find(id=ARTICLE_RECORD_DIV_ID) is None:
+        logger.error(f"No '{ARTICLE_RECORD_DIV_ID}' element on {article_url} (session expired?). Skipping article.")
+        return None
+
+    pubmed_info = {"doi": None, "journal": None, "published_at": None, "title": None}
+    pubmed_url = parse_pubmed_href_html(soup)
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        WAIT_STATS.record_deadline_exceeded()
+        logger.error(f"Per-article deadline ({WAIT_POLICY.article_deadline}s) exceeded on {article_url}. Skipping article.")
+        return None
+    if pubmed_url:
+        with RUN_METRICS.span("pubmed"):
+            pubmed_info = fetch_pubmed_data_http(pubmed_url, timeout=min(HTTP_TIMEOUT, remaining)) or pubmed_info
+    else:
+        logger.warning("    'View on PubMed' link not found.")
+
+    abstract, categories = extract_article_fields_html(soup)
+    logger.info(f"  Extracted article over HTTP (abstract length: {len(abstract or '')}, categories: {categories})")
+
+    return build_article_record(article_url, pubmed_info, abstract, categories)
+
+def extract_article_fields_html(soup: BeautifulSoup) -> (Optional[str], List[str]):
+    """Returns the abstract and the translated categories of a parsed EvidenceAlerts article page."""
+    with RUN_METRICS.span("abstract"):
+        abstract = parse_abstract_html(soup)
+    if abstract is None:
+        logger.warning("      Could not find the abstract element.")
+    with RUN_METRICS.span("categories"):
+        categories = translate_category_rows(parse_rating_rows_html(soup))
+    return abstract, categories
+
+def scrape_articles_http(article_links: List[str], workers: int,
+                         on_article: Optional[Callable[[Dict[str, Any]], Any]] = None) -> List[Dict[str, Any]]:
+    """
+    Fetches and extracts the article pages concurrently; results keep the order of article_links.
+    on_article is called from the worker thread as soon as each article is extracted.
+    """
+    def fetch_and_emit(article_url: str) -> Optional[Dict[str, Any]]:
+        article_data = process_single_article_http(article_url)
+        if article_data and on_article:
+            on_article(article_data)
+        return article_data
+
+    logger.info(f"Fetching {len(article_links)} articles over HTTP with {workers} concurrent workers...")
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="http") as executor:
+        results = list(executor.map(fetch_and_emit, article_links))
+    return [article_data for article_data in results if article_data]
+
+# --- Re-extraction From the Page Archive (--from-archive) ---
+
+def extract_archived_article(archive: PageArchive, article_id: str) -> Optional[Dict[str, Any]]:
+    """Runs the HTML extraction over the archived EvidenceAlerts and PubMed pages of one article."""
+    article_page = archive.load(article_id, "article")
+    if article_page is None:
+        logger.warning(f"No archived EvidenceAlerts page for article {article_id}. Skipping.")
+        return None
+    logger.info(f"Re-extracting archived article: {article_page.article_url}")
+    soup = BeautifulSoup(article_page.html, HTML_PARSER)
+    if soup.find(id=ARTICLE_RECORD_DIV_ID) is None:
+        logger.error(f"No '{ARTICLE_RECORD_DIV_ID}' element in the archived page of {article_page.article_url}. Skipping article.")
+        return None
+
+    pubmed_info = {"doi": None, "journal": None, "published_at": None, "title": None}
+    pubmed_page = archive.load(article_id, "pubmed")
+    if pubmed_page is not None:
+        pubmed_info = parse_pubmed_html(pubmed_page.html)
+        pubmed_info["pmid"] = pubmed_info["pmid"] or extract_pmid(pubmed_page.url)
+    else:
+        logger.warning("    No archived PubMed page.")
+
+    abstract, categories = extract_article_fields_html(soup)
+    return build_article_record(article_page.article_url, pubmed_info, abstract, categories)
+
+def reextract_from_archive(archive: PageArchive, since: Optional[float] = None,
+                           on_article: Optional[Callable[[Dict[str, Any]], Any]] = None) -> List[str]:
+    """
+    Rebuilds the records of every archived article (fetched since the given timestamp)
+    without network access. Returns the article URLs in archive order.
+    """
+    article_ids = archive.article_ids(since=since)
+    logger.info(f"Re-extracting {len(article_ids)} archived articles from {archive.directory}...")
+    article_urls = []
+    for article_id in article_ids:
+        with RUN_METRICS.article(article_id) as article_metrics:
+            article_data = extract_archived_article(archive, article_id)
+            article_metrics["status"] = "scraped" if article_data else "skipped"
+        if article_data:
+            article_urls.append(article_data["url"])
+            if on_article:
+                on_article(article_data)
+    return article_urls
+
+# --- Driver Supervision ---
+
+class DriverSupervisor:
+    """
+    Owns one WebDriver and brings it back after a driver failure: the old driver is torn
+    down, a new one is launched and logged in again (with `login`), within a bounded
+    restart budget and with exponential backoff between attempts.
+    """
+
+    def __init__(self, login: Callable[[WebDriver, WebDriverWait], bool], driver_profile: str = DRIVER_PROFILE,
+                 max_restarts: int = DRIVER_MAX_RESTARTS):
+        self.login = login
+        self.driver_profile = driver_profile
+        self.max_restarts = max_restarts
+        self.restarts = 0
+        self.driver: Optional[WebDriver] = None
+        self.wait: Optional[BudgetedWait] = None
+
+    def start(self) -> bool:
+        """Launches the driver and logs in. Returns False if the login failed."""
+        self.driver, self.wait = setup_driver(self.driver_profile)
+        return self.login(self.driver, self.wait)
+
+    def restart(self, error: Exception) -> bool:
+        """
+        Replaces a failed driver with a logged-in one. Returns False once the restart
+        budget is spent (the caller should stop using this supervisor).
+        """
+        while self.restarts < self.max_restarts:
+            backoff = min(DRIVER_RESTART_BACKOFF_BASE * 2 ** self.restarts, DRIVER_RESTART_BACKOFF_MAX)
+            self.restarts += 1
+            logger.warning(f"Driver failure ({type(error).__name__}). Restart {self.restarts}/{self.max_restarts} in {backoff}s...")
+            self.quit()
+            time.sleep(backoff)
+            try:
+                if self.start():
+                    logger.info(f"Driver restarted and logged in (restart {self.restarts}/{self.max_restarts}).")
+                    return True
+                logger.error("Login failed after driver restart.")
+            except Exception as restart_err:
+                logger.error(f"Could not restart the driver: {restart_err}")
+                error = restart_err
+        logger.critical(f"Driver restart budget ({self.max_restarts}) exhausted.")
+        self.quit()
+        return False
+
+    def quit(self):
+        if self.driver:
+            try:
+                self.driver.quit()
+            except Exception as quit_err:
+                logger.error(f"Error closing browser: {quit_err}")
+        self.driver = None
+        self.wait = None
+
+# --- Parallel Processing (Driver Pool) ---
+
+def get_session_cookies(driver: WebDriver) -> List[Dict[str, Any]]:
+    """Returns the logged-in session cookies of a driver, reduced to the keys add_cookie accepts."""
+    return [
+        {key: value for key, value in cookie.items() if key in SESSION_COOKIE_KEYS}
+        for cookie in driver.get_cookies()
+    ]
+
+def apply_session_cookies(driver: WebDriver, cookies: List[Dict[str, Any]]):
+    """Loads the EvidenceAlerts domain and injects the shared session cookies into the driver."""
+    driver.get(BASE_URL)
+    for cookie in cookies:
+        try:
+            driver.add_cookie(cookie)
+        except WebDriverException as cookie_err:
+            logger.warning(f"Could not add cookie '{cookie.get('name')}': {cookie_err}")
+
+def article_worker(link_queue: "queue.Queue", results: Dict[int, Dict[str, Any]], results_lock: threading.Lock,
+                   cookies: List[Dict[str, Any]], total_links: int, pubmed_fetch_mode: str,
+                   on_article: Optional[Callable[[Dict[str, Any]], Any]] = None,
+                   driver_profile: str = DRIVER_PROFILE, max_restarts: int = DRIVER_MAX_RESTARTS):
+    """
+    Worker thread body: starts its own driver, reuses the shared login cookies and
+    processes (index, link, attempt) items from the queue until it is empty.
+    On a WebDriverException the link is re-queued and the worker's driver is restarted;
+    the worker only stops once its restart budget is spent.
+    """
+    def login_with_cookies(driver: WebDriver, wait: WebDriverWait) -> bool:
+        apply_session_cookies(driver, cookies)
+        return True
+
+    supervisor = DriverSupervisor(login_with_cookies, driver_profile=driver_profile, max_restarts=max_restarts)
+    try:
+        supervisor.start()
+        logger.info("Worker ready with shared session cookies.")
+
+        while True:
+            try:
+                index, link, attempt = link_queue.get_nowait()
+            except queue.Empty:
+                return
+
+            logger.info(f"\n--- Article {index + 1}/{total_links} (attempt {attempt}) ---")
+            try:
+                article_data = process_single_article(supervisor.driver, supervisor.wait, link, pubmed_fetch_mode=pubmed_fetch_mode)
+                if article_data:
+                    with results_lock:
+                        results[index] = article_data
+                    if on_article:
+                        on_article(article_data)
+            except WebDriverException as inner_wde:
+                logger.critical(f"Driver crashed on article {index + 1} ({link}). Error: {inner_wde}")
+                if attempt < WORKER_MAX_ATTEMPTS_PER_LINK:
+                    link_queue.put((index, link, attempt + 1))
+                    logger.info(f"Re-queued article {index + 1}.")
+                else:
+                    logger.error(f"Giving up on article {index + 1} ({link}) after {attempt} attempts.")
+                if not supervisor.restart(inner_wde):
+                    logger.critical("Stopping this worker.")
+                    return
+            except Exception as article_proc_err:
+                logger.error(f"Unhandled exception processing article {index + 1} ({link}): {article_proc_err}. Continuing...")
+    except Exception as worker_err:
+        logger.critical(f"Worker failed to start or crashed: {worker_err}")
+    finally:
+        supervisor.quit()
+
+def scrape_articles_parallel(article_links: List[str], cookies: List[Dict[str, Any]], workers: int,
+                             pubmed_fetch_mode: str = PUBMED_FETCH_MODE,
+                             on_article: Optional[Callable[[Dict[str, Any]], Any]] = None,
+                             driver_profile: str = DRIVER_PROFILE,
+                             max_restarts: int = DRIVER_MAX_RESTARTS) -> List[Dict[str, Any]]:
+    """
+    Processes article links with a pool of WebDriver workers sharing one login session.
+    Results are returned in the original order of article_links.
+    """
+    link_queue: "queue.Queue" = queue.Queue()
+    for index, link in enumerate(article_links):
+        link_queue.put((index, link, 1))
+
+    results: Dict[int, Dict[str, Any]] = {}
+    results_lock = threading.Lock()
+    threads = [
+        threading.Thread(
+            target=article_worker,
+            name=f"worker-{worker_id}",
+            args=(link_queue, results, results_lock, cookies, len(article_links), pubmed_fetch_mode, on_article,
+                  driver_profile, max_restarts),
+            daemon=True,
+        )
+        for worker_id in range(1, workers + 1)
+    ]
+    logger.info(f"Starting {len(threads)} WebDriver workers for {len(article_links)} articles...")
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    if not link_queue.empty():
+        logger.error(f"All workers stopped with {link_queue.qsize()} articles left unprocessed.")
+    return [results[index] for index in sorted(results)]
+
+def scrape_articles_sequential(supervisor: DriverSupervisor, article_links: List[str],
+                               pubmed_fetch_mode: str = PUBMED_FETCH_MODE,
+                               on_article: Optional[Callable[[Dict[str, Any]], Any]] = None) -> List[Dict[str, Any]]:
+    """
+    Processes article links one by one on the supervised driver.
+    A driver failure restarts the driver (new login) and the article is retried once;
+    processing only stops early once the restart budget is spent.
+    """
+    all_article_data = []
+    logger.info(f"\nStarting processing of {len(article_links)} articles...")
+    for i, link in enumerate(article_links, 1):
+        for attempt in range(1, WORKER_MAX_ATTEMPTS_PER_LINK + 1):
+            logger.info(f"\n--- Article {i}/{len(article_links)}" + (f" (attempt {attempt})" if attempt > 1 else "") + " ---")
+            try:
+                article_data = process_single_article(supervisor.driver, supervisor.wait, link, pubmed_fetch_mode=pubmed_fetch_mode)
+                if article_data:
+                    all_article_data.append(article_data)
+                    if on_article:
+                        on_article(article_data)
+                break
+            except WebDriverException as inner_wde:
+                logger.critical(f"Critical WebDriverException encountered processing article {i} ({link}). Error: {inner_wde}")
+                if not supervisor.restart(inner_wde):
+                    logger.critical(f"Stopping processing: {len(article_links) - i + 1} articles left unprocessed.")
+                    return all_article_data
+            except Exception as article_proc_err:
+                logger.error(f"Unhandled exception processing article {i} ({link}): {article_proc_err}. Continuing...")
+                break
+        else:
+            logger.error(f"Giving up on article {i} ({link}) after {WORKER_MAX_ATTEMPTS_PER_LINK} attempts.")
+    return all_article_data
+
+# --- Incremental Scraping (Article Index) ---
+
+def filter_links_with_index(index: Optional[ArticleIndex], article_links: List[str]) -> (List[str], Dict[str, Dict[str, Any]]):
+    """
+    Drops links of articles already exported and reuses the stored record of articles
+    scraped in an earlier (failed) run, so only new articles are opened.
+    Returns (links to scrape, {link: reused record}).
+    """
+    if index is None:
+        return article_links, {}
+    links_to_scrape, reused_records, exported_links = index.partition_links(article_links)
+    logger.info(f"Article index: {len(links_to_scrape)} new, {len(reused_records)} already scraped (reused), "
+                f"{len(exported_links)} already exported (skipped).")
+    return links_to_scrape, reused_records
+
+class ScrapedArticleSink:
+    """
+    Receives every article as soon as it is scraped (from any thread): drops it if its DOI
+    was already exported under another alert, records it in the article index and appends
+    it to the streaming JSONL output, so nothing is lost if the process dies mid-run.
+    """
+
+    def __init__(self, index: Optional[ArticleIndex], writer: Optional[JsonlWriter]):
+        self.index = index
+        self.writer = writer
+        self.records_by_url: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, article_data: Dict[str, Any], reused: bool = False) -> bool:
+        """Accepts one article record. Returns False if it was dropped as a duplicate."""
+        if self.index is not None and not reused:
+            if self.index.is_exported(link=article_data.get("link"), doi=article_data.get("doi")):
+                logger.info(f"DOI of {article_data['url']} was already exported under another alert. Skipping.")
+                self.index.mark_exported(url=article_data["url"], link=article_data.get("link"))
+                return False
+            self.index.record_scraped(article_data)
+        if self.writer is not None:
+            self.writer.write(article_data)
+        with self._lock:
+            self.records_by_url[article_data["url"]] = article_data
+        return True
+
+    def ordered_records(self, article_links: List[str]) -> List[Dict[str, Any]]:
+        """Returns the accepted records in listing order."""
+        with self._lock:
+            return [self.records_by_url[link] for link in article_links if link in self.records_by_url]
 
 # No change needed here, it accepts the full filename path
 def save_data_to_json(data: List[Dict[str, Any]], filename: str):
@@ -602,11 +1737,148 @@ def save_data_to_json(data: List[Dict[str, Any]], filename: str):
         logger.error(f"Error serializing data to JSON: {json_err}")
 
 
+def write_run_metrics(metrics_dir: str, extra: Dict[str, Any]):
+    """Writes the JSON metrics of this run and refreshes the Prometheus textfile."""
+    timestamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
+    try:
+        RUN_METRICS.write_json(os.path.join(metrics_dir, f"scrape_metrics_{timestamp}.json"), extra=extra)
+        RUN_METRICS.write_prometheus(os.path.join(metrics_dir, "evidencealerts_scrape.prom"))
+    except OSError as metrics_err:
+        logger.error(f"Could not write run metrics to {metrics_dir}: {metrics_err}")
+
 # --- Main Execution ---
 def main():
     """Main script execution function."""
-    driver = None
-    all_article_data = []
+    parser = argparse.ArgumentParser(
+        description="Scrapes alerted articles (abstract, categories and PubMed metadata) from EvidenceAlerts."
+    )
+    parser.add_argument(
+        "--pubmed-mode",
+        choices=PUBMED_FETCH_MODES,
+        default=PUBMED_FETCH_MODE,
+        help=f"How PubMed metadata is fetched: 'http' (pooled HTTP session, browser fallback) or 'browser' (click and switch windows) (default: {PUBMED_FETCH_MODE})",
+    )
+    parser.add_argument(
+        "--mode",
+        choices=SCRAPE_MODES,
+        default=SCRAPE_MODE,
+        help=f"'browser' drives Chrome for every page; 'http' only logs in (reusing a saved cookie jar) and fetches pages over HTTP (default: {SCRAPE_MODE})",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help=f"Number of WebDriver instances (browser mode) or concurrent fetches (http mode) (default: {DEFAULT_WORKERS} / {DEFAULT_HTTP_WORKERS})",
+    )
+    parser.add_argument(
+        "--driver-profile",
+        choices=DRIVER_PROFILES,
+        default=DRIVER_PROFILE,
+        help=f"'light': headless Chrome, eager page loads, no images/media/third-party hosts, persistent profile per driver; 'legacy': plain headed Chrome (default: {DRIVER_PROFILE})",
+    )
+    parser.add_argument(
+        "--index",
+        default=DEFAULT_INDEX_PATH,
+        help=f"SQLite index of already scraped/summarized/exported articles (default: {DEFAULT_INDEX_PATH})",
+    )
+    parser.add_argument(
+        "--no-index",
+        action="store_true",
+        help="Ignore the article index and scrape every alerted article",
+    )
+    parser.add_argument(
+        "--max-restarts",
+        type=int,
+        default=DRIVER_MAX_RESTARTS,
+        help=f"How many times a crashed driver is relaunched and logged in again before giving up, per driver (default: {DRIVER_MAX_RESTARTS})",
+    )
+    parser.add_argument(
+        "--page-timeout",
+        type=float,
+        default=WEBDRIVER_WAIT_TIMEOUT,
+        help=f"Seconds to wait for page-ready anchors (login form, articles table, ArticleRecord) (default: {WEBDRIVER_WAIT_TIMEOUT})",
+    )
+    parser.add_argument(
+        "--field-timeout",
+        type=float,
+        default=OPTIONAL_FIELD_WAIT_TIMEOUT,
+        help=f"Seconds to wait for optional fields (DOI, journal, date, abstract, ratings...) (default: {OPTIONAL_FIELD_WAIT_TIMEOUT})",
+    )
+    parser.add_argument(
+        "--article-deadline",
+        type=float,
+        default=ARTICLE_DEADLINE,
+        help=f"Overall time budget per article, in seconds (default: {ARTICLE_DEADLINE})",
+    )
+    parser.add_argument(
+        "--pmid-cache",
+        default=DEFAULT_PMID_CACHE_PATH,
+        help=f"SQLite DOI -> PMID cache used to store canonical /<pmid>/ PubMed links (default: {DEFAULT_PMID_CACHE_PATH})",
+    )
+    parser.add_argument(
+        "--no-pmid-resolve",
+        action="store_true",
+        help="Never look DOIs up in PubMed: links are canonical only when the PubMed page gives the PMID, else '?term=<doi>'",
+    )
+    parser.add_argument(
+        "--metrics-dir",
+        default=DEFAULT_METRICS_DIR,
+        help=f"Directory of the run metrics: scrape_metrics_<timestamp>.json and the Prometheus textfile evidencealerts_scrape.prom (default: {DEFAULT_METRICS_DIR})",
+    )
+    parser.add_argument(
+        "--no-metrics",
+        action="store_true",
+        help="Do not write the metrics files (the summary is still logged)",
+    )
+    parser.add_argument(
+        "--archive-pages",
+        action="store_true",
+        help="Save the raw EvidenceAlerts and PubMed HTML of every scraped article (gzipped, content-addressed) to the page archive",
+    )
+    parser.add_argument(
+        "--from-archive",
+        action="store_true",
+        help=f"Do not scrape: re-run the extraction over the archived pages, offline, and write {ARCHIVE_DATA_FILENAME}",
+    )
+    parser.add_argument(
+        "--archive-dir",
+        default=DEFAULT_ARCHIVE_DIR,
+        help=f"Directory of the page archive (default: {DEFAULT_ARCHIVE_DIR})",
+    )
+    parser.add_argument(
+        "--archive-since",
+        default=None,
+        help="With --from-archive: only re-extract pages archived on or after this date (YYYY-MM-DD)",
+    )
+    parser.add_argument(
+        "--cookie-jar",
+        default=COOKIE_JAR_FILE,
+        help=f"File where the http mode saves and reuses the login cookies (default: {COOKIE_JAR_FILE})",
+    )
+    args = parser.parse_args()
+    from dotenv import load_dotenv
+    load_dotenv() # NCBI_API_KEY, read by the PMID resolver
+    if args.workers is None:
+        args.workers = DEFAULT_HTTP_WORKERS if args.mode == "http" else DEFAULT_WORKERS
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.max_restarts < 0:
+        parser.error("--max-restarts cannot be negative")
+    if min(args.page_timeout, args.field_timeout, args.article_deadline) <= 0:
+        parser.error("--page-timeout, --field-timeout and --article-deadline must be positive")
+    archive_since = None
+    if args.archive_since:
+        try:
+            archive_since = datetime.datetime.strptime(args.archive_since, '%Y-%m-%d').timestamp()
+        except ValueError:
+            parser.error("--archive-since must be a YYYY-MM-DD date")
+    WAIT_POLICY.page_timeout = args.page_timeout
+    WAIT_POLICY.field_timeout = args.field_timeout
+    WAIT_POLICY.article_deadline = args.article_deadline
+
+    supervisor = None
+    index = None
+    jsonl_writer = None
 
     try:
         # --- MODIFIED: Call order matters - get filenames after ensuring directories ---
@@ -614,14 +1886,38 @@ def main():
         create_output_directories()
         # 2. Get the full filenames (also needs the date)
         links_filename, data_filename = get_output_filenames()
-
-        driver, wait = setup_driver()
-
-        if not perform_login(driver, wait):
-            logger.critical("Login failed. Cannot proceed.")
+        if args.from_archive:
+            data_filename = os.path.join(os.path.dirname(data_filename), ARCHIVE_DATA_FILENAME)
+        jsonl_filename = os.path.splitext(data_filename)[0] + ".jsonl"
+        jsonl_writer = JsonlWriter(jsonl_filename)
+
+        if args.from_archive:
+            # Offline: no login, the article index is left alone and DOIs are only looked up in the PMID cache
+            archive = open_page_archive(args.archive_dir)
+            if not args.no_pmid_resolve:
+                open_pmid_resolver(args.pmid_cache, offline=True)
+            sink = ScrapedArticleSink(None, jsonl_writer)
+            article_urls = reextract_from_archive(archive, since=archive_since, on_article=sink.add)
+            save_data_to_json(sink.ordered_records(article_urls), data_filename)
             return
+        if args.archive_pages:
+            open_page_archive(args.archive_dir)
+
+        if args.mode == "http":
+            listing_html = open_http_session(args.cookie_jar, driver_profile=args.driver_profile)
+            if listing_html is None:
+                logger.critical("Login failed. Cannot proceed.")
+                return
+            article_links = parse_article_links_html(listing_html)
+            logger.info(f"Successfully extracted {len(article_links)} unique article links.")
+        else:
+            supervisor = DriverSupervisor(perform_login, driver_profile=args.driver_profile, max_restarts=args.max_restarts)
 
-        article_links = extract_article_links(driver)
+            if not supervisor.start():
+                logger.critical("Login failed. Cannot proceed.")
+                return
+
+            article_links = extract_article_links(supervisor.driver)
         # 3. Save links using the obtained filename
         save_links_to_file(article_links, links_filename)
 
@@ -629,42 +1925,63 @@ def main():
             logger.info("No article links found to process.")
             return
 
-        logger.info(f"\nStarting processing of {len(article_links)} articles...")
-        for i, link in enumerate(article_links, 1):
-            logger.info(f"\n--- Article {i}/{len(article_links)} ---")
-            try:
-                article_data = process_single_article(driver, wait, link)
-                if article_data:
-                    all_article_data.append(article_data)
-            except WebDriverException as inner_wde:
-                 logger.critical(f"Critical WebDriverException encountered processing article {i} ({link}). Stopping processing. Error: {inner_wde}")
-                 break
-            except Exception as article_proc_err:
-                 logger.error(f"Unhandled exception processing article {i} ({link}): {article_proc_err}. Continuing...")
-                 continue
+        if not args.no_index:
+            index = ArticleIndex(args.index)
+        if not args.no_pmid_resolve:
+            open_pmid_resolver(args.pmid_cache)
+        links_to_scrape, reused_records = filter_links_with_index(index, article_links)
+        sink = ScrapedArticleSink(index, jsonl_writer)
+        for link in article_links:
+            if link in reused_records:
+                sink.add(reused_records[link], reused=True)
+
+        workers = min(args.workers, len(links_to_scrape))
+        if not links_to_scrape:
+            logger.info("No new articles to scrape.")
+        elif args.mode == "http":
+            scrape_articles_http(links_to_scrape, workers, on_article=sink.add)
+        elif workers > 1:
+            # Log in once, then hand the session cookies to every worker driver
+            cookies = get_session_cookies(supervisor.driver)
+            logger.info("Closing the login browser before starting the driver pool...")
+            supervisor.quit()
+            scrape_articles_parallel(links_to_scrape, cookies, workers, pubmed_fetch_mode=args.pubmed_mode,
+                                     on_article=sink.add, driver_profile=args.driver_profile,
+                                     max_restarts=args.max_restarts)
+        else:
+            scrape_articles_sequential(supervisor, links_to_scrape, pubmed_fetch_mode=args.pubmed_mode, on_article=sink.add)
 
-        # 4. Save data using the obtained filename
-        save_data_to_json(all_article_data, data_filename)
+        # 4. Every record is already in the JSONL stream; also write the ordered data.json snapshot
+        save_data_to_json(sink.ordered_records(article_links), data_filename)
 
     except Exception as e:
         logger.critical(f"A critical error occurred during the main process: {e}", exc_info=True)
-        if driver:
+        if supervisor and supervisor.driver:
             try:
                 # --- MODIFIED: Save screenshot in a consistent place if needed ---
                 today_date_str = datetime.date.today().strftime(TIMESTAMP_FORMAT)
                 error_screenshot_filename = f"error_screenshot_{today_date_str}.png"
-                driver.save_screenshot(error_screenshot_filename)
+                supervisor.driver.save_screenshot(error_screenshot_filename)
                 logger.info(f"Saved an error screenshot to {error_screenshot_filename}")
             except Exception as screen_err:
                  logger.error(f"Could not save error screenshot: {screen_err}")
     finally:
-        if driver:
+        WAIT_STATS.log_summary()
+        RUN_METRICS.log_summary()
+        if not args.no_metrics:
+            write_run_metrics(args.metrics_dir, {"mode": "archive" if args.from_archive else args.mode,
+                                                 "workers": args.workers,
+                                                 "wait_policy": WAIT_STATS.as_dict()})
+        if jsonl_writer:
+            jsonl_writer.close()
+        if index:
+            index.close()
+        close_pmid_resolver()
+        close_page_archive()
+        if supervisor and supervisor.driver:
             logger.info("Closing the browser...")
-            try:
-                driver.quit()
-                logger.info("Browser closed.")
-            except Exception as quit_err:
-                logger.error(f"Error closing browser: {quit_err}")
+            supervisor.quit()
+            logger.info("Browser closed.")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
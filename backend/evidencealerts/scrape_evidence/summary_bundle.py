@@ -0,0 +1,145 @@
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# --- Configuration ---
+# One bundle per date-specific summaries directory (summaries/YYYYMMDD/summaries.jsonl)
+BUNDLE_FILENAME = "summaries.jsonl"
+SUMMARY_FORMATS = ("bundle", "files") # 'files': the former layout, one <id>.json per article
+
+logger = logging.getLogger(__name__)
+
+
+def bundle_path(directory: str) -> str:
+    return os.path.join(directory, BUNDLE_FILENAME)
+
+
+class SummaryBundle:
+    """
+    Append-only JSONL file of article summaries: one {"id": ..., "summary": {...}} line per
+    article. Opening it reads the file once to build an in-memory index of IDs and line
+    offsets, so existence checks are set lookups and get() is one seek. A line left
+    incomplete by a crash is cut off before anything new is appended. The first summary
+    added for an ID wins. Safe to share between threads.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._offsets: Dict[str, int] = {}
+        self._file = None # Append handle, opened by the first add()
+        self._valid_size = 0
+        if os.path.exists(path):
+            self._build_index()
+
+    def _build_index(self):
+        offset = 0
+        with open(self.path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    logger.warning(f"Ignoring incomplete last line of {self.path} (interrupted write).")
+                    break
+                try:
+                    article_id = str(json.loads(line)["id"])
+                except (ValueError, KeyError, TypeError) as e:
+                    logger.warning(f"Skipping malformed line at byte {offset} of {self.path}: {e}")
+                else:
+                    self._offsets.setdefault(article_id, offset)
+                offset += len(line)
+        self._valid_size = offset
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                self._file.close()
+                self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __contains__(self, article_id: str) -> bool:
+        return str(article_id) in self._offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def ids(self) -> List[str]:
+        """IDs in the order they were added."""
+        return list(self._offsets)
+
+    def add(self, article_id: str, summary: Dict[str, Any]) -> bool:
+        """Appends a summary. Returns False (and writes nothing) if the ID is already in the bundle."""
+        article_id = str(article_id)
+        line = (json.dumps({"id": article_id, "summary": summary}, ensure_ascii=False) + "\n").encode('utf-8')
+        with self._lock:
+            if article_id in self._offsets:
+                return False
+            if self._file is None:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self._file = open(self.path, 'ab')
+                if self._file.tell() > self._valid_size:
+                    self._file.truncate(self._valid_size) # Drop the incomplete line of an interrupted run
+                    self._file.seek(self._valid_size)
+            offset = self._file.tell()
+            self._file.write(line)
+            self._file.flush()
+            self._offsets[article_id] = offset
+        return True
+
+    def get(self, article_id: str) -> Optional[Dict[str, Any]]:
+        offset = self._offsets.get(str(article_id))
+        if offset is None:
+            return None
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            return json.loads(f.readline())["summary"]
+
+    def __iter__(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """(id, summary) of every indexed article, in file order, read sequentially."""
+        indexed = {offset for offset in self._offsets.values()}
+        if not indexed:
+            return
+        offset = 0
+        with open(self.path, 'rb') as f:
+            for line in f:
+                if offset in indexed:
+                    entry = json.loads(line)
+                    yield str(entry["id"]), entry["summary"]
+                offset += len(line)
+
+
+def iter_summary_records(directory: str) -> Iterator[Tuple[str, Optional[Dict[str, Any]]]]:
+    """
+    Yields (name, summary) for every summary of a summaries directory: the entries of its
+    bundle ('summaries.jsonl#<id>'), then any individual <id>.json file (older runs or
+    --summary-format files). The summary is None when a file cannot be read or decoded
+    (the error is logged).
+    """
+    path = bundle_path(directory)
+    if os.path.exists(path):
+        bundle = SummaryBundle(path)
+        logger.info(f"Reading {len(bundle)} summaries from bundle {path}")
+        for article_id, summary in bundle:
+            yield f"{BUNDLE_FILENAME}#{article_id}", summary
+
+    for filename in sorted(os.listdir(directory)):
+        if not filename.lower().endswith(".json"):
+            continue
+        try:
+            with open(os.path.join(directory, filename), 'r', encoding='utf-8') as f:
+                yield filename, json.load(f)
+        except json.JSONDecodeError as json_e:
+            logger.error(f"Error decoding JSON from file {filename}: {json_e}")
+            yield filename, None
+        except IOError as io_e:
+            logger.error(f"Error reading file {filename}: {io_e}")
+            yield filename, None
@@ -0,0 +1,117 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+# --- Configuration ---
+# Lives next to article_index.sqlite3, outside the summaries directory that the pipeline deletes.
+DEFAULT_SUMMARY_CACHE_PATH = "summary_cache.sqlite3"
+DEFAULT_MAX_CACHE_MB = 100
+# Eviction removes the least recently used entries until the cache is back under this share of its limit
+EVICTION_TARGET_RATIO = 0.9
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key          TEXT PRIMARY KEY,
+    response     TEXT,
+    size         INTEGER,
+    created_at   REAL,
+    last_used_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_last_used_at ON responses (last_used_at);
+"""
+
+logger = logging.getLogger(__name__)
+
+
+def cache_key(*parts: Any) -> str:
+    """SHA-256 of the JSON encoding of the parts (model, generation config, prompt version, inputs...)."""
+    payload = json.dumps(parts, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SummaryCache:
+    """
+    Persistent SQLite cache of validated LLM responses (JSON objects), keyed by cache_key().
+    Once the stored responses exceed max_bytes, the least recently used ones are evicted.
+    Safe to share between threads.
+    """
+
+    def __init__(self, path: str = DEFAULT_SUMMARY_CACHE_PATH, max_bytes: int = DEFAULT_MAX_CACHE_MB * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        logger.info(f"Opened summary cache: {path} ({self._total_bytes / 1024 / 1024:.1f} MB)")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return self.get_any([key])
+
+    def get_any(self, keys: List[str]) -> Optional[Dict[str, Any]]:
+        """The response of the first of `keys` in the cache (one hit or miss for the whole lookup)."""
+        with self._lock:
+            placeholders = ", ".join("?" * len(keys))
+            rows = dict(self._conn.execute(f"SELECT key, response FROM responses WHERE key IN ({placeholders})", keys).fetchall())
+            key = next((key for key in keys if key in rows), None)
+            if key is None:
+                self.misses += 1
+                return None
+            row = (rows[key],)
+            self._conn.execute("UPDATE responses SET last_used_at = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+            self.hits += 1
+        try:
+            return json.loads(row[0])
+        except json.JSONDecodeError:
+            logger.warning(f"Corrupted summary cache entry {key[:12]}. Ignoring it.")
+            return None
+
+    def put(self, key: str, response: Dict[str, Any]):
+        """Stores a validated response, then evicts old entries if the cache is over its size limit."""
+        text = json.dumps(response, ensure_ascii=False)
+        size = len(text.encode("utf-8"))
+        now = time.time()
+        with self._lock:
+            previous = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, size, created_at, last_used_at) VALUES (?, ?, ?, ?, ?)",
+                (key, text, size, now, now),
+            )
+            self._total_bytes += size - (previous[0] if previous else 0)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """Deletes least recently used entries down to EVICTION_TARGET_RATIO of max_bytes (lock held)."""
+        target = self.max_bytes * EVICTION_TARGET_RATIO
+        evicted = 0
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY last_used_at").fetchall():
+            if self._total_bytes <= target:
+                break
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._total_bytes -= size
+            evicted += 1
+        logger.info(f"Summary cache over {self.max_bytes / 1024 / 1024:.0f} MB: evicted {evicted} least recently used responses.")